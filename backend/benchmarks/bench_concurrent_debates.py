@@ -0,0 +1,61 @@
+"""동시 토론 처리량 벤치마크
+
+하나의 ASGI 앱(= uvicorn 워커 하나)에 N개의 /workflows/execute SSE 요청을 동시에 보내고,
+블로킹 LLM(기존 동기 invoke 방식)과 비동기 LLM(ainvoke) 사이의 총 소요 시간을 비교한다.
+
+    PYTHON_ENV=test python -m benchmarks.bench_concurrent_debates --clients 32 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from benchmarks.common import StubLLM
+
+
+async def run_client(client: httpx.AsyncClient, index: int) -> None:
+    payload = {"task": f"벤치마크 과제 {index}", "max_rounds": 1}
+    async with client.stream("POST", "/api/v1/workflows/execute", json=payload) as response:
+        async for _ in response.aiter_lines():
+            pass
+
+
+async def measure(clients: int, llm: StubLLM) -> float:
+    from api.dependencies import get_event_log, get_workflow_run_repository
+    from api.repositories.workflow_run import InMemoryWorkflowRunRepository
+    from api.services import workflow
+    from api.services.event_log import InMemoryEventLog
+    from main import app
+
+    repository = InMemoryWorkflowRunRepository()
+    event_log = InMemoryEventLog()
+    app.dependency_overrides[get_workflow_run_repository] = lambda: repository
+    app.dependency_overrides[get_event_log] = lambda: event_log
+    workflow.llm = llm
+    workflow.response_cache = None  # 반복 측정이 캐시 적중으로 왜곡되지 않도록 비활성화
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(run_client(client, i) for i in range(clients)))
+        return time.perf_counter() - started
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.2, help="LLM 호출 1회당 지연(초)")
+    args = parser.parse_args()
+
+    blocking = await measure(args.clients, StubLLM(args.latency, blocking=True))
+    non_blocking = await measure(args.clients, StubLLM(args.latency, blocking=False))
+
+    print(f"clients={args.clients} llm_latency={args.latency}s (토론당 LLM 호출 4회)")
+    print(f"blocking invoke : {blocking:8.2f}s  ({args.clients / blocking:6.2f} debates/s)")
+    print(f"async ainvoke   : {non_blocking:8.2f}s  ({args.clients / non_blocking:6.2f} debates/s)")
+    print(f"concurrency gain: {blocking / non_blocking:8.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
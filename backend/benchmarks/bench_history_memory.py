@@ -0,0 +1,94 @@
+"""대화 기록 메모리/직렬화 벤치마크
+
+max_rounds 라운드 동안 긴 응답을 내는 Stub LLM 으로 토론을 실행하고, 다음 두 방식을 비교한다.
+
+- 기존: 대화 기록 무제한 누적 + stream_mode="values" (단계마다 전체 상태 전송)
+- 개선: 최근 발언 창 + 요약 (HistoryManager) + stream_mode="updates" (단계마다 변경분만 전송)
+
+    PYTHON_ENV=test python -m benchmarks.bench_history_memory --rounds 5 --output-chars 4000
+"""
+
+import argparse
+import asyncio
+import json
+import tracemalloc
+
+from langchain_core.messages import AIMessage
+
+from benchmarks.common import percentile
+
+
+class LongOutputLLM:
+    """항상 계획 수정을 요청하는 긴 응답 LLM (max_rounds 까지 토론이 이어진다)"""
+
+    def __init__(self, output_chars: int):
+        sentence = "벤치마크를 위한 긴 응답 문장입니다. "
+        self.content = (sentence * (output_chars // len(sentence) + 1))[:output_chars] + "\nDECISION: REVISE_PLAN"
+
+    async def ainvoke(self, prompt: str) -> AIMessage:
+        await asyncio.sleep(0)
+        return AIMessage(content=self.content)
+
+
+async def measure(rounds: int, stream_mode: str) -> dict[str, float]:
+    from api.services import workflow
+
+    app = workflow.create_discussion_workflow()
+    state = {
+        "task": "메모리 측정",
+        "round_count": 1,
+        "max_rounds": rounds,
+        "plan": "",
+        "research": "",
+        "critique": "",
+        "decision": "",
+        "research_notes": {},
+    }
+    config = {"configurable": {"use_cache": False}}
+
+    step_bytes: list[float] = []
+    tracemalloc.start()
+    async for chunk in app.astream(state, config, stream_mode=stream_mode):
+        step_bytes.append(len(json.dumps(chunk, ensure_ascii=False, default=str).encode()))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "steps": len(step_bytes),
+        "streamed_kb": sum(step_bytes) / 1024,
+        "last_step_kb": step_bytes[-1] / 1024,
+        "p95_step_kb": percentile(step_bytes, 0.95) / 1024,
+        "peak_kb": peak / 1024,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--output-chars", type=int, default=4000, help="LLM 응답 1개의 글자 수")
+    args = parser.parse_args()
+
+    from api.services import workflow
+
+    workflow.llm = LongOutputLLM(args.output_chars)
+    workflow.response_cache = None
+    manager = workflow.history_manager
+    bounded = (manager.window, manager.turn_max_chars, manager.summary_max_chars)
+
+    # 기존 방식: 창/요약 없이 모든 발언을 원문으로 누적
+    manager.window = manager.turn_max_chars = manager.summary_max_chars = 10**9
+    before = await measure(args.rounds, "values")
+    manager.window, manager.turn_max_chars, manager.summary_max_chars = bounded
+    after = await measure(args.rounds, "updates")
+
+    print(f"rounds={args.rounds} output_chars={args.output_chars} window={manager.window}")
+    print(f"{'':28}{'steps':>7}{'streamed KB':>14}{'last step KB':>14}{'p95 step KB':>14}{'peak KB':>12}")
+    for label, result in (("unbounded + values", before), ("window/summary + updates", after)):
+        print(
+            f"{label:28}{result['steps']:>7}{result['streamed_kb']:>14.1f}{result['last_step_kb']:>14.1f}"
+            f"{result['p95_step_kb']:>14.1f}{result['peak_kb']:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+"""프롬프트 저장소 페이지네이션/검색 벤치마크 (PostgreSQL 필요)
+
+프롬프트 N개(기본 100만 개)를 생성한 뒤, 같은 깊이의 페이지를 OFFSET 방식과 커서(키셋) 방식으로
+조회하여 지연 시간을 비교한다. 커서 방식은 깊이와 관계없이 일정해야 한다.
+
+    PYTHON_ENV=test python -m benchmarks.bench_prompt_store --rows 1000000 --repeat 20
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import func, select, text
+
+from benchmarks.common import percentile
+
+SEED_SQL = """
+INSERT INTO prompts (id, title, content, description, created_at, updated_at)
+SELECT
+    md5(i::text || clock_timestamp()::text)::uuid::text,
+    '프롬프트 ' || i,
+    '벤치마크용 프롬프트 내용 ' || i || ' ' || md5(i::text),
+    CASE WHEN i % 10 = 0 THEN '주간 회고 ' || i END,
+    now() - make_interval(secs => i),
+    now() - make_interval(secs => i)
+FROM generate_series(:start, :stop) AS i
+"""
+
+
+async def timed(repeat: int, call) -> tuple[float, float]:
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await call()
+        durations.append((time.perf_counter() - started) * 1000)
+    return percentile(durations, 0.5), percentile(durations, 0.95)
+
+
+async def seed(session_factory, rows: int, batch: int = 100_000) -> None:
+    from api.models.prompt import Prompt
+
+    async with session_factory() as session:
+        existing = await session.scalar(select(func.count()).select_from(Prompt))
+        for start in range(existing + 1, rows + 1, batch):
+            await session.execute(text(SEED_SQL), {"start": start, "stop": min(rows, start + batch - 1)})
+            await session.commit()
+            print(f"seeded {min(rows, start + batch - 1):,}/{rows:,}")
+        await session.execute(text("ANALYZE prompts"))
+        await session.commit()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--size", type=int, default=20, help="페이지 크기")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    from api.dependencies import get_postgres_engine, get_prompt_repository, get_session_factory
+    from api.repositories.prompt import create_prompt_tables, encode_cursor
+
+    await create_prompt_tables(get_postgres_engine())
+    session_factory = get_session_factory()
+    await seed(session_factory, args.rows)
+
+    repository = get_prompt_repository()
+    print(f"rows={args.rows:,} size={args.size} (p50 / p95 ms)")
+    for depth in (0.0, 0.5, 0.99):
+        page = max(1, int(args.rows * depth) // args.size)
+        offset_p50, offset_p95 = await timed(args.repeat, lambda: repository.list_page(page, args.size))
+
+        # 같은 위치의 커서를 만들어 두고 키셋 조회
+        prompts, _ = await repository.list_page(page, args.size)
+        cursor = encode_cursor(prompts[0]) if page > 1 else None
+        keyset_p50, keyset_p95 = await timed(args.repeat, lambda: repository.list_after(cursor, args.size))
+        print(
+            f"page {page:>7,}: offset {offset_p50:8.2f} / {offset_p95:8.2f}"
+            f"   cursor {keyset_p50:6.2f} / {keyset_p95:6.2f}"
+        )
+
+    prompt_id = prompts[0].id
+    get_p50, get_p95 = await timed(args.repeat, lambda: repository.get(prompt_id))
+    print(f"get by id      : {get_p50:6.2f} / {get_p95:6.2f}")
+    for query in ("주간 회고", "존재하지 않는 검색어", f"내용 {args.rows // 2} "):
+        search_p50, search_p95 = await timed(args.repeat, lambda: repository.list_after(None, args.size, query))
+        print(f"search {query!r:<16}: {search_p50:6.2f} / {search_p95:6.2f}")
+
+    await get_postgres_engine().dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
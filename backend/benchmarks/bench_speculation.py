@@ -0,0 +1,60 @@
+"""투기 실행(판사 결정 중 다음 노드 미리 실행) 벤치마크
+
+가짜 LLM 으로 같은 토론을 투기 실행 없이/있이 반복 실행해 토론 1회 지연과
+적중률, 판사와 겹쳐 줄인 지연, 폐기한 응답의 토큰 수를 비교한다.
+--decisions 로 라운드별 판사 결정을 바꿔 예측이 틀리는 경우(MORE_RESEARCH 등)도 측정할 수 있다.
+
+    PYTHON_ENV=test python -m benchmarks.bench_speculation --rounds 3 --decisions REVISE_PLAN REVISE_PLAN FINALIZE
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import percentile
+
+
+async def measure(args: argparse.Namespace, speculate: bool) -> tuple[list[float], list]:
+    from api.services.workflow import RunUsage, run_discussion
+
+    samples, usages = [], []
+    for index in range(args.iterations):
+        usage = RunUsage()
+        started = time.perf_counter()
+        async for _ in run_discussion(f"투기 실행 측정 {index}", args.rounds, usage=usage, speculate=speculate):
+            pass
+        samples.append(time.perf_counter() - started)
+        usages.append(usage)
+    return samples, usages
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--decisions", nargs="+", default=["REVISE_PLAN", "REVISE_PLAN", "FINALIZE"])
+    parser.add_argument("--iterations", type=int, default=5, help="모드별 반복 측정 횟수")
+    parser.add_argument("--latency", type=float, default=0.2, help="LLM 첫 토큰 지연 (초)")
+    args = parser.parse_args()
+
+    from api.services import workflow
+    from api.services.fake_llm import FakeChatModel
+
+    workflow.llm = FakeChatModel(workflow.LLM_MODEL, latency=args.latency, decisions=args.decisions)
+    workflow.response_cache = None  # 투기 실행 응답이 캐시 적중으로 바뀌지 않도록 비활성화
+
+    print(f"{'mode':12}{'p50 s':>8}{'p95 s':>8}{'hits':>6}{'misses':>8}{'saved s':>9}{'wasted tok':>12}{'tokens':>9}")
+    for speculate in (False, True):
+        samples, usages = await measure(args, speculate)
+        hits = sum(usage.speculative_hits for usage in usages)
+        misses = sum(usage.speculative_misses for usage in usages)
+        saved = sum(usage.speculation_saved_seconds for usage in usages) / len(usages)
+        wasted = sum(usage.speculation_wasted_tokens for usage in usages) / len(usages)
+        tokens = sum(usage.total_tokens for usage in usages) / len(usages)
+        print(
+            f"{'speculative' if speculate else 'baseline':12}{percentile(samples, 0.5):>8.3f}"
+            f"{percentile(samples, 0.95):>8.3f}{hits:>6}{misses:>8}{saved:>9.3f}{wasted:>12.0f}{tokens:>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+"""SSE 인코딩 벤치마크 (토론 1회당 전송 바이트 / CPU 시간)
+
+가짜 LLM 으로 토론 1회를 실행해 SSE 이벤트를 모은 뒤 다음을 비교한다.
+
+- 직렬화: 기존 json.dumps(ensure_ascii=False, default=str) + isoformat() vs orjson (encode_event)
+- 전송 바이트: 압축 없음 / gzip / brotli (이벤트마다 flush 하는 스트리밍 압축)
+
+    PYTHON_ENV=test python -m benchmarks.bench_sse_encoding --rounds 3 --response-tokens 300
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime
+
+import benchmarks.common  # noqa: F401  (src 경로 설정)
+
+
+def legacy_encode(event_type: str, data: dict) -> str:
+    data = {**data, "timestamp": data["timestamp"].isoformat()}
+    return f"event: {event_type}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+async def collect_events(args: argparse.Namespace) -> list[str]:
+    from api.repositories.workflow_run import InMemoryWorkflowRunRepository
+    from api.services import workflow
+    from api.services.fake_llm import FakeChatModel
+    from api.services.workflow_runner import run_workflow_with_sse
+
+    workflow.llm = FakeChatModel(
+        workflow.LLM_MODEL, latency=0, token_interval=0, response_tokens=args.response_tokens, decisions=args.decisions
+    )
+    repository = InMemoryWorkflowRunRepository()
+    await repository.create("bench", {"status": "pending", "current_round": 1})
+    events = run_workflow_with_sse(repository, "bench", "SSE 인코딩 벤치마크", args.rounds, args.stream_tokens)
+    return [event async for event in events]
+
+
+def parse(event: str) -> tuple[str, dict]:
+    header, data = event.rstrip("\n").split("\n", 1)
+    payload = json.loads(data.removeprefix("data: "))
+    payload["timestamp"] = datetime.now()
+    return header.removeprefix("event: "), payload
+
+
+def cpu_ms(iterations: int, run) -> float:
+    started = time.process_time()
+    for _ in range(iterations):
+        run()
+    return (time.process_time() - started) * 1000 / iterations
+
+
+async def compressed_size(events: list[str], encoding: str) -> tuple[int, float]:
+    from api.services.sse_encoder import compress_events
+
+    async def source():
+        for event in events:
+            yield event
+
+    started = time.process_time()
+    size = sum([len(chunk) async for chunk in compress_events(source(), encoding)])
+    return size, (time.process_time() - started) * 1000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--decisions", nargs="+", default=["REVISE_PLAN", "MORE_RESEARCH", "FINALIZE"])
+    parser.add_argument("--response-tokens", type=int, default=300)
+    parser.add_argument("--stream-tokens", action="store_true", help="토큰 단위 스트리밍(agent_delta) 포함")
+    parser.add_argument("--iterations", type=int, default=200, help="직렬화 CPU 측정 반복 횟수")
+    args = parser.parse_args()
+
+    from api.services.sse_encoder import encode_event, supported_encodings
+
+    events = await collect_events(args)
+    parsed = [parse(event) for event in events]
+
+    legacy = cpu_ms(args.iterations, lambda: [legacy_encode(name, data) for name, data in parsed])
+    current = cpu_ms(args.iterations, lambda: [encode_event(name, data) for name, data in parsed])
+
+    print(f"events per debate={len(events)} rounds={args.rounds} stream_tokens={args.stream_tokens}")
+    print(f"{'serialization':28}{'CPU ms/debate':>16}")
+    print(f"{'json.dumps + isoformat':28}{legacy:>16.3f}")
+    print(f"{'orjson (encode_event)':28}{current:>16.3f}")
+
+    identity = len("".join(events).encode())
+    print(f"\n{'encoding':28}{'bytes/debate':>16}{'ratio':>10}{'CPU ms':>10}")
+    print(f"{'identity':28}{identity:>16}{1:>10.2f}{0:>10.3f}")
+    for encoding in supported_encodings():
+        size, seconds = await compressed_size(events, encoding)
+        print(f"{encoding:28}{size:>16}{size / identity:>10.2f}{seconds:>10.3f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
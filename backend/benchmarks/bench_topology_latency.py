@@ -0,0 +1,60 @@
+"""linear vs parallel 토폴로지 라운드 지연 비교
+
+모든 LLM 호출은 FakeChatModel 의 같은 지연 분포(seed 고정)를 따르므로 프롬프트 길이나 내용이 지연에 영향을 주지 않는다.
+토폴로지마다 같은 seed 로 새 모델을 만들어 같은 난수 순서에서 측정을 시작한다.
+병렬 토폴로지는 라운드당 호출이 더 많지만, 임계 경로(기획 → 리서치 → 비평 → 판사)의 호출 수는 같다.
+
+    PYTHON_ENV=test python -m benchmarks.bench_topology_latency --rounds 5 --latency 0.2 --distribution lognormal
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import percentile
+
+
+async def measure_round(topology: str) -> float:
+    from api.services.workflow import run_discussion
+
+    started = time.perf_counter()
+    async for _ in run_discussion("라운드 지연 측정", 1, topology=topology):
+        pass
+    return time.perf_counter() - started
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=5, help="토폴로지별 반복 측정 횟수")
+    parser.add_argument("--latency", type=float, default=0.2, help="LLM 호출 1회의 평균 첫 토큰 지연 (초)")
+    parser.add_argument("--distribution", choices=["fixed", "uniform", "exponential", "lognormal"], default="fixed")
+    parser.add_argument("--token-interval", type=float, default=0.005)
+    parser.add_argument("--response-tokens", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    from api.services import workflow
+    from api.services.fake_llm import FakeChatModel
+
+    workflow.response_cache = None  # 반복 측정이 캐시 적중으로 왜곡되지 않도록 비활성화
+
+    results = {}
+    for topology in ("linear", "parallel"):
+        workflow.llm = FakeChatModel(
+            workflow.LLM_MODEL,
+            latency=args.latency,
+            distribution=args.distribution,
+            token_interval=args.token_interval,
+            response_tokens=args.response_tokens,
+            seed=args.seed,
+        )
+        results[topology] = [await measure_round(topology) for _ in range(args.rounds)]
+
+    for topology, samples in results.items():
+        print(f"{topology:8s} p50={percentile(samples, 0.5):6.3f}s  p95={percentile(samples, 0.95):6.3f}s")
+    speedup = percentile(results["linear"], 0.5) / percentile(results["parallel"], 0.5)
+    print(f"round latency ratio (linear / parallel): {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
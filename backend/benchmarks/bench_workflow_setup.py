@@ -0,0 +1,57 @@
+"""요청당 워크플로우 준비 비용 마이크로 벤치마크
+
+토론 1회를 시작하기 전에 드는 준비 비용을 비교한다.
+
+- 기존: 요청마다 ChatOpenAI 클라이언트 생성 + StateGraph 구성/컴파일
+- 개선: WorkflowRegistry 에서 컴파일된 그래프 조회 + 공유 클라이언트 사용
+
+    PYTHON_ENV=test python -m benchmarks.bench_workflow_setup --iterations 200
+"""
+
+import argparse
+import time
+
+from benchmarks.common import percentile
+
+
+def measure(iterations: int, setup) -> dict[str, float]:
+    durations: list[float] = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        setup()
+        durations.append((time.perf_counter() - started) * 1000)
+    return {
+        "mean_ms": sum(durations) / len(durations),
+        "p50_ms": percentile(durations, 0.5),
+        "p95_ms": percentile(durations, 0.95),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--topology", choices=["linear", "parallel"], default="linear")
+    args = parser.parse_args()
+
+    from langchain_openai import ChatOpenAI
+
+    from api.services import workflow
+
+    def per_request_setup():
+        ChatOpenAI(api_key=workflow.settings.OPENAI_API_KEY, model=workflow.LLM_MODEL, temperature=0.7)
+        workflow.create_discussion_workflow(args.topology)
+
+    registry = workflow.WorkflowRegistry()
+    registry.warm_up()
+
+    before = measure(args.iterations, per_request_setup)
+    after = measure(args.iterations, lambda: registry.get(args.topology))
+
+    print(f"iterations={args.iterations} topology={args.topology}")
+    print(f"{'':28}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for label, result in (("per-request compile", before), ("registry (compiled once)", after)):
+        print(f"{label:28}{result['mean_ms']:>10.3f}{result['p50_ms']:>10.3f}{result['p95_ms']:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
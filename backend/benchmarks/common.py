@@ -0,0 +1,51 @@
+"""벤치마크 공용 유틸리티
+
+벤치마크는 OpenAI를 호출하지 않도록 지연만 흉내 내는 Stub LLM을 사용한다.
+backend 디렉터리에서 `PYTHON_ENV=test python -m benchmarks.<name>` 형태로 실행한다.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+SRC_DIRECTORY = Path(__file__).resolve().parent.parent / "src"
+if str(SRC_DIRECTORY) not in sys.path:
+    sys.path.insert(0, str(SRC_DIRECTORY))
+
+CONTENT = "벤치마크 응답입니다. 실제 모델 대신 고정된 문장을 돌려줍니다.\nDECISION: FINALIZE"
+
+
+class StubLLM:
+    """고정 지연 후 FINALIZE 결정을 돌려주는 LLM
+
+    blocking=True 이면 기존 동기 llm.invoke 처럼 이벤트 루프를 막는다.
+    """
+
+    def __init__(self, latency: float = 0.2, blocking: bool = False):
+        self.latency = latency
+        self.blocking = blocking
+
+    async def ainvoke(self, prompt: str) -> AIMessage:
+        if self.blocking:
+            time.sleep(self.latency)
+        else:
+            await asyncio.sleep(self.latency)
+        return AIMessage(content=CONTENT)
+
+    async def astream(self, prompt: str):
+        tokens = CONTENT.split(" ")
+        for token in tokens:
+            await asyncio.sleep(self.latency / len(tokens))
+            yield AIMessageChunk(content=token + " ")
+
+
+def percentile(values: list[float], ratio: float) -> float:
+    """정렬된 값 목록의 백분위수"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(ratio * (len(ordered) - 1))))
+    return ordered[index]
@@ -0,0 +1,177 @@
+"""워크플로우 API 부하 테스트
+
+N 개의 SSE 클라이언트가 서로 다른 X-Client-Id 로 동시에 /workflows/execute 를 호출하고, 다음을 보고한다.
+
+- 첫 이벤트까지의 시간(time-to-first-event) p50/p95/p99 (입장 대기 중의 queued 이벤트는 제외하므로 대기 시간이 포함된다)
+- 토론 1회 전체 소요 시간 p50/p95/p99 와 전체 소요 시간
+- 초당 이벤트 수 (전체 / 워커당)
+
+기본은 가짜 LLM(FakeChatModel)과 메모리 저장소를 사용하는 앱을 같은 프로세스의 uvicorn 으로 띄운다.
+(httpx.ASGITransport 는 응답 본문을 모아서 돌려주므로 첫 이벤트 시간을 잴 수 없다)
+실행 중인 서버를 측정하려면 서버를 LLM_PROVIDER=fake 로 띄우고 --base-url 과 --workers(uvicorn 워커 수)를 준다.
+
+    PYTHON_ENV=test python -m benchmarks.load_test_workflows --clients 50 --latency 0.2 --distribution lognormal
+    PYTHON_ENV=test python -m benchmarks.load_test_workflows --base-url http://localhost:8000 --workers 4
+"""
+
+import argparse
+import asyncio
+import socket
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+import httpx
+import uvicorn
+
+from benchmarks.common import percentile
+
+
+@dataclass
+class ClientResult:
+    first_event: float | None = None  # 요청 시작 ~ queued 가 아닌 첫 SSE 이벤트 (초)
+    duration: float = 0.0  # 요청 시작 ~ 스트림 종료 (초)
+    events: int = 0
+    queued: bool = False  # 입장 대기열에서 기다렸는지
+    error: str | None = None
+
+
+def is_queued_event(event_type: str | None, data: str) -> bool:
+    """입장 대기 순번을 알리는 status_update(queued) 이벤트인지"""
+    return event_type == "status_update" and '"status":"queued"' in data
+
+
+async def run_client(client: httpx.AsyncClient, index: int, args: argparse.Namespace) -> ClientResult:
+    payload = {
+        "task": f"부하 테스트 과제 {index}",
+        "max_rounds": args.rounds,
+        "stream_tokens": args.stream_tokens,
+        "topology": args.topology,
+        "use_cache": False,
+    }
+    # 클라이언트별 동시 실행 제한(WORKFLOW_MAX_ACTIVE_PER_CLIENT)이 모든 요청을 한 클라이언트로 묶지 않도록 구분한다
+    headers = {"X-Client-Id": f"load-test-{index}"}
+    result = ClientResult()
+    started = time.perf_counter()
+    try:
+        async with client.stream("POST", "/api/v1/workflows/execute", json=payload, headers=headers) as response:
+            response.raise_for_status()
+            event_type, data = None, ""
+            async for line in response.aiter_lines():
+                if line.startswith("event:"):
+                    event_type = line.removeprefix("event:").strip()
+                elif line.startswith("data:"):
+                    data += line.removeprefix("data:")
+                elif not line and event_type is not None:
+                    # 빈 줄에서 이벤트 1개가 끝난다
+                    if is_queued_event(event_type, data):
+                        result.queued = True
+                    elif result.first_event is None:
+                        result.first_event = time.perf_counter() - started
+                    result.events += 1
+                    event_type, data = None, ""
+    except httpx.HTTPError as e:
+        result.error = repr(e)
+    result.duration = time.perf_counter() - started
+    return result
+
+
+def create_in_process_app(args: argparse.Namespace):
+    """가짜 LLM 과 메모리 저장소를 사용하는 앱 (외부 서비스 없이 실행)"""
+    from api.dependencies import get_event_log, get_workflow_run_repository
+    from api.repositories.workflow_run import InMemoryWorkflowRunRepository
+    from api.services import workflow
+    from api.services.event_log import InMemoryEventLog
+    from api.services.fake_llm import FakeChatModel
+    from main import app
+
+    repository = InMemoryWorkflowRunRepository()
+    event_log = InMemoryEventLog()
+    app.dependency_overrides[get_workflow_run_repository] = lambda: repository
+    app.dependency_overrides[get_event_log] = lambda: event_log
+    workflow.llm = FakeChatModel(
+        workflow.LLM_MODEL,
+        latency=args.latency,
+        distribution=args.distribution,
+        token_interval=args.token_interval,
+        response_tokens=args.response_tokens,
+        decisions=args.decisions,
+        seed=args.seed,
+    )
+    return app
+
+
+@asynccontextmanager
+async def serve_in_process(app):
+    """빈 포트에서 uvicorn 서버를 실행하고 주소를 반환"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    # 앱 lifespan 은 외부 저장소(MongoDB/PostgreSQL)에 연결하므로 끈다
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="off")
+    server = uvicorn.Server(config)
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        await task
+
+
+def report(results: list[ClientResult], elapsed: float, workers: int) -> None:
+    succeeded = [result for result in results if result.error is None]
+    first_events = [result.first_event for result in succeeded if result.first_event is not None]
+    durations = [result.duration for result in succeeded]
+    events = sum(result.events for result in results)
+
+    queued = sum(result.queued for result in results)
+    print(f"clients={len(results)} succeeded={len(succeeded)} failed={len(results) - len(succeeded)} queued={queued}")
+    print(f"{'':22}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for label, values in (("time to first event", first_events), ("debate duration", durations)):
+        print(f"{label:22}" + "".join(f"{percentile(values, ratio):>10.3f}" for ratio in (0.5, 0.95, 0.99)))
+    print(f"total duration        {elapsed:10.3f}s")
+    print(f"events/sec            {events / elapsed:10.1f}  (per worker: {events / elapsed / workers:.1f})")
+    for result in results:
+        if result.error is not None:
+            print(f"error: {result.error}")
+            break
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=50, help="동시 SSE 클라이언트 수")
+    parser.add_argument("--rounds", type=int, default=1, help="토론당 최대 라운드 수")
+    parser.add_argument("--topology", choices=["linear", "parallel"], default="linear")
+    parser.add_argument("--stream-tokens", action="store_true", help="토큰 단위 스트리밍(agent_delta) 사용")
+    parser.add_argument("--base-url", help="실행 중인 서버 주소 (없으면 프로세스 안에서 앱 실행)")
+    parser.add_argument("--workers", type=int, default=1, help="서버 워커 수 (워커당 처리량 계산용)")
+    # 프로세스 안에서 실행할 때의 가짜 LLM 설정
+    parser.add_argument("--latency", type=float, default=0.2, help="LLM 첫 토큰까지의 평균 지연(초)")
+    parser.add_argument("--distribution", choices=["fixed", "uniform", "exponential", "lognormal"], default="fixed")
+    parser.add_argument("--token-interval", type=float, default=0.005)
+    parser.add_argument("--response-tokens", type=int, default=50)
+    parser.add_argument("--decisions", nargs="+", default=["FINALIZE"], help="라운드별 판사 결정")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.base_url:
+        results, elapsed = await run_clients(args.base_url, args)
+    else:
+        async with serve_in_process(create_in_process_app(args)) as base_url:
+            results, elapsed = await run_clients(base_url, args)
+
+    report(results, elapsed, args.workers)
+
+
+async def run_clients(base_url: str, args: argparse.Namespace) -> tuple[list[ClientResult], float]:
+    limits = httpx.Limits(max_connections=args.clients)
+    async with httpx.AsyncClient(base_url=base_url, timeout=None, limits=limits) as client:
+        started = time.perf_counter()
+        results = await asyncio.gather(*(run_client(client, index, args) for index in range(args.clients)))
+        return list(results), time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,126 @@
+from functools import lru_cache
+
+import redis.asyncio as redis
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import InMemorySaver
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from api.repositories.checkpoint import MongoCheckpointSaver
+from api.repositories.prompt import InMemoryPromptRepository, PromptRepository, SqlPromptRepository
+from api.repositories.prompt_cache import CachedPromptRepository
+from api.repositories.workflow_run import (
+    InMemoryWorkflowRunRepository,
+    MongoWorkflowRunRepository,
+    WorkflowRunRepository,
+)
+from api.services.admission import AdmissionController
+from api.services.cancellation import CancellationBroker, LocalCancellationBroker, RedisCancellationBroker
+from api.services.event_log import EventLog, InMemoryEventLog, RedisEventLog
+from api.services.job_queue import InMemoryJobQueue, JobQueue, RedisJobQueue
+from config.settings import get_settings
+
+
+@lru_cache
+def get_postgres_engine() -> AsyncEngine:
+    """PostgreSQL 엔진 (프로세스당 1개, 커넥션 풀 공유)"""
+    settings = get_settings()
+    return create_async_engine(
+        settings.POSTGRES_URL,
+        pool_size=settings.POSTGRES_POOL_SIZE,
+        max_overflow=settings.POSTGRES_MAX_OVERFLOW,
+        pool_recycle=settings.POSTGRES_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=True,
+    )
+
+
+@lru_cache
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(get_postgres_engine(), expire_on_commit=False)
+
+
+@lru_cache
+def get_prompt_repository() -> PromptRepository:
+    """프롬프트 저장소 (PROMPT_STORE_BACKEND, PROMPT_CACHE_BACKEND 설정에 따라 선택)"""
+    settings = get_settings()
+    if settings.PROMPT_STORE_BACKEND == "memory":
+        return InMemoryPromptRepository()
+
+    repository = SqlPromptRepository(get_session_factory())
+    if settings.PROMPT_CACHE_BACKEND == "redis":
+        return CachedPromptRepository(
+            repository, get_redis_client(), settings.PROMPT_CACHE_TTL_SECONDS, settings.PROMPT_CACHE_LOCK_SECONDS
+        )
+    return repository
+
+
+@lru_cache
+def get_mongo_client() -> AsyncIOMotorClient:
+    """MongoDB 클라이언트 (프로세스당 1개, 커넥션 풀 공유)"""
+    return AsyncIOMotorClient(get_settings().MONGODB_URL)
+
+
+def get_mongo_database() -> AsyncIOMotorDatabase:
+    return get_mongo_client()[get_settings().MONGODB_DATABASE]
+
+
+@lru_cache
+def get_workflow_run_repository() -> WorkflowRunRepository:
+    """워크플로우 실행 기록 저장소 (WORKFLOW_STORE_BACKEND 설정에 따라 선택)"""
+    settings = get_settings()
+    if settings.WORKFLOW_STORE_BACKEND == "memory":
+        return InMemoryWorkflowRunRepository(settings.WORKFLOW_RUN_TTL_SECONDS, settings.WORKFLOW_RUN_LEASE_SECONDS)
+    return MongoWorkflowRunRepository(
+        get_mongo_database()["workflow_runs"], settings.WORKFLOW_RUN_TTL_SECONDS, settings.WORKFLOW_RUN_LEASE_SECONDS
+    )
+
+
+@lru_cache
+def get_checkpointer() -> BaseCheckpointSaver | None:
+    """토론 그래프 체크포인터 (WORKFLOW_CHECKPOINT_BACKEND 설정에 따라 선택)"""
+    settings = get_settings()
+    if settings.WORKFLOW_CHECKPOINT_BACKEND == "none":
+        return None
+    if settings.WORKFLOW_CHECKPOINT_BACKEND == "memory":
+        return InMemorySaver()
+    database = get_mongo_database()
+    return MongoCheckpointSaver(
+        database["workflow_checkpoints"], database["workflow_checkpoint_writes"], settings.WORKFLOW_RUN_TTL_SECONDS
+    )
+
+
+@lru_cache
+def get_redis_client() -> redis.Redis:
+    """Redis 클라이언트 (프로세스당 1개, 커넥션 풀 공유)"""
+    return redis.from_url(get_settings().REDIS_URL, decode_responses=True)
+
+
+@lru_cache
+def get_job_queue() -> JobQueue:
+    """워크플로우 작업 큐 (JOB_QUEUE_BACKEND 설정에 따라 선택)"""
+    if get_settings().JOB_QUEUE_BACKEND == "memory":
+        return InMemoryJobQueue()
+    return RedisJobQueue(get_redis_client())
+
+
+@lru_cache
+def get_event_log() -> EventLog:
+    """워크플로우 SSE 이벤트 기록 (EVENT_LOG_BACKEND 설정에 따라 선택)"""
+    settings = get_settings()
+    if settings.EVENT_LOG_BACKEND == "memory":
+        return InMemoryEventLog(settings.WORKFLOW_RUN_TTL_SECONDS)
+    return RedisEventLog(get_redis_client(), settings.WORKFLOW_RUN_TTL_SECONDS)
+
+
+@lru_cache
+def get_admission_controller() -> AdmissionController:
+    """/workflows/execute 입장 제어 (프로세스당 1개)"""
+    return AdmissionController.from_settings(get_settings())
+
+
+@lru_cache
+def get_cancellation_broker() -> CancellationBroker:
+    """워크플로우 취소 요청 전달 (워커가 별도 프로세스인 redis 작업 큐에서는 Pub/Sub 사용)"""
+    if get_settings().JOB_QUEUE_BACKEND == "memory":
+        return LocalCancellationBroker()
+    return RedisCancellationBroker(get_redis_client())
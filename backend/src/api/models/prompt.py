@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from sqlalchemy import Computed, DateTime, Index, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from api.models.base import Base
+
+# 검색 대상 컬럼을 하나로 합친 생성 컬럼 (트라이그램 인덱스 대상)
+SEARCH_TEXT_EXPRESSION = "coalesce(title, '') || ' ' || coalesce(description, '') || ' ' || content"
+
+
+class Prompt(Base):
+    __tablename__ = "prompts"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    title: Mapped[str] = mapped_column(Text)
+    content: Mapped[str] = mapped_column(Text)
+    description: Mapped[str | None] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    search_text: Mapped[str] = mapped_column(Text, Computed(SEARCH_TEXT_EXPRESSION, persisted=True), deferred=True)
+
+    __table_args__ = (
+        # 키셋 페이지네이션 (created_at DESC, id DESC)
+        Index("ix_prompts_created_at_id", "created_at", "id"),
+        # 부분 문자열 검색 (ILIKE '%검색어%'), 한국어처럼 형태소 분석이 필요한 텍스트에도 동작
+        Index(
+            "ix_prompts_search_text_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+    )
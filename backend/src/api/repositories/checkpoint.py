@@ -0,0 +1,195 @@
+from collections.abc import AsyncIterator, Sequence
+from typing import Any
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    SerializerProtocol,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReplaceOne, UpdateOne
+
+from api.repositories.workflow_run import _expires_at
+
+
+class MongoCheckpointSaver(BaseCheckpointSaver[str]):
+    """MongoDB(Motor) 기반 LangGraph 체크포인터
+
+    - 노드(슈퍼스텝)가 끝날 때마다 상태 전체를 checkpoints 컬렉션에 저장하고, 진행 중인 단계에서 먼저 끝난
+      노드의 출력은 writes 컬렉션에 저장한다. 다른 워커가 같은 thread_id 로 이어서 실행할 수 있다.
+    - 실행 기록과 같이 expires_at TTL 인덱스로 만료된다.
+    - 토론 그래프는 비동기로만 실행하므로 비동기 메서드만 구현한다.
+    """
+
+    def __init__(
+        self,
+        checkpoints: AsyncIOMotorCollection,
+        writes: AsyncIOMotorCollection,
+        ttl_seconds: int = 1800,
+        serde: SerializerProtocol | None = None,
+    ):
+        super().__init__(serde=serde)
+        self.checkpoints = checkpoints
+        self.writes = writes
+        self.ttl_seconds = ttl_seconds
+
+    async def ensure_indexes(self) -> None:
+        """인덱스 생성 (애플리케이션 시작 시 1회)"""
+        await self.checkpoints.create_indexes(
+            [
+                IndexModel(
+                    [("thread_id", ASCENDING), ("checkpoint_ns", ASCENDING), ("checkpoint_id", DESCENDING)],
+                    unique=True,
+                    name="thread_checkpoint",
+                ),
+                IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="expires_at_ttl"),
+            ]
+        )
+        await self.writes.create_indexes(
+            [
+                IndexModel(
+                    [
+                        ("thread_id", ASCENDING),
+                        ("checkpoint_ns", ASCENDING),
+                        ("checkpoint_id", ASCENDING),
+                        ("task_id", ASCENDING),
+                        ("idx", ASCENDING),
+                    ],
+                    unique=True,
+                    name="thread_checkpoint_task",
+                ),
+                IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="expires_at_ttl"),
+            ]
+        )
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        """checkpoint_id 가 없으면 thread 의 가장 최근 체크포인트"""
+        configurable = config["configurable"]
+        query = {"thread_id": configurable["thread_id"], "checkpoint_ns": configurable.get("checkpoint_ns", "")}
+        if checkpoint_id := get_checkpoint_id(config):
+            query["checkpoint_id"] = checkpoint_id
+        document = await self.checkpoints.find_one(query, sort=[("checkpoint_id", DESCENDING)])
+        return await self._to_tuple(document) if document else None
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        query: dict[str, Any] = {}
+        if config:
+            configurable = config["configurable"]
+            query["thread_id"] = configurable["thread_id"]
+            if "checkpoint_ns" in configurable:
+                query["checkpoint_ns"] = configurable["checkpoint_ns"]
+            if checkpoint_id := get_checkpoint_id(config):
+                query["checkpoint_id"] = checkpoint_id
+        if before and (before_id := get_checkpoint_id(before)):
+            query.setdefault("checkpoint_id", {})
+            if isinstance(query["checkpoint_id"], dict):
+                query["checkpoint_id"]["$lt"] = before_id
+
+        count = 0
+        async for document in self.checkpoints.find(query).sort("checkpoint_id", DESCENDING):
+            if limit is not None and count >= limit:
+                return
+            checkpoint = await self._to_tuple(document)
+            # 메타데이터는 직렬화되어 있으므로 필터는 읽은 뒤 적용한다
+            if filter and any(checkpoint.metadata.get(key) != value for key, value in filter.items()):
+                continue
+            count += 1
+            yield checkpoint
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        configurable = config["configurable"]
+        key = {
+            "thread_id": configurable["thread_id"],
+            "checkpoint_ns": configurable.get("checkpoint_ns", ""),
+            "checkpoint_id": checkpoint["id"],
+        }
+        document = {
+            **key,
+            "parent_checkpoint_id": configurable.get("checkpoint_id"),
+            "checkpoint": self._dump(checkpoint),
+            "metadata": self._dump(get_checkpoint_metadata(config, metadata)),
+            "expires_at": _expires_at(self.ttl_seconds),
+        }
+        await self.checkpoints.replace_one(key, document, upsert=True)
+        return {"configurable": key}
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        configurable = config["configurable"]
+        operations = []
+        for index, (channel, value) in enumerate(writes):
+            idx = WRITES_IDX_MAP.get(channel, index)
+            key = {
+                "thread_id": configurable["thread_id"],
+                "checkpoint_ns": configurable.get("checkpoint_ns", ""),
+                "checkpoint_id": configurable["checkpoint_id"],
+                "task_id": task_id,
+                "idx": idx,
+            }
+            document = {
+                **key,
+                "channel": channel,
+                "task_path": task_path,
+                "value": self._dump(value),
+                "expires_at": _expires_at(self.ttl_seconds),
+            }
+            if idx >= 0:
+                # 일반 쓰기는 처음 기록한 값을 유지 (재시도된 태스크가 중복 기록하지 않도록)
+                operations.append(UpdateOne(key, {"$setOnInsert": document}, upsert=True))
+            else:
+                # 오류/인터럽트 같은 특수 채널은 최신 값으로 덮어쓴다
+                operations.append(ReplaceOne(key, document, upsert=True))
+        if operations:
+            await self.writes.bulk_write(operations, ordered=False)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await self.checkpoints.delete_many({"thread_id": thread_id})
+        await self.writes.delete_many({"thread_id": thread_id})
+
+    async def _to_tuple(self, document: dict[str, Any]) -> CheckpointTuple:
+        key = {
+            "thread_id": document["thread_id"],
+            "checkpoint_ns": document["checkpoint_ns"],
+            "checkpoint_id": document["checkpoint_id"],
+        }
+        writes = await self.writes.find(key).sort([("task_id", ASCENDING), ("idx", ASCENDING)]).to_list(length=None)
+        parent_id = document.get("parent_checkpoint_id")
+        return CheckpointTuple(
+            config={"configurable": key},
+            checkpoint=self._load(document["checkpoint"]),
+            metadata=self._load(document["metadata"]),
+            parent_config={"configurable": {**key, "checkpoint_id": parent_id}} if parent_id else None,
+            pending_writes=[(write["task_id"], write["channel"], self._load(write["value"])) for write in writes],
+        )
+
+    def _dump(self, value: Any) -> dict[str, Any]:
+        type_, data = self.serde.dumps_typed(value)
+        return {"type": type_, "data": data}
+
+    def _load(self, stored: dict[str, Any]) -> Any:
+        return self.serde.loads_typed((stored["type"], bytes(stored["data"])))
@@ -0,0 +1,249 @@
+import base64
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import delete, func, literal_column, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from api.models.base import Base
+from api.models.prompt import Prompt
+from api.schemas.prompt import PromptBulkItem, PromptCreate, PromptInDB
+
+
+# -------------------- 1. 커서 --------------------
+def encode_cursor(prompt: PromptInDB) -> str:
+    """정렬 키(created_at, id)를 불투명한 커서 문자열로 변환"""
+    raw = f"{prompt.created_at.isoformat()}|{prompt.id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """커서를 (created_at, id)로 변환. 잘못된 커서는 ValueError"""
+    try:
+        created_at, prompt_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|", 1)
+        return datetime.fromisoformat(created_at), prompt_id
+    except (UnicodeError, ValueError) as e:
+        raise ValueError(f"잘못된 커서입니다: {cursor}") from e
+
+
+LIKE_ESCAPE = "!"
+
+
+def escape_like(query: str) -> str:
+    """LIKE 패턴 특수문자(%, _) 이스케이프"""
+    return query.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+
+
+# -------------------- 2. 저장소 --------------------
+class PromptRepository(ABC):
+    """프롬프트 저장소
+
+    목록은 최신순(created_at DESC, id DESC)으로 정렬되며, 커서(마지막 항목의 정렬 키) 기반
+    조회는 OFFSET 없이 인덱스 범위 탐색만 하므로 페이지 깊이와 관계없이 일정한 시간이 걸린다.
+    """
+
+    @abstractmethod
+    async def get(self, prompt_id: str) -> PromptInDB | None: ...
+
+    @abstractmethod
+    async def create(self, prompt: PromptCreate) -> PromptInDB: ...
+
+    @abstractmethod
+    async def update(self, prompt_id: str, fields: dict[str, Any]) -> PromptInDB | None: ...
+
+    @abstractmethod
+    async def delete(self, prompt_id: str) -> PromptInDB | None: ...
+
+    @abstractmethod
+    async def bulk_upsert(self, items: list[PromptBulkItem]) -> dict[str, bool]:
+        """id 가 있는 항목을 한 번에 삽입하거나 갱신. {id: 새로 생성 여부} 반환 (id 는 배치 내에서 유일)"""
+
+    @abstractmethod
+    async def list_page(self, page: int = 1, size: int = 10) -> tuple[list[PromptInDB], int]:
+        """페이지 번호 기반 조회. (프롬프트 목록, 전체 개수) 반환"""
+
+    @abstractmethod
+    async def list_after(
+        self, cursor: str | None = None, size: int = 10, query: str | None = None
+    ) -> tuple[list[PromptInDB], str | None]:
+        """커서 이후 size 개 조회 (query 가 있으면 제목/내용/설명 부분 문자열 검색). (목록, 다음 커서) 반환"""
+
+    async def iterate(self, batch_size: int = 500) -> AsyncIterator[PromptInDB]:
+        """전체 프롬프트를 최신순으로 batch_size 개씩 조회하며 순회 (메모리에는 한 배치만 유지)"""
+        cursor = None
+        while True:
+            prompts, cursor = await self.list_after(cursor, batch_size)
+            for prompt in prompts:
+                yield prompt
+            if cursor is None:
+                return
+
+
+class SqlPromptRepository(PromptRepository):
+    """PostgreSQL(SQLAlchemy async) 기반 저장소
+
+    작업마다 커넥션 풀에서 세션을 빌려 쓰고 바로 반환하므로, 스트리밍 응답(export)처럼
+    오래 걸리는 요청도 커넥션을 점유하지 않는다.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+        self.session_factory = session_factory
+
+    async def get(self, prompt_id: str) -> PromptInDB | None:
+        async with self.session_factory() as session:
+            prompt = await session.get(Prompt, prompt_id)
+            return self._to_schema(prompt) if prompt else None
+
+    async def create(self, prompt: PromptCreate) -> PromptInDB:
+        now = datetime.now(timezone.utc)
+        row = Prompt(id=str(uuid4()), **prompt.model_dump(), created_at=now, updated_at=now)
+        async with self.session_factory() as session:
+            session.add(row)
+            await session.commit()
+            return self._to_schema(row)
+
+    async def update(self, prompt_id: str, fields: dict[str, Any]) -> PromptInDB | None:
+        statement = (
+            update(Prompt)
+            .where(Prompt.id == prompt_id)
+            .values(**fields, updated_at=datetime.now(timezone.utc))
+            .returning(Prompt)
+        )
+        async with self.session_factory() as session:
+            prompt = (await session.execute(statement)).scalar_one_or_none()
+            await session.commit()
+            return self._to_schema(prompt) if prompt else None
+
+    async def delete(self, prompt_id: str) -> PromptInDB | None:
+        async with self.session_factory() as session:
+            prompt = (
+                await session.execute(delete(Prompt).where(Prompt.id == prompt_id).returning(Prompt))
+            ).scalar_one_or_none()
+            await session.commit()
+            return self._to_schema(prompt) if prompt else None
+
+    async def bulk_upsert(self, items: list[PromptBulkItem]) -> dict[str, bool]:
+        now = datetime.now(timezone.utc)
+        rows = [
+            {**item.model_dump(exclude={"id"}), "id": item.id, "created_at": now, "updated_at": now} for item in items
+        ]
+        statement = insert(Prompt).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=[Prompt.id],
+            set_={
+                "title": statement.excluded.title,
+                "content": statement.excluded.content,
+                "description": statement.excluded.description,
+                "updated_at": statement.excluded.updated_at,
+            },
+        )
+        # 새로 삽입된 행은 xmax 가 0 이다 (갱신된 행과 구분)
+        statement = statement.returning(Prompt.id, literal_column("xmax = 0"))
+        async with self.session_factory() as session:
+            result = await session.execute(statement)
+            await session.commit()
+            return {prompt_id: created for prompt_id, created in result.all()}
+
+    async def list_page(self, page: int = 1, size: int = 10) -> tuple[list[PromptInDB], int]:
+        statement = (
+            select(Prompt).order_by(Prompt.created_at.desc(), Prompt.id.desc()).offset((page - 1) * size).limit(size)
+        )
+        async with self.session_factory() as session:
+            prompts = (await session.scalars(statement)).all()
+            total = await session.scalar(select(func.count()).select_from(Prompt))
+            return [self._to_schema(prompt) for prompt in prompts], total
+
+    async def list_after(
+        self, cursor: str | None = None, size: int = 10, query: str | None = None
+    ) -> tuple[list[PromptInDB], str | None]:
+        statement = select(Prompt).order_by(Prompt.created_at.desc(), Prompt.id.desc()).limit(size + 1)
+        if cursor:
+            statement = statement.where(tuple_(Prompt.created_at, Prompt.id) < tuple_(*decode_cursor(cursor)))
+        if query:
+            statement = statement.where(Prompt.search_text.ilike(f"%{escape_like(query)}%", escape=LIKE_ESCAPE))
+
+        async with self.session_factory() as session:
+            prompts = [self._to_schema(prompt) for prompt in (await session.scalars(statement)).all()]
+        if len(prompts) <= size:
+            return prompts, None
+        return prompts[:size], encode_cursor(prompts[size - 1])
+
+    @staticmethod
+    def _to_schema(prompt: Prompt) -> PromptInDB:
+        return PromptInDB.model_validate(prompt)
+
+
+class InMemoryPromptRepository(PromptRepository):
+    """프로세스 내 저장소 (테스트 및 PostgreSQL 없는 개발 환경용)"""
+
+    def __init__(self):
+        self._prompts: dict[str, PromptInDB] = {}
+
+    async def get(self, prompt_id: str) -> PromptInDB | None:
+        return self._prompts.get(prompt_id)
+
+    async def create(self, prompt: PromptCreate) -> PromptInDB:
+        now = datetime.now(timezone.utc)
+        created = PromptInDB(id=str(uuid4()), **prompt.model_dump(), created_at=now, updated_at=now)
+        self._prompts[created.id] = created
+        return created
+
+    async def update(self, prompt_id: str, fields: dict[str, Any]) -> PromptInDB | None:
+        prompt = self._prompts.get(prompt_id)
+        if prompt is None:
+            return None
+        self._prompts[prompt_id] = prompt.model_copy(update={**fields, "updated_at": datetime.now(timezone.utc)})
+        return self._prompts[prompt_id]
+
+    async def delete(self, prompt_id: str) -> PromptInDB | None:
+        return self._prompts.pop(prompt_id, None)
+
+    async def bulk_upsert(self, items: list[PromptBulkItem]) -> dict[str, bool]:
+        now = datetime.now(timezone.utc)
+        results = {}
+        for item in items:
+            existing = self._prompts.get(item.id)
+            fields = item.model_dump(exclude={"id"})
+            if existing is None:
+                self._prompts[item.id] = PromptInDB(id=item.id, **fields, created_at=now, updated_at=now)
+            else:
+                self._prompts[item.id] = existing.model_copy(update={**fields, "updated_at": now})
+            results[item.id] = existing is None
+        return results
+
+    async def list_page(self, page: int = 1, size: int = 10) -> tuple[list[PromptInDB], int]:
+        prompts = self._sorted()
+        return prompts[(page - 1) * size : page * size], len(prompts)
+
+    async def list_after(
+        self, cursor: str | None = None, size: int = 10, query: str | None = None
+    ) -> tuple[list[PromptInDB], str | None]:
+        prompts = self._sorted()
+        if cursor:
+            position = decode_cursor(cursor)
+            prompts = [prompt for prompt in prompts if (prompt.created_at, prompt.id) < position]
+        if query:
+            needle = query.lower()
+            prompts = [
+                prompt
+                for prompt in prompts
+                if needle in f"{prompt.title} {prompt.description or ''} {prompt.content}".lower()
+            ]
+        if len(prompts) <= size:
+            return prompts, None
+        return prompts[:size], encode_cursor(prompts[size - 1])
+
+    def _sorted(self) -> list[PromptInDB]:
+        return sorted(self._prompts.values(), key=lambda prompt: (prompt.created_at, prompt.id), reverse=True)
+
+
+# -------------------- 3. 스키마 초기화 --------------------
+async def create_prompt_tables(engine: AsyncEngine) -> None:
+    """pg_trgm 확장과 테이블/인덱스 생성 (애플리케이션 시작 시 1회, 이미 있으면 무시)"""
+    async with engine.begin() as connection:
+        await connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await connection.run_sync(Base.metadata.create_all)
@@ -0,0 +1,211 @@
+import asyncio
+import logging
+import secrets
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import asdict, dataclass
+from typing import Any, TypeVar
+
+import redis.asyncio as redis
+from pydantic import TypeAdapter
+
+from api.repositories.prompt import PromptRepository
+from api.schemas.prompt import PromptBulkItem, PromptCreate, PromptInDB
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+PROMPT_ADAPTER = TypeAdapter(PromptInDB | None)
+PAGE_ADAPTER = TypeAdapter(tuple[list[PromptInDB], int])
+CURSOR_PAGE_ADAPTER = TypeAdapter(tuple[list[PromptInDB], str | None])
+
+# 잠금 값(토큰)이 그대로일 때만 삭제 (로드가 잠금 만료 시간을 넘기면 다른 프로세스가 새로 잡은 잠금을 지우지 않도록)
+UNLOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+@dataclass
+class PromptCacheStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0  # 같은 프로세스의 동시 미스가 진행 중인 로드를 공유한 횟수
+    lock_waits: int = 0  # 다른 프로세스의 로드를 기다린 횟수
+    errors: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "hit_rate": round(self.hit_rate, 4)}
+
+
+class CachedPromptRepository(PromptRepository):
+    """Redis read-through 캐시를 앞에 둔 프롬프트 저장소
+
+    - 단건(id)과 목록(page/size, cursor/size) 조회 결과를 직렬화하여 저장한다.
+    - 모든 키에 전역 버전을 포함하고, 쓰기(create/update/delete/bulk)마다 버전을 올려 무효화한다.
+      이전 버전 키는 TTL 로 정리되며, 쓰기와 동시에 진행된 로드가 이전 데이터를 저장해도 읽히지 않는다.
+    - 캐시 미스가 몰릴 때는 프로세스 내에서는 하나의 로드를 공유하고, 프로세스 간에는 SET NX 잠금을
+      잡은 한 곳만 DB 를 조회한다 (나머지는 캐시가 채워질 때까지 대기).
+    - Redis 장애 시에는 저장소를 직접 조회한다.
+    """
+
+    key_prefix = "prompt_cache:"
+    lock_poll_seconds = 0.05
+
+    def __init__(
+        self, repository: PromptRepository, client: redis.Redis, ttl_seconds: int = 300, lock_seconds: float = 5.0
+    ):
+        self.repository = repository
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.lock_seconds = lock_seconds
+        self.stats = PromptCacheStats()
+        self._loading: dict[str, asyncio.Task] = {}
+
+    # -------------------- 조회 (캐시) --------------------
+    async def get(self, prompt_id: str) -> PromptInDB | None:
+        return await self._read_through(f"id:{prompt_id}", PROMPT_ADAPTER, lambda: self.repository.get(prompt_id))
+
+    async def list_page(self, page: int = 1, size: int = 10) -> tuple[list[PromptInDB], int]:
+        return await self._read_through(
+            f"page:{page}:{size}", PAGE_ADAPTER, lambda: self.repository.list_page(page, size)
+        )
+
+    async def list_after(
+        self, cursor: str | None = None, size: int = 10, query: str | None = None
+    ) -> tuple[list[PromptInDB], str | None]:
+        # 검색어 조합은 재사용 가능성이 낮아 캐시하지 않는다
+        if query:
+            return await self.repository.list_after(cursor, size, query)
+        return await self._read_through(
+            f"after:{cursor or ''}:{size}", CURSOR_PAGE_ADAPTER, lambda: self.repository.list_after(cursor, size)
+        )
+
+    def iterate(self, batch_size: int = 500) -> AsyncIterator[PromptInDB]:
+        # 내보내기는 한 번만 읽는 데이터이므로 캐시를 거치지 않는다
+        return self.repository.iterate(batch_size)
+
+    # -------------------- 쓰기 (무효화) --------------------
+    async def create(self, prompt: PromptCreate) -> PromptInDB:
+        created = await self.repository.create(prompt)
+        await self.invalidate()
+        return created
+
+    async def update(self, prompt_id: str, fields: dict[str, Any]) -> PromptInDB | None:
+        updated = await self.repository.update(prompt_id, fields)
+        if updated is not None:
+            await self.invalidate()
+        return updated
+
+    async def delete(self, prompt_id: str) -> PromptInDB | None:
+        deleted = await self.repository.delete(prompt_id)
+        if deleted is not None:
+            await self.invalidate()
+        return deleted
+
+    async def bulk_upsert(self, items: list[PromptBulkItem]) -> dict[str, bool]:
+        try:
+            return await self.repository.bulk_upsert(items)
+        finally:
+            # 일부만 반영되었을 수도 있으므로 실패해도 무효화한다
+            await self.invalidate()
+
+    async def invalidate(self) -> None:
+        """캐시 버전을 올려 기존 항목을 모두 무효화"""
+        try:
+            await self.client.incr(self._version_key)
+        except redis.RedisError:
+            self.stats.errors += 1
+            logger.warning("프롬프트 캐시 무효화 실패 (Redis)", exc_info=True)
+
+    # -------------------- 내부 구현 --------------------
+    @property
+    def _version_key(self) -> str:
+        return f"{self.key_prefix}version"
+
+    async def _read_through(self, name: str, adapter: TypeAdapter[T], loader: Callable[[], Awaitable[T]]) -> T:
+        try:
+            version = await self.client.get(self._version_key) or "0"
+            key = f"{self.key_prefix}v{version}:{name}"
+            cached = await self.client.get(key)
+        except redis.RedisError:
+            self.stats.errors += 1
+            logger.warning("프롬프트 캐시 조회 실패 (Redis)", exc_info=True)
+            return await loader()
+
+        if cached is not None:
+            self.stats.hits += 1
+            return adapter.validate_json(cached)
+
+        self.stats.misses += 1
+        task = self._loading.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(key, adapter, loader))
+            self._loading[key] = task
+            task.add_done_callback(lambda _: self._loading.pop(key, None))
+        else:
+            self.stats.coalesced += 1
+        # 먼저 요청한 쪽이 취소되어도 다른 대기자를 위해 로드는 계속한다
+        return await asyncio.shield(task)
+
+    async def _load(self, key: str, adapter: TypeAdapter[T], loader: Callable[[], Awaitable[T]]) -> T:
+        lock_key = f"{self.key_prefix}lock:{key}"
+        token = await self._lock(lock_key)
+        if token is None:
+            self.stats.lock_waits += 1
+            cached = await self._wait_for(key)
+            if cached is not None:
+                return adapter.validate_json(cached)
+
+        try:
+            value = await loader()
+            await self._store(key, adapter.dump_json(value))
+            return value
+        finally:
+            if token is not None:
+                await self._unlock(lock_key, token)
+
+    async def _store(self, key: str, payload: bytes) -> None:
+        try:
+            await self.client.set(key, payload, ex=self.ttl_seconds)
+        except redis.RedisError:
+            self.stats.errors += 1
+            logger.warning("프롬프트 캐시 저장 실패 (Redis)", exc_info=True)
+
+    async def _lock(self, lock_key: str) -> str | None:
+        """SET NX 로 잠금을 잡고 토큰 반환 (다른 프로세스가 가지고 있으면 None, Redis 장애 시에는 잠금 없이 진행)"""
+        token = secrets.token_hex(16)
+        try:
+            locked = await self.client.set(lock_key, token, nx=True, px=int(self.lock_seconds * 1000))
+        except redis.RedisError:
+            self.stats.errors += 1
+            return token
+        return token if locked else None
+
+    async def _unlock(self, lock_key: str, token: str) -> None:
+        try:
+            await self.client.eval(UNLOCK_SCRIPT, 1, lock_key, token)
+        except redis.RedisError:
+            self.stats.errors += 1
+
+    async def _wait_for(self, key: str) -> str | None:
+        """잠금을 가진 프로세스가 캐시를 채울 때까지 대기 (잠금 만료 시간까지)"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.lock_seconds
+        while loop.time() < deadline:
+            await asyncio.sleep(self.lock_poll_seconds)
+            try:
+                cached = await self.client.get(key)
+            except redis.RedisError:
+                self.stats.errors += 1
+                return None
+            if cached is not None:
+                return cached
+        return None
@@ -0,0 +1,209 @@
+import asyncio
+from abc import ABC, abstractmethod
+from collections.abc import Collection
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReturnDocument
+
+# 더 이상 진행되지 않는 워크플로우 상태
+TERMINAL_STATUSES = frozenset({"completed", "failed", "stopped"})
+# 실행 프로세스가 임대(lease)를 잡고 진행하는 상태
+ACTIVE_STATUSES = ("pending", "running")
+
+
+def _expires_at(ttl_seconds: int) -> datetime:
+    # TTL 인덱스는 UTC 기준으로 만료를 판단한다
+    return datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds)
+
+
+class WorkflowRunRepository(ABC):
+    """워크플로우 실행 기록 저장소
+
+    실행 문서는 workflow_id 를 키로 하며 마지막 갱신 후 ttl_seconds 가 지나면 만료된다.
+    실행하는 프로세스는 owner 와 임대 만료 시각(lease_expires_at)을 기록하고, 실행하는 동안 lease_seconds 보다
+    짧은 간격으로 임대를 갱신한다. 다른 프로세스는 임대가 만료된 실행만 가져가(claim) 이어서 실행할 수 있다.
+    """
+
+    def __init__(self, ttl_seconds: int = 1800, lease_seconds: float = 30.0):
+        self.ttl_seconds = ttl_seconds
+        self.lease_seconds = lease_seconds
+
+    def lease_expiry(self) -> datetime:
+        return datetime.now() + timedelta(seconds=self.lease_seconds)
+
+    async def ensure_indexes(self) -> None:
+        """인덱스 생성 (애플리케이션 시작 시 1회)"""
+
+    @abstractmethod
+    async def create(self, workflow_id: str, run: dict[str, Any]) -> dict[str, Any]: ...
+
+    @abstractmethod
+    async def update(
+        self,
+        workflow_id: str,
+        fields: dict[str, Any],
+        statuses: Collection[str] | None = None,
+        owner: str | None = None,
+    ) -> dict[str, Any] | None:
+        """실행 문서 갱신. statuses/owner 가 주어지면 현재 상태와 소유자가 일치할 때만 원자적으로 갱신 (아니면 None)"""
+
+    @abstractmethod
+    async def get(self, workflow_id: str) -> dict[str, Any] | None: ...
+
+    @abstractmethod
+    async def claim(self, workflow_id: str, owner: str) -> dict[str, Any] | None:
+        """임대가 없거나 만료된 pending/running 실행을 owner 소유로 원자적으로 가져온다 (실행할 프로세스 1개만 성공)"""
+
+    async def renew_lease(self, workflow_id: str, owner: str) -> bool:
+        """owner 가 실행 중인 실행의 임대 연장. 소유권을 잃었거나 종료된 실행이면 False"""
+        fields = {"lease_expires_at": self.lease_expiry()}
+        return await self.update(workflow_id, fields, statuses=ACTIVE_STATUSES, owner=owner) is not None
+
+    @abstractmethod
+    async def list_runs(
+        self, page: int = 1, size: int = 20, status: str | None = None
+    ) -> tuple[list[dict[str, Any]], int]:
+        """최근 갱신 순 페이지 조회. (실행 목록, 전체 개수) 반환"""
+
+
+class MongoWorkflowRunRepository(WorkflowRunRepository):
+    """MongoDB(Motor) 기반 저장소
+
+    - _id = workflow_id 이므로 단건 조회는 기본 인덱스를 사용한다.
+    - expires_at TTL 인덱스가 만료 문서를 정리하므로 정리용 백그라운드 태스크가 필요 없다.
+    """
+
+    def __init__(self, collection: AsyncIOMotorCollection, ttl_seconds: int = 1800, lease_seconds: float = 30.0):
+        super().__init__(ttl_seconds, lease_seconds)
+        self.collection = collection
+
+    async def ensure_indexes(self) -> None:
+        await self.collection.create_indexes(
+            [
+                IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="expires_at_ttl"),
+                IndexModel([("status", ASCENDING), ("last_updated", DESCENDING)], name="status_last_updated"),
+                IndexModel([("last_updated", DESCENDING)], name="last_updated"),
+            ]
+        )
+
+    async def create(self, workflow_id: str, run: dict[str, Any]) -> dict[str, Any]:
+        document = {**run, "_id": workflow_id, "expires_at": _expires_at(self.ttl_seconds)}
+        await self.collection.insert_one(document)
+        return self._to_run(document)
+
+    async def update(
+        self,
+        workflow_id: str,
+        fields: dict[str, Any],
+        statuses: Collection[str] | None = None,
+        owner: str | None = None,
+    ) -> dict[str, Any] | None:
+        query: dict[str, Any] = {"_id": workflow_id}
+        if statuses is not None:
+            query["status"] = {"$in": list(statuses)}
+        if owner is not None:
+            query["owner"] = owner
+        document = await self.collection.find_one_and_update(
+            query,
+            {"$set": {**fields, "expires_at": _expires_at(self.ttl_seconds)}},
+            return_document=ReturnDocument.AFTER,
+        )
+        return self._to_run(document) if document else None
+
+    async def get(self, workflow_id: str) -> dict[str, Any] | None:
+        document = await self.collection.find_one({"_id": workflow_id})
+        return self._to_run(document) if document else None
+
+    async def claim(self, workflow_id: str, owner: str) -> dict[str, Any] | None:
+        # lease_expires_at: None 은 필드가 없는 문서(아직 아무도 실행하지 않은 실행)도 포함한다
+        document = await self.collection.find_one_and_update(
+            {
+                "_id": workflow_id,
+                "status": {"$in": list(ACTIVE_STATUSES)},
+                "$or": [{"lease_expires_at": None}, {"lease_expires_at": {"$lt": datetime.now()}}],
+            },
+            {
+                "$set": {
+                    "owner": owner,
+                    "lease_expires_at": self.lease_expiry(),
+                    "expires_at": _expires_at(self.ttl_seconds),
+                }
+            },
+            return_document=ReturnDocument.AFTER,
+        )
+        return self._to_run(document) if document else None
+
+    async def list_runs(
+        self, page: int = 1, size: int = 20, status: str | None = None
+    ) -> tuple[list[dict[str, Any]], int]:
+        query = {"status": status} if status else {}
+        cursor = self.collection.find(query).sort("last_updated", DESCENDING).skip((page - 1) * size).limit(size)
+        documents, total = await asyncio.gather(cursor.to_list(length=size), self.collection.count_documents(query))
+        return [self._to_run(document) for document in documents], total
+
+    @staticmethod
+    def _to_run(document: dict[str, Any]) -> dict[str, Any]:
+        run = {key: value for key, value in document.items() if key not in ("_id", "expires_at")}
+        run["workflow_id"] = document["_id"]
+        return run
+
+
+class InMemoryWorkflowRunRepository(WorkflowRunRepository):
+    """프로세스 내 저장소 (테스트 및 단일 워커 개발 환경용)"""
+
+    def __init__(self, ttl_seconds: int = 1800, lease_seconds: float = 30.0):
+        super().__init__(ttl_seconds, lease_seconds)
+        self._runs: dict[str, dict[str, Any]] = {}
+
+    async def create(self, workflow_id: str, run: dict[str, Any]) -> dict[str, Any]:
+        self._runs[workflow_id] = {**run, "workflow_id": workflow_id, "expires_at": _expires_at(self.ttl_seconds)}
+        return self._to_run(self._runs[workflow_id])
+
+    async def update(
+        self,
+        workflow_id: str,
+        fields: dict[str, Any],
+        statuses: Collection[str] | None = None,
+        owner: str | None = None,
+    ) -> dict[str, Any] | None:
+        run = self._live(workflow_id)
+        if run is None or (statuses is not None and run["status"] not in statuses):
+            return None
+        if owner is not None and run.get("owner") != owner:
+            return None
+        run.update(fields, expires_at=_expires_at(self.ttl_seconds))
+        return self._to_run(run)
+
+    async def get(self, workflow_id: str) -> dict[str, Any] | None:
+        run = self._live(workflow_id)
+        return self._to_run(run) if run else None
+
+    async def claim(self, workflow_id: str, owner: str) -> dict[str, Any] | None:
+        run = self._live(workflow_id)
+        if run is None or run["status"] not in ACTIVE_STATUSES:
+            return None
+        if run.get("lease_expires_at") is not None and run["lease_expires_at"] >= datetime.now():
+            return None
+        return await self.update(workflow_id, {"owner": owner, "lease_expires_at": self.lease_expiry()})
+
+    async def list_runs(
+        self, page: int = 1, size: int = 20, status: str | None = None
+    ) -> tuple[list[dict[str, Any]], int]:
+        runs = [run for workflow_id in list(self._runs) if (run := self._live(workflow_id))]
+        if status:
+            runs = [run for run in runs if run["status"] == status]
+        runs.sort(key=lambda run: run["last_updated"], reverse=True)
+        return [self._to_run(run) for run in runs[(page - 1) * size : page * size]], len(runs)
+
+    def _live(self, workflow_id: str) -> dict[str, Any] | None:
+        run = self._runs.get(workflow_id)
+        if run and run["expires_at"] < datetime.now(timezone.utc):
+            del self._runs[workflow_id]
+            return None
+        return run
+
+    @staticmethod
+    def _to_run(run: dict[str, Any]) -> dict[str, Any]:
+        return {key: value for key, value in run.items() if key != "expires_at"}
@@ -1,43 +1,52 @@
-from datetime import datetime
-from uuid import uuid4
+import json
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 
+from api.dependencies import get_prompt_repository
+from api.repositories.prompt import PromptRepository, encode_cursor
+from api.repositories.prompt_cache import CachedPromptRepository
 from api.schemas.base import Pagination, ResponseFormatSchema
-from api.schemas.prompt import PromptCreate, PromptResponse, PromptUpdate
+from api.schemas.prompt import PromptBulkResponse, PromptCreate, PromptResponse, PromptUpdate
+from api.services import prompt_transfer
+from api.services.prompt_transfer import ExportFormat
+from config.settings import get_settings
 
 router = APIRouter(prefix="/prompts", tags=["Prompts"])
+settings = get_settings()
 
-# 임시 인메모리 DB
-SAMPLE_PROMPTS: list[PromptResponse] = [
-    PromptResponse(
-        id="1",
-        title="Sample Prompt 1",
-        content="This is a sample prompt.",
-        description="설명1",
-        created_at=datetime.now(),
-        updated_at=datetime.now(),
-    ),
-    PromptResponse(
-        id="2",
-        title="Sample Prompt 2",
-        content="Another prompt.",
-        description="설명2",
-        created_at=datetime.now(),
-        updated_at=datetime.now(),
-    ),
-]
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+BULK_REQUEST_BODY = {
+    "required": True,
+    "content": {
+        "application/json": {"schema": {"type": "object", "properties": {"items": {"type": "array"}}}},
+        NDJSON_MEDIA_TYPE: {"schema": {"type": "string", "description": "한 줄에 PromptBulkItem JSON 하나"}},
+    },
+}
 
 
 @router.get("/", response_model=ResponseFormatSchema[list[PromptResponse]])
-async def get_prompts(page: int = 1, size: int = 10):
+async def get_prompts(
+    page: int = Query(1, ge=1, description="페이지 번호 (cursor 가 없을 때 사용)"),
+    size: int = Query(10, ge=1, le=100, description="페이지 크기"),
+    cursor: str | None = Query(None, description="이전 응답의 next_cursor (페이지 깊이와 무관하게 일정한 속도)"),
+    repository: PromptRepository = Depends(get_prompt_repository),
+):
     """
     Get a list of prompts.
     """
-    total = len(SAMPLE_PROMPTS)
-    has_next = (page * size) < total
-    pagination = Pagination(page=page, size=size, total=total, has_next=has_next)
-    data = SAMPLE_PROMPTS[(page - 1) * size : page * size]
+    if cursor is not None:
+        try:
+            data, next_cursor = await repository.list_after(cursor, size)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        pagination = Pagination(size=size, has_next=next_cursor is not None, next_cursor=next_cursor)
+    else:
+        data, total = await repository.list_page(page, size)
+        has_next = (page * size) < total
+        next_cursor = encode_cursor(data[-1]) if has_next and data else None
+        pagination = Pagination(page=page, size=size, total=total, has_next=has_next, next_cursor=next_cursor)
+
     return ResponseFormatSchema[list[PromptResponse]](
         status=200,
         message="프롬프트 목록 조회 성공",
@@ -46,29 +55,100 @@ async def get_prompts(page: int = 1, size: int = 10):
     )
 
 
+@router.get("/search", response_model=ResponseFormatSchema[list[PromptResponse]])
+async def search_prompts(
+    q: str = Query(..., min_length=1, max_length=200, description="제목/내용/설명에서 찾을 문자열"),
+    size: int = Query(10, ge=1, le=100, description="페이지 크기"),
+    cursor: str | None = Query(None, description="이전 응답의 next_cursor"),
+    repository: PromptRepository = Depends(get_prompt_repository),
+):
+    """
+    Search prompts by title, content and description (trigram index, newest first).
+    """
+    try:
+        data, next_cursor = await repository.list_after(cursor, size, query=q)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return ResponseFormatSchema[list[PromptResponse]](
+        status=200,
+        message="프롬프트 검색 성공",
+        pagination=Pagination(size=size, has_next=next_cursor is not None, next_cursor=next_cursor),
+        data=data,
+    )
+
+
+@router.get("/cache/stats")
+async def get_prompt_cache_stats(repository: PromptRepository = Depends(get_prompt_repository)):
+    """
+    Prompt read cache hit rate.
+    """
+    if not isinstance(repository, CachedPromptRepository):
+        return {"enabled": False}
+    return {"enabled": True, "backend": "redis", **repository.stats.as_dict()}
+
+
+@router.get("/export")
+async def export_prompts(
+    export_format: ExportFormat = Query("ndjson", alias="format", description="ndjson | csv"),
+    repository: PromptRepository = Depends(get_prompt_repository),
+):
+    """
+    Stream every prompt as NDJSON or CSV (newest first, bounded memory).
+    """
+    media_type = NDJSON_MEDIA_TYPE if export_format == "ndjson" else "text/csv; charset=utf-8"
+    return StreamingResponse(
+        prompt_transfer.export_prompts(repository, export_format, settings.PROMPT_BULK_BATCH_SIZE),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="prompts.{export_format}"'},
+    )
+
+
+@router.post(
+    "/bulk", response_model=ResponseFormatSchema[PromptBulkResponse], openapi_extra={"requestBody": BULK_REQUEST_BODY}
+)
+async def bulk_upsert_prompts(request: Request, repository: PromptRepository = Depends(get_prompt_repository)):
+    """
+    Create or update many prompts at once.
+
+    Body is either `{"items": [PromptBulkItem, ...]}` (application/json) or one PromptBulkItem per line
+    (application/x-ndjson, streamed). Items with an existing id are updated.
+    """
+    if request.headers.get("content-type", "").startswith(NDJSON_MEDIA_TYPE):
+        records = prompt_transfer.read_ndjson_lines(request.stream())
+    else:
+        try:
+            payload = await request.json()
+        except json.JSONDecodeError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="잘못된 JSON 본문입니다")
+        items = payload.get("items") if isinstance(payload, dict) else None
+        if not isinstance(items, list):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="items 배열이 필요합니다")
+        records = prompt_transfer.iterate_items(items)
+
+    result = await prompt_transfer.import_prompts(repository, records, settings.PROMPT_BULK_BATCH_SIZE)
+    return ResponseFormatSchema[PromptBulkResponse](
+        status=200,
+        message="프롬프트 일괄 등록 완료",
+        data=result,
+    )
+
+
 @router.get("/{prompt_id}", response_model=ResponseFormatSchema[PromptResponse])
-async def get_prompt(prompt_id: str):
-    for prompt in SAMPLE_PROMPTS:
-        if prompt.id == prompt_id:
-            return ResponseFormatSchema[PromptResponse](
-                status=200,
-                message="프롬프트 조회 성공",
-                data=prompt,
-            )
-    raise HTTPException(status_code=404, detail="Prompt not found")
+async def get_prompt(prompt_id: str, repository: PromptRepository = Depends(get_prompt_repository)):
+    prompt = await repository.get(prompt_id)
+    if prompt is None:
+        raise HTTPException(status_code=404, detail="Prompt not found")
+    return ResponseFormatSchema[PromptResponse](
+        status=200,
+        message="프롬프트 조회 성공",
+        data=prompt,
+    )
 
 
 @router.post("/", response_model=ResponseFormatSchema[PromptResponse], status_code=status.HTTP_201_CREATED)
-async def create_prompt(prompt: PromptCreate):
-    new_prompt = PromptResponse(
-        id=str(uuid4()),
-        title=prompt.title,
-        content=prompt.content,
-        description=prompt.description,
-        created_at=datetime.now(),
-        updated_at=datetime.now(),
-    )
-    SAMPLE_PROMPTS.append(new_prompt)
+async def create_prompt(prompt: PromptCreate, repository: PromptRepository = Depends(get_prompt_repository)):
+    new_prompt = await repository.create(prompt)
     return ResponseFormatSchema[PromptResponse](
         status=201,
         message="프롬프트 생성 성공",
@@ -77,32 +157,26 @@ async def create_prompt(prompt: PromptCreate):
 
 
 @router.put("/{prompt_id}", response_model=ResponseFormatSchema[PromptResponse])
-async def update_prompt(prompt_id: str, prompt_update: PromptUpdate):
-    for idx, prompt in enumerate(SAMPLE_PROMPTS):
-        if prompt.id == prompt_id:
-            updated = prompt.copy(
-                update={
-                    **prompt_update.dict(exclude_unset=True),
-                    "updated_at": datetime.now(),
-                }
-            )
-            SAMPLE_PROMPTS[idx] = updated
-            return ResponseFormatSchema[PromptResponse](
-                status=200,
-                message="프롬프트 수정 성공",
-                data=updated,
-            )
-    raise HTTPException(status_code=404, detail="Prompt not found")
+async def update_prompt(
+    prompt_id: str, prompt_update: PromptUpdate, repository: PromptRepository = Depends(get_prompt_repository)
+):
+    updated = await repository.update(prompt_id, prompt_update.model_dump(exclude_unset=True))
+    if updated is None:
+        raise HTTPException(status_code=404, detail="Prompt not found")
+    return ResponseFormatSchema[PromptResponse](
+        status=200,
+        message="프롬프트 수정 성공",
+        data=updated,
+    )
 
 
 @router.delete("/{prompt_id}", response_model=ResponseFormatSchema[PromptResponse])
-async def delete_prompt(prompt_id: str):
-    for idx, prompt in enumerate(SAMPLE_PROMPTS):
-        if prompt.id == prompt_id:
-            deleted = SAMPLE_PROMPTS.pop(idx)
-            return ResponseFormatSchema[PromptResponse](
-                status=200,
-                message="프롬프트 삭제 성공",
-                data=deleted,
-            )
-    raise HTTPException(status_code=404, detail="Prompt not found")
+async def delete_prompt(prompt_id: str, repository: PromptRepository = Depends(get_prompt_repository)):
+    deleted = await repository.delete(prompt_id)
+    if deleted is None:
+        raise HTTPException(status_code=404, detail="Prompt not found")
+    return ResponseFormatSchema[PromptResponse](
+        status=200,
+        message="프롬프트 삭제 성공",
+        data=deleted,
+    )
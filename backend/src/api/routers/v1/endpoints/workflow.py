@@ -1,23 +1,80 @@
-import asyncio
-import json
+import math
+from collections.abc import AsyncGenerator
 from datetime import datetime
 from typing import Any
 from uuid import uuid4
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
+from api.dependencies import (
+    get_admission_controller,
+    get_cancellation_broker,
+    get_event_log,
+    get_job_queue,
+    get_workflow_run_repository,
+)
+from api.repositories.workflow_run import TERMINAL_STATUSES, WorkflowRunRepository
+
 # 기존 워크플로우 서비스 임포트
-from api.services.workflow import run_discussion
+from api.services import workflow as workflow_service
+from api.services.admission import AdmissionController, AdmissionRejected
+from api.services.batch import encode_ndjson, run_batch
+from api.services.cancellation import CancellationBroker
+from api.services.event_log import EventLog
+from api.services.job_queue import JobQueue
+from api.services.sse_encoder import compress_events, negotiate_encoding
+from api.services.workflow import JudgeRationale, RunUsage, WorkflowTopology
+from api.services.workflow_runner import (
+    estimate_savings,
+    new_run_owner,
+    running_workflows,
+    start_admitted_workflow_run,
+    start_workflow_run,
+    stream_logged_events,
+    wait_for_stopped,
+)
+from config.settings import get_settings
 
 router = APIRouter(prefix="/workflows", tags=["Workflows"])
+settings = get_settings()
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "Content-Type": "text/event-stream",
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Headers": "Cache-Control",
+}
 
 
 # -------------------- 1. 요청/응답 모델 정의 --------------------
 class WorkflowRequest(BaseModel):
     task: str = Field(..., description="토론할 과제", min_length=1, max_length=500)
     max_rounds: int = Field(2, description="최대 라운드 수", ge=1, le=5)
+    stream_tokens: bool = Field(False, description="에이전트 출력을 토큰 단위(agent_delta)로 스트리밍")
+    topology: WorkflowTopology = Field("linear", description="linear: 순차 실행, parallel: 리서치 관점별 병렬 실행")
+    use_cache: bool = Field(True, description="동일 프롬프트의 LLM 응답 캐시 사용 여부")
+    cancel_on_disconnect: bool = Field(True, description="SSE 연결이 모두 끊기면 실행 중단 (유예 시간 후)")
+    speculate: bool | None = Field(
+        None, description="판사가 결정하는 동안 다음 노드를 미리 실행 (기본: WORKFLOW_SPECULATION_ENABLED)"
+    )
+    judge_rationale: JudgeRationale | None = Field(
+        None, description="structured 판사의 결정 이유 생성 여부 (기본: JUDGE_RATIONALE, 일괄 실행은 항상 skip)"
+    )
+
+
+class BatchWorkflowRequest(BaseModel):
+    items: list[WorkflowRequest] = Field(
+        ...,
+        description="토론할 과제 목록 (동일한 과제는 한 번만 실행)",
+        min_length=1,
+        max_length=settings.WORKFLOW_BATCH_MAX_ITEMS,
+    )
+    concurrency: int | None = Field(
+        None, description="동시에 실행할 토론 수 (기본: WORKFLOW_BATCH_CONCURRENCY)", ge=1, le=64
+    )
 
 
 class WorkflowResponse(BaseModel):
@@ -36,195 +93,179 @@ class WorkflowStatusResponse(BaseModel):
 
 
 # -------------------- 2. 워크플로우 상태 관리 --------------------
-# 실행 중인 워크플로우 상태를 추적하는 딕셔너리
-active_workflows: dict[str, dict[str, Any]] = {}
-
-
-# -------------------- 3. SSE 이벤트 포맷터 --------------------
-def format_sse_event(event_type: str, data: dict[str, Any]) -> str:
-    """SSE 이벤트 포맷팅"""
-    return f"event: {event_type}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
-
-
-def format_agent_message(agent: str, message_type: str, content: str, workflow_id: str) -> str:
-    """에이전트 메시지를 SSE 형태로 포맷팅"""
-    event_data = {
-        "workflow_id": workflow_id,
-        "agent": agent,
-        "type": message_type,
-        "content": content,
-        "timestamp": datetime.now().isoformat(),
-    }
-    return format_sse_event("agent_message", event_data)
-
-
-def format_status_update(workflow_id: str, status: str, current_round: int, max_rounds: int) -> str:
-    """상태 업데이트를 SSE 형태로 포맷팅"""
-    event_data = {
-        "workflow_id": workflow_id,
+# 실행 상태는 WorkflowRunRepository(MongoDB)에 저장되어 모든 워커/레플리카가 공유한다.
+def new_workflow_run(request: WorkflowRequest, status: str, queued: bool = False) -> dict[str, Any]:
+    """저장소에 기록할 실행 문서 생성 (queued: 워커 큐에서 실행되는 작업 여부)"""
+    now = datetime.now()
+    return {
+        "queued": queued,
+        "task": request.task,
+        "max_rounds": request.max_rounds,
+        "stream_tokens": request.stream_tokens,
+        "topology": request.topology,
+        "use_cache": request.use_cache,
+        "cancel_on_disconnect": request.cancel_on_disconnect,
+        "speculate": request.speculate,
+        "judge_rationale": request.judge_rationale,
         "status": status,
-        "current_round": current_round,
-        "max_rounds": max_rounds,
-        "timestamp": datetime.now().isoformat(),
+        "current_round": 1,
+        "created_at": now,
+        "last_updated": now,
     }
-    return format_sse_event("status_update", event_data)
-
-
-# -------------------- 4. 워크플로우 실행 래퍼 --------------------
-async def run_workflow_with_sse(workflow_id: str, task: str, max_rounds: int):
-    """워크플로우를 실행하고 SSE 이벤트 생성"""
-    try:
-        # 워크플로우 상태 초기화
-        active_workflows[workflow_id] = {
-            "status": "running",
-            "current_round": 1,
-            "max_rounds": max_rounds,
-            "task": task,
-            "started_at": datetime.now(),
-            "last_updated": datetime.now(),
-        }
-
-        # 시작 이벤트 전송
-        yield format_status_update(workflow_id, "started", 1, max_rounds)
-        yield format_agent_message("시스템", "info", f"워크플로우 '{workflow_id}' 시작", workflow_id)
-
-        # 워크플로우 실행
-        previous_round = 1
-        for step_result in run_discussion(task, max_rounds):
-            # 라운드 변경 감지
-            current_round = step_result.get("round_count", 1)
-            if current_round > previous_round:
-                yield format_status_update(workflow_id, "round_changed", current_round, max_rounds)
-                previous_round = current_round
-
-            # 상태 업데이트
-            active_workflows[workflow_id].update({"current_round": current_round, "last_updated": datetime.now()})
-
-            # 각 에이전트별 메시지 추출 및 전송
-            if step_result.get("plan"):
-                yield format_agent_message("기획자", "plan", step_result["plan"], workflow_id)
-
-            if step_result.get("research"):
-                yield format_agent_message("리서처", "research", step_result["research"], workflow_id)
-
-            if step_result.get("critique"):
-                yield format_agent_message("비평가", "critique", step_result["critique"], workflow_id)
-
-            if step_result.get("decision"):
-                decision = step_result["decision"]
-                if decision == "finalize":
-                    yield format_agent_message("판사", "final_decision", "프로젝트 최종 승인!", workflow_id)
-                elif decision == "revise_plan":
-                    yield format_agent_message("판사", "decision", "계획을 수정하겠습니다.", workflow_id)
-                elif decision == "more_research":
-                    yield format_agent_message("판사", "decision", "추가 조사가 필요합니다.", workflow_id)
-
-            # 약간의 딜레이로 자연스러운 흐름 연출
-            await asyncio.sleep(0.1)
-
-        # 완료 상태 업데이트
-        active_workflows[workflow_id]["status"] = "completed"
-        active_workflows[workflow_id]["completed_at"] = datetime.now()
-
-        yield format_status_update(workflow_id, "completed", current_round, max_rounds)
-        yield format_agent_message("시스템", "info", "워크플로우 완료", workflow_id)
-
-    except Exception as e:
-        # 에러 처리
-        error_message = f"워크플로우 실행 중 오류 발생: {str(e)}"
-
-        if workflow_id in active_workflows:
-            active_workflows[workflow_id]["status"] = "failed"
-            active_workflows[workflow_id]["error"] = str(e)
-            active_workflows[workflow_id]["last_updated"] = datetime.now()
 
-        yield format_status_update(workflow_id, "failed", 0, max_rounds)
-        yield format_agent_message("시스템", "error", error_message, workflow_id)
 
-    finally:
-        # 30분 후 자동 정리를 위한 타이머 설정 (실제 구현에서는 백그라운드 태스크 사용)
-        asyncio.create_task(cleanup_workflow(workflow_id, delay=1800))
+def sse_response(events: AsyncGenerator[str, None], accept_encoding: str | None) -> StreamingResponse:
+    """SSE 스트리밍 응답 생성 (SSE_COMPRESSION_ENABLED 이면 Accept-Encoding 에 맞춰 이벤트마다 압축)"""
+    encoding = negotiate_encoding(accept_encoding) if settings.SSE_COMPRESSION_ENABLED else None
+    if encoding is None:
+        return StreamingResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
+    headers = {**SSE_HEADERS, "Content-Encoding": encoding, "Vary": "Accept-Encoding"}
+    return StreamingResponse(compress_events(events, encoding), media_type="text/event-stream", headers=headers)
 
 
-async def cleanup_workflow(workflow_id: str, delay: int = 1800):
-    """워크플로우 정리 (30분 후 자동 삭제)"""
-    await asyncio.sleep(delay)
-    if workflow_id in active_workflows:
-        del active_workflows[workflow_id]
+def abandon_grace(cancel_on_disconnect: bool) -> float | None:
+    """연결 종료 시 실행 취소까지의 유예 시간 (취소하지 않으면 None)"""
+    return settings.WORKFLOW_DISCONNECT_GRACE_SECONDS if cancel_on_disconnect else None
 
 
-# -------------------- 5. API 엔드포인트 정의 --------------------
+# -------------------- 3. API 엔드포인트 정의 --------------------
 
 
 @router.post("/start", response_model=WorkflowResponse)
-async def start_workflow(request: WorkflowRequest):
-    """새로운 워크플로우 시작"""
+async def start_workflow(
+    request: WorkflowRequest,
+    repository: WorkflowRunRepository = Depends(get_workflow_run_repository),
+    queue: JobQueue = Depends(get_job_queue),
+):
+    """새로운 워크플로우 시작 (워커 큐에 등록, 진행 상황은 /stream/{workflow_id} 로 구독)"""
     try:
         workflow_id = str(uuid4())
 
-        # 워크플로우 정보 저장
-        workflow_info = {
-            "workflow_id": workflow_id,
-            "task": request.task,
-            "max_rounds": request.max_rounds,
-            "status": "pending",
-            "created_at": datetime.now(),
-        }
+        # 워크플로우 정보 저장 후 작업 큐에 등록
+        workflow_info = await repository.create(workflow_id, new_workflow_run(request, "pending", queued=True))
+        await queue.enqueue({"workflow_id": workflow_id})
 
-        return WorkflowResponse(**workflow_info)
+        return WorkflowResponse(
+            workflow_id=workflow_id,
+            task=workflow_info["task"],
+            status=workflow_info["status"],
+            created_at=workflow_info["created_at"],
+        )
 
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"워크플로우 시작 실패: {str(e)}")
 
 
 @router.post("/execute")
-async def execute_workflow(request: WorkflowRequest):
-    """워크플로우 실행 및 SSE 스트리밍 (직접 실행)"""
+async def execute_workflow(
+    request: WorkflowRequest,
+    http_request: Request,
+    accept_encoding: str | None = Header(None, description="SSE 스트림 압축 방식 (br, gzip)"),
+    x_client_id: str | None = Header(None, description="동시 실행 수를 제한할 클라이언트 식별자 (없으면 IP)"),
+    repository: WorkflowRunRepository = Depends(get_workflow_run_repository),
+    event_log: EventLog = Depends(get_event_log),
+    admission: AdmissionController = Depends(get_admission_controller),
+):
+    """워크플로우 실행 및 SSE 스트리밍 (직접 실행, 자리가 없으면 queued 이벤트로 대기 순번 전송)"""
+    # 대기열까지 가득 차면 실행 기록을 만들기 전에 바로 거절
+    client = x_client_id or (http_request.client.host if http_request.client else "unknown")
     try:
-        workflow_id = str(uuid4())
+        ticket = admission.enter(client)
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(math.ceil(e.retry_after))},
+        )
 
-        # SSE 스트리밍 응답 생성
-        return StreamingResponse(
-            run_workflow_with_sse(workflow_id, request.task, request.max_rounds),
-            media_type="text/event-stream",
-            headers={
-                "Cache-Control": "no-cache",
-                "Connection": "keep-alive",
-                "Content-Type": "text/event-stream",
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Headers": "Cache-Control",
-            },
+    try:
+        workflow_id = str(uuid4())
+        await repository.create(workflow_id, new_workflow_run(request, "pending"))
+
+        # 실행은 한 번만 하고 이벤트 기록에 남긴다. 응답은 그 기록을 구독하므로
+        # 재접속(/stream/{workflow_id})이나 추가 시청자가 같은 실행 결과를 공유한다.
+        start_admitted_workflow_run(ticket, event_log, repository, workflow_id, request.max_rounds)
+
+        # SSE 스트리밍 응답 생성 (연결이 끊기고 다른 시청자도 없으면 유예 시간 후 실행 취소)
+        return sse_response(
+            stream_logged_events(
+                event_log,
+                workflow_id,
+                cancel_when_abandoned=abandon_grace(request.cancel_on_disconnect),
+                repository=repository,
+            ),
+            accept_encoding,
         )
 
     except Exception as e:
+        ticket.release()
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"워크플로우 실행 실패: {str(e)}")
 
 
+@router.post("/batch")
+async def batch_workflows(
+    request: BatchWorkflowRequest,
+    http_request: Request,
+    x_client_id: str | None = Header(None, description="동시 실행 수를 제한할 클라이언트 식별자 (없으면 IP)"),
+    repository: WorkflowRunRepository = Depends(get_workflow_run_repository),
+    admission: AdmissionController = Depends(get_admission_controller),
+):
+    """여러 과제를 한 번에 실행하고 끝나는 순서대로 과제별 결과를 NDJSON 으로 스트리밍 (마지막 줄은 처리량 요약)
+
+    토론마다 /execute 와 같은 입장 제어를 거치고 실행 기록을 남긴다 (/list 에 보이고 /stop 으로 과제별 중단).
+    """
+    client = x_client_id or (http_request.client.host if http_request.client else "unknown")
+    try:
+        items = [item.model_dump(include={"task", "max_rounds", "topology", "use_cache"}) for item in request.items]
+        records = run_batch(
+            f"batch-{uuid4()}",
+            items,
+            request.concurrency or settings.WORKFLOW_BATCH_CONCURRENCY,
+            repository=repository,
+            admission=admission,
+            client=client,
+        )
+        return StreamingResponse(encode_ndjson(records), media_type="application/x-ndjson")
+
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"일괄 실행 실패: {str(e)}")
+
+
 @router.get("/stream/{workflow_id}")
-async def stream_workflow(workflow_id: str):
-    """기존 워크플로우 스트리밍 (저장된 워크플로우용)"""
+async def stream_workflow(
+    workflow_id: str,
+    last_event_id: str | None = Header(None, description="마지막으로 받은 이벤트 id (이후 이벤트부터 재전송)"),
+    accept_encoding: str | None = Header(None, description="SSE 스트림 압축 방식 (br, gzip)"),
+    repository: WorkflowRunRepository = Depends(get_workflow_run_repository),
+    event_log: EventLog = Depends(get_event_log),
+):
+    """기존 워크플로우 스트리밍 (놓친 이벤트 재전송 후 실시간 이벤트 이어받기, 멈춘 실행은 이어서 실행)"""
     try:
         # 워크플로우 ID 유효성 검사
-        if workflow_id not in active_workflows:
+        workflow_info = await repository.get(workflow_id)
+        if workflow_info is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="워크플로우를 찾을 수 없습니다")
 
-        workflow_info = active_workflows[workflow_id]
+        # 종료된 실행의 이벤트 기록이 만료된 경우
+        if workflow_info["status"] in TERMINAL_STATUSES and not await event_log.exists(workflow_id):
+            raise HTTPException(status_code=status.HTTP_410_GONE, detail="워크플로우 이벤트 기록이 만료되었습니다")
 
-        # 이미 실행 중인지 확인
-        if workflow_info["status"] == "running":
-            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="워크플로우가 이미 실행 중입니다")
+        # 실행하던 프로세스가 종료되어 임대가 만료된 실행은 이 프로세스에서 마지막 체크포인트부터 이어서 실행
+        if workflow_info["status"] == "running" and workflow_id not in running_workflows:
+            owner = new_run_owner()
+            if await repository.claim(workflow_id, owner) is not None:
+                start_workflow_run(event_log, repository, workflow_id, owner)
 
         # SSE 스트리밍 응답 생성
-        return StreamingResponse(
-            run_workflow_with_sse(workflow_id, workflow_info["task"], workflow_info["max_rounds"]),
-            media_type="text/event-stream",
-            headers={
-                "Cache-Control": "no-cache",
-                "Connection": "keep-alive",
-                "Content-Type": "text/event-stream",
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Headers": "Cache-Control",
-            },
+        return sse_response(
+            stream_logged_events(
+                event_log,
+                workflow_id,
+                last_event_id,
+                cancel_when_abandoned=abandon_grace(workflow_info.get("cancel_on_disconnect", False)),
+                repository=repository,
+            ),
+            accept_encoding,
         )
 
     except HTTPException:
@@ -236,14 +277,15 @@ async def stream_workflow(workflow_id: str):
 
 
 @router.get("/status/{workflow_id}", response_model=WorkflowStatusResponse)
-async def get_workflow_status(workflow_id: str):
+async def get_workflow_status(
+    workflow_id: str, repository: WorkflowRunRepository = Depends(get_workflow_run_repository)
+):
     """워크플로우 상태 조회"""
     try:
-        if workflow_id not in active_workflows:
+        workflow_info = await repository.get(workflow_id)
+        if workflow_info is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="워크플로우를 찾을 수 없습니다")
 
-        workflow_info = active_workflows[workflow_id]
-
         return WorkflowStatusResponse(
             workflow_id=workflow_id,
             status=workflow_info["status"],
@@ -259,17 +301,40 @@ async def get_workflow_status(workflow_id: str):
 
 
 @router.delete("/stop/{workflow_id}")
-async def stop_workflow(workflow_id: str):
-    """워크플로우 중단"""
+async def stop_workflow(
+    workflow_id: str,
+    repository: WorkflowRunRepository = Depends(get_workflow_run_repository),
+    cancellation: CancellationBroker = Depends(get_cancellation_broker),
+):
+    """워크플로우 중단 (진행 중인 LLM 요청과 이후 노드 실행을 취소하고 절감량 반환)"""
     try:
-        if workflow_id not in active_workflows:
+        workflow_info = await repository.get(workflow_id)
+        if workflow_info is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="워크플로우를 찾을 수 없습니다")
-
-        # 워크플로우 중단 처리
-        active_workflows[workflow_id]["status"] = "stopped"
-        active_workflows[workflow_id]["stopped_at"] = datetime.now()
-
-        return {"message": f"워크플로우 '{workflow_id}' 중단됨"}
+        if workflow_info["status"] in TERMINAL_STATUSES:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="이미 종료된 워크플로우입니다")
+
+        # 워크플로우 중단 처리 (실행 전이면 모든 LLM 호출이 절감된다)
+        now = datetime.now()
+        fields = {"status": "stopped", "stopped_at": now, "last_updated": now}
+        if workflow_info["status"] == "pending":
+            fields["usage"] = RunUsage().as_dict()
+            fields["savings"] = estimate_savings(
+                RunUsage(), workflow_info["topology"], workflow_info["max_rounds"], workflow_info.get("judge_rationale")
+            )
+        # 조회 후 그 사이에 완료/실패한 실행은 덮어쓰지 않는다
+        if await repository.update(workflow_id, fields, statuses=("pending", "running")) is None:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="이미 종료된 워크플로우입니다")
+
+        # 실행 중인 프로세스(API 또는 워커)에 취소 전달 후 중단이 기록될 때까지 대기
+        await cancellation.request_cancel(workflow_id)
+        workflow_info = await wait_for_stopped(repository, workflow_id, settings.WORKFLOW_STOP_WAIT_SECONDS)
+
+        return {
+            "message": f"워크플로우 '{workflow_id}' 중단됨",
+            "usage": workflow_info.get("usage") if workflow_info else None,
+            "savings": workflow_info.get("savings") if workflow_info else None,
+        }
 
     except HTTPException:
         raise
@@ -278,26 +343,40 @@ async def stop_workflow(workflow_id: str):
 
 
 @router.get("/list")
-async def list_workflows():
+async def list_workflows(
+    page: int = Query(1, ge=1, description="페이지 번호"),
+    size: int = Query(20, ge=1, le=100, description="페이지 크기"),
+    status_filter: str | None = Query(None, alias="status", description="상태 필터"),
+    repository: WorkflowRunRepository = Depends(get_workflow_run_repository),
+):
     """활성 워크플로우 목록 조회"""
     try:
-        workflows = []
-        for workflow_id, info in active_workflows.items():
-            workflows.append(
-                {
-                    "workflow_id": workflow_id,
-                    "task": info.get("task", ""),
-                    "status": info["status"],
-                    "current_round": info["current_round"],
-                    "max_rounds": info["max_rounds"],
-                    "started_at": info.get("started_at"),
-                    "last_updated": info["last_updated"],
-                }
-            )
-
-        return {"workflows": workflows, "total": len(workflows)}
+        runs, total = await repository.list_runs(page, size, status_filter)
+        workflows = [
+            {
+                "workflow_id": info["workflow_id"],
+                "task": info.get("task", ""),
+                "status": info["status"],
+                "current_round": info["current_round"],
+                "max_rounds": info["max_rounds"],
+                "started_at": info.get("started_at"),
+                "last_updated": info["last_updated"],
+            }
+            for info in runs
+        ]
+
+        return {"workflows": workflows, "total": total, "page": page, "size": size, "has_next": page * size < total}
 
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"워크플로우 목록 조회 실패: {str(e)}"
         )
+
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """LLM 응답 캐시 적중률 조회"""
+    cache = workflow_service.response_cache
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, "backend": type(cache).__name__, **cache.stats.as_dict()}
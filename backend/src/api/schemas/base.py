@@ -8,10 +8,11 @@ T = TypeVar("T")
 
 
 class Pagination(BaseModel):
-    page: int = Field(..., description="페이지 번호")
+    page: int | None = Field(None, description="페이지 번호 (커서 기반 조회에서는 생략)")
     size: int = Field(..., description="페이지 크기")
-    total: int = Field(..., description="총 데이터 수")
+    total: int | None = Field(None, description="총 데이터 수 (커서 기반 조회에서는 생략)")
     has_next: bool = Field(..., description="다음 페이지 존재 여부")
+    next_cursor: str | None = Field(None, description="다음 페이지 조회용 커서 (cursor 파라미터로 전달)")
 
 
 class ResponseFormatSchema(BaseModel, Generic[T]):
@@ -1,6 +1,7 @@
 from datetime import datetime
+from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class PromptBase(BaseModel):
@@ -20,6 +21,8 @@ class PromptUpdate(BaseModel):
 
 
 class PromptInDB(PromptBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: str = Field(..., description="Prompt ID")
     created_at: datetime = Field(..., description="Created timestamp")
     updated_at: datetime = Field(..., description="Updated timestamp")
@@ -32,3 +35,21 @@ class PromptResponse(PromptInDB):
 class PromptListResponse(BaseModel):
     prompts: list[PromptResponse]
     total: int
+
+
+class PromptBulkItem(PromptCreate):
+    id: str | None = Field(None, description="Prompt ID (존재하면 갱신, 없으면 이 ID로 생성)", max_length=36)
+
+
+class PromptBulkResult(BaseModel):
+    index: int = Field(..., description="요청 내 항목 순서 (0부터)")
+    id: str | None = Field(None, description="Prompt ID")
+    status: Literal["created", "updated", "failed"] = Field(..., description="처리 결과")
+    error: str | None = Field(None, description="실패 사유")
+
+
+class PromptBulkResponse(BaseModel):
+    created: int = Field(0, description="생성된 프롬프트 수")
+    updated: int = Field(0, description="갱신된 프롬프트 수")
+    failed: int = Field(0, description="실패한 항목 수")
+    results: list[PromptBulkResult] = Field(default_factory=list, description="항목별 처리 결과")
@@ -0,0 +1,144 @@
+import asyncio
+from collections import Counter, deque
+
+from api.services.telemetry import ADMISSION_QUEUED, ADMISSION_REJECTED
+from config.settings import Settings
+
+
+class AdmissionRejected(Exception):
+    """대기열이 가득 차 실행 요청을 받을 수 없음 (retry_after 초 후 재시도 권장)"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"대기열이 가득 찼습니다 ({retry_after:.0f}초 후 다시 시도)")
+        self.retry_after = retry_after
+
+
+class AdmissionTicket:
+    """실행 요청 1건의 입장권 (입장 전에는 대기열 순번을 가진다)"""
+
+    def __init__(self, controller: "AdmissionController", client: str):
+        self.client = client
+        self.admitted = False
+        self._controller = controller
+        self._changed = asyncio.Event()
+        self._released = False
+
+    @property
+    def position(self) -> int:
+        """대기열 순번 (1부터, 입장했으면 0)"""
+        return 0 if self.admitted else self._controller.position(self)
+
+    async def wait_for_change(self) -> None:
+        """입장하거나 순번이 바뀔 때까지 대기"""
+        await self._changed.wait()
+        self._changed.clear()
+
+    def release(self) -> None:
+        """실행 종료 (대기 중이면 대기열에서 빠진다)"""
+        self._controller.release(self)
+
+
+class AdmissionController:
+    """동시에 실행되는 토론 수를 전역/클라이언트별로 제한하는 입장 제어
+
+    - 자리가 있으면 바로 입장하고, 없으면 크기가 제한된 대기열에서 순서대로 기다린다.
+    - 대기열이 가득 차면 즉시 거절(AdmissionRejected)해 이미 입장한 토론의 지연을 지킨다.
+    - 클라이언트 한도에 걸린 대기자는 건너뛰고 다음 대기자를 입장시킨다 (한 클라이언트가 대기열을 막지 않도록).
+    """
+
+    def __init__(
+        self,
+        max_active: int = 32,
+        max_active_per_client: int = 4,
+        max_queue: int = 100,
+        retry_after_seconds: float = 10.0,
+    ):
+        self.max_active = max_active
+        self.max_active_per_client = max_active_per_client
+        self.max_queue = max_queue
+        self.retry_after_seconds = retry_after_seconds
+        self.active = 0
+        self._active_by_client: Counter[str] = Counter()
+        self._queue: deque[AdmissionTicket] = deque()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "AdmissionController":
+        return cls(
+            settings.WORKFLOW_MAX_ACTIVE,
+            settings.WORKFLOW_MAX_ACTIVE_PER_CLIENT,
+            settings.WORKFLOW_ADMISSION_QUEUE_SIZE,
+            settings.WORKFLOW_ADMISSION_RETRY_AFTER_SECONDS,
+        )
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    def enter(self, client: str) -> AdmissionTicket:
+        """입장권 발급 (바로 입장하거나 대기열에 들어간다). 대기열이 가득 차면 AdmissionRejected"""
+        ticket = AdmissionTicket(self, client)
+        if self._can_admit(client):
+            self._admit(ticket)
+            return ticket
+        if len(self._queue) >= self.max_queue:
+            ADMISSION_REJECTED.inc()
+            raise AdmissionRejected(self.retry_after_seconds)
+        self._queue.append(ticket)
+        ADMISSION_QUEUED.set(len(self._queue))
+        return ticket
+
+    async def acquire(self, client: str) -> AdmissionTicket:
+        """입장할 때까지 기다린 입장권 반환 (대기열이 가득 차면 retry_after_seconds 후 다시 시도, 일괄 실행용)"""
+        while True:
+            try:
+                ticket = self.enter(client)
+                break
+            except AdmissionRejected as e:
+                await asyncio.sleep(e.retry_after)
+        try:
+            while not ticket.admitted:
+                await ticket.wait_for_change()
+        except BaseException:
+            ticket.release()
+            raise
+        return ticket
+
+    def position(self, ticket: AdmissionTicket) -> int:
+        try:
+            return self._queue.index(ticket) + 1
+        except ValueError:
+            return 0
+
+    def release(self, ticket: AdmissionTicket) -> None:
+        if ticket._released:
+            return
+        ticket._released = True
+        if ticket.admitted:
+            self.active -= 1
+            self._active_by_client[ticket.client] -= 1
+            if self._active_by_client[ticket.client] <= 0:
+                del self._active_by_client[ticket.client]
+        elif ticket in self._queue:
+            self._queue.remove(ticket)
+        self._dispatch()
+
+    def _can_admit(self, client: str) -> bool:
+        return self.active < self.max_active and self._active_by_client[client] < self.max_active_per_client
+
+    def _admit(self, ticket: AdmissionTicket) -> None:
+        ticket.admitted = True
+        self.active += 1
+        self._active_by_client[ticket.client] += 1
+        ticket._changed.set()
+
+    def _dispatch(self) -> None:
+        """빈 자리에 대기자를 순서대로 입장시키고, 남은 대기자에게 순번 변경을 알린다"""
+        for ticket in list(self._queue):
+            if self.active >= self.max_active:
+                break
+            if self._can_admit(ticket.client):
+                self._queue.remove(ticket)
+                self._admit(ticket)
+        for ticket in self._queue:
+            ticket._changed.set()
+        ADMISSION_QUEUED.set(len(self._queue))
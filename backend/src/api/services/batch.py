@@ -0,0 +1,225 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any
+
+import orjson
+
+from api.repositories.workflow_run import WorkflowRunRepository
+from api.services.admission import AdmissionController
+from api.services.workflow import JudgeRationale, RunUsage, run_discussion
+from api.services.workflow_runner import estimate_savings, keep_lease, new_run_owner, register_running_workflow
+
+# 최종 결과로 돌려주는 토론 상태 필드
+RESULT_FIELDS = ("plan", "research", "critique", "decision", "round_count")
+# 일괄 실행은 결과만 필요하므로 structured 판사의 설명 생성을 생략한다 (절감량 추정도 같은 설정으로 계산)
+BATCH_JUDGE_RATIONALE: JudgeRationale = "skip"
+
+
+@dataclass
+class BatchStats:
+    """일괄 실행 전체의 처리량 집계"""
+
+    tasks: int = 0  # 제출된 과제 수
+    unique_tasks: int = 0  # 중복을 제거한 과제 수
+    debates: int = 0  # 실제로 실행한 토론 수 (실행 전에 중단된 과제 제외)
+    completed: int = 0
+    failed: int = 0
+    stopped: int = 0
+    llm_calls: int = 0
+    cached_calls: int = 0
+    total_tokens: int = 0
+
+    def record(self, result: dict[str, Any], ran: bool = True) -> None:
+        self.debates += ran
+        if result["status"] == "completed":
+            self.completed += 1
+        elif result["status"] == "stopped":
+            self.stopped += 1
+        else:
+            self.failed += 1
+        usage = result.get("usage") or {}
+        self.llm_calls += usage.get("llm_calls", 0)
+        self.cached_calls += usage.get("cached_calls", 0)
+        self.total_tokens += usage.get("total_tokens", 0)
+
+    def as_dict(self, elapsed_seconds: float) -> dict[str, Any]:
+        """처리량은 실행한 토론 기준 (중복 제거로 결과만 공유한 과제는 세지 않는다)"""
+        minutes = max(elapsed_seconds, 1e-9) / 60
+        return {
+            **asdict(self),
+            "deduplicated": self.tasks - self.unique_tasks,
+            "elapsed_seconds": round(elapsed_seconds, 3),
+            "debates_per_minute": round(self.debates / minutes, 2),
+            "tokens_per_debate": round(self.total_tokens / self.debates, 1) if self.debates else 0.0,
+        }
+
+
+def new_batch_run(batch_id: str, item: dict[str, Any]) -> dict[str, Any]:
+    """일괄 실행 과제의 실행 문서 (/execute 실행과 같은 필드 + batch_id)"""
+    now = datetime.now()
+    return {
+        "queued": False,
+        "batch_id": batch_id,
+        "task": item["task"],
+        "max_rounds": item["max_rounds"],
+        "stream_tokens": False,
+        "topology": item["topology"],
+        "use_cache": item["use_cache"],
+        "cancel_on_disconnect": False,
+        "status": "pending",
+        "current_round": 1,
+        "created_at": now,
+        "last_updated": now,
+    }
+
+
+def dedupe_key(item: dict[str, Any]) -> tuple:
+    """같은 결과를 내는 과제 판별 (앞뒤 공백/연속 공백 차이는 무시)"""
+    return " ".join(item["task"].split()), item["max_rounds"], item["topology"], item["use_cache"]
+
+
+async def run_debate(item: dict[str, Any], workflow_id: str) -> dict[str, Any]:
+    """토론 1회를 끝까지 실행하고 최종 상태와 사용량 반환 (오류는 failed, /stop 취소는 stopped 결과로 돌려준다)"""
+    usage = RunUsage()
+    state: dict[str, Any] = {}
+    started = time.perf_counter()
+    try:
+        async for mode, step in run_discussion(
+            item["task"],
+            item["max_rounds"],
+            False,
+            item["topology"],
+            item["use_cache"],
+            usage,
+            workflow_id,
+            judge_rationale=BATCH_JUDGE_RATIONALE,
+        ):
+            if mode == "updates":
+                state.update({key: step[key] for key in RESULT_FIELDS if key in step})
+        result = {"status": "completed", **{key: state.get(key) for key in RESULT_FIELDS}}
+    except asyncio.CancelledError:
+        result = {"status": "stopped"}
+    except Exception as e:
+        result = {"status": "failed", "error": str(e)}
+    return {**result, "usage": usage.as_dict(), "duration_seconds": round(time.perf_counter() - started, 3)}
+
+
+async def run_recorded(
+    repository: WorkflowRunRepository,
+    workflow_id: str,
+    item: dict[str, Any],
+    debate: Callable[[dict[str, Any], str], Awaitable[dict[str, Any]]],
+) -> dict[str, Any] | None:
+    """실행 기록을 가져와(claim) 토론을 실행하고 종료 상태를 기록 (/stop 으로 실행 전에 중단되었으면 None)"""
+    owner = new_run_owner()
+    if await repository.claim(workflow_id, owner) is None:
+        return None
+    now = datetime.now()
+    await repository.update(workflow_id, {"status": "running", "started_at": now, "last_updated": now}, owner=owner)
+    heartbeat = asyncio.create_task(keep_lease(repository, workflow_id, owner))
+    try:
+        result = await debate(item, workflow_id)
+    finally:
+        heartbeat.cancel()
+
+    # 종료 상태는 아직 running 일 때만 기록한다 (중단은 /stop 이 먼저 기록한 stopped 에 절감량을 더한다)
+    now = datetime.now()
+    fields = {"status": result["status"], "usage": result.get("usage"), "last_updated": now}
+    statuses = ("running",)
+    if result["status"] == "completed":
+        fields["completed_at"] = now
+    elif result["status"] == "failed":
+        fields["error"] = result.get("error")
+    else:
+        usage = RunUsage.from_dict(result.get("usage") or {})
+        fields["savings"] = estimate_savings(usage, item["topology"], item["max_rounds"], BATCH_JUDGE_RATIONALE)
+        statuses = ("running", "stopped")
+    await repository.update(workflow_id, fields, statuses=statuses, owner=owner)
+    return result
+
+
+async def run_batch(
+    batch_id: str,
+    items: list[dict[str, Any]],
+    concurrency: int,
+    debate: Callable[[dict[str, Any], str], Awaitable[dict[str, Any]]] = run_debate,
+    repository: WorkflowRunRepository | None = None,
+    admission: AdmissionController | None = None,
+    client: str = "batch",
+) -> AsyncIterator[dict[str, Any]]:
+    """과제 목록을 동시 실행 수 concurrency 로 실행하고 끝나는 순서대로 결과를 반환
+
+    동일한 과제는 한 번만 실행해 결과를 공유하며(deduplicated), LLM 응답 캐시도 모든 토론이 공유한다.
+    마지막에 처리량 요약(type=summary)을 반환한다. 소비자가 중간에 멈추면 남은 토론을 취소한다.
+    repository 가 주어지면 중복을 제거한 과제마다 실행 기록({batch_id}-{index})을 만들어 /list, /status, /stop 에서
+    다른 실행과 같이 다룬다. admission 이 주어지면 토론마다 client 로 입장권을 받아 /execute 와 같은
+    동시 실행 한도(전역/클라이언트별)를 따른다.
+    """
+    started = time.perf_counter()
+    groups: dict[tuple, list[int]] = {}
+    for index, item in enumerate(items):
+        groups.setdefault(dedupe_key(item), []).append(index)
+    stats = BatchStats(tasks=len(items), unique_tasks=len(groups))
+    slots = asyncio.Semaphore(concurrency)
+    if repository is not None:
+        await asyncio.gather(
+            *(
+                repository.create(f"{batch_id}-{indices[0]}", new_batch_run(batch_id, items[indices[0]]))
+                for indices in groups.values()
+            )
+        )
+
+    async def run_group(indices: list[int]) -> tuple[list[int], dict[str, Any], bool]:
+        item, workflow_id = items[indices[0]], f"{batch_id}-{indices[0]}"
+        # /stop 이 이 과제만 취소할 수 있도록 등록
+        register_running_workflow(workflow_id, asyncio.current_task())
+        try:
+            async with slots:
+                ticket = await admission.acquire(client) if admission is not None else None
+                try:
+                    if repository is None:
+                        return indices, await debate(item, workflow_id), True
+                    result = await run_recorded(repository, workflow_id, item, debate)
+                finally:
+                    if ticket is not None:
+                        ticket.release()
+            if result is not None:
+                return indices, result, True
+        except asyncio.CancelledError:
+            # 입장 전에 /stop 으로 중단되었거나 일괄 실행 전체가 취소된 경우
+            if repository is not None:
+                fields = {"status": "stopped", "usage": RunUsage().as_dict(), "last_updated": datetime.now()}
+                fields["savings"] = estimate_savings(
+                    RunUsage(), item["topology"], item["max_rounds"], BATCH_JUDGE_RATIONALE
+                )
+                await repository.update(workflow_id, fields, statuses=("pending",))
+        return indices, {"status": "stopped", "usage": RunUsage().as_dict()}, False
+
+    tasks = [asyncio.create_task(run_group(indices)) for indices in groups.values()]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            indices, result, ran = await next_done
+            stats.record(result, ran)
+            for position, index in enumerate(indices):
+                yield {
+                    "type": "result",
+                    "index": index,
+                    "task": items[index]["task"],
+                    **result,
+                    "deduplicated": position > 0,
+                }
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    yield {"type": "summary", "batch_id": batch_id, **stats.as_dict(time.perf_counter() - started)}
+
+
+async def encode_ndjson(records: AsyncIterator[dict[str, Any]]) -> AsyncIterator[bytes]:
+    """결과를 한 줄에 하나씩 JSON 으로 직렬화 (application/x-ndjson)"""
+    async for record in records:
+        yield orjson.dumps(record, default=str) + b"\n"
@@ -0,0 +1,59 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+
+import redis.asyncio as redis
+
+from api.services.workflow_runner import cancel_running_workflow
+
+logger = logging.getLogger(__name__)
+
+
+class CancellationBroker(ABC):
+    """워크플로우 취소 요청 전달
+
+    실행 태스크는 API 프로세스 또는 워커 프로세스 어디에나 있을 수 있으므로, 각 프로세스는
+    listen() 으로 취소 요청을 받아 자신이 실행 중인 태스크만 취소한다.
+    """
+
+    @abstractmethod
+    async def request_cancel(self, workflow_id: str) -> None: ...
+
+    @abstractmethod
+    async def listen(self) -> None:
+        """취소 요청을 받아 이 프로세스의 실행 태스크를 취소 (태스크가 취소될 때까지 실행)"""
+
+
+class LocalCancellationBroker(CancellationBroker):
+    """단일 프로세스용 (API 내장 워커 / 테스트)"""
+
+    async def request_cancel(self, workflow_id: str) -> None:
+        cancel_running_workflow(workflow_id)
+
+    async def listen(self) -> None:
+        await asyncio.Event().wait()
+
+
+class RedisCancellationBroker(CancellationBroker):
+    """Redis Pub/Sub 기반 (API 와 워커 프로세스가 분리된 환경)"""
+
+    channel = "workflow:cancel"
+
+    def __init__(self, client: redis.Redis):
+        self.client = client
+
+    async def request_cancel(self, workflow_id: str) -> None:
+        if not cancel_running_workflow(workflow_id):
+            await self.client.publish(self.channel, workflow_id)
+
+    async def listen(self) -> None:
+        while True:
+            try:
+                async with self.client.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            cancel_running_workflow(message["data"])
+            except redis.RedisError:
+                logger.warning("취소 채널 구독 실패, 재연결합니다", exc_info=True)
+                await asyncio.sleep(1.0)
@@ -0,0 +1,27 @@
+import difflib
+
+
+def similarity(previous: str, current: str, threshold: float = 0.0) -> float:
+    """두 버전의 단어 단위 유사도 (0~1, difflib)
+
+    비교 비용을 줄이기 위해 상한(real_quick_ratio, quick_ratio)부터 계산하고, 상한이 threshold 보다 낮으면
+    정확한 비율 대신 상한을 반환한다 (수렴 여부 판단에는 충분하다).
+    """
+    matcher = difflib.SequenceMatcher(None, previous.split(), current.split(), autojunk=False)
+    for upper_bound in (matcher.real_quick_ratio, matcher.quick_ratio):
+        ratio = upper_bound()
+        if ratio < threshold:
+            return ratio
+    return matcher.ratio()
+
+
+def estimate_convergence_savings(
+    calls_per_round: int, remaining_calls: int, round_count: int, max_rounds: int, tokens_per_call: float
+) -> tuple[int, int]:
+    """수렴으로 마무리해 실행하지 않은 (라운드 수, 토큰 수) 추정
+
+    이번 라운드의 남은 호출과 max_rounds 까지의 라운드를 모두 진행한다고 가정한 상한이다.
+    """
+    rounds_saved = max(0, max_rounds - round_count)
+    skipped_calls = remaining_calls + calls_per_round * rounds_saved
+    return rounds_saved, int(skipped_calls * tokens_per_call)
@@ -0,0 +1,115 @@
+import asyncio
+import json
+import logging
+from dataclasses import asdict, dataclass
+
+from api.services.telemetry import EVENT_BUS_DROPPED
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+# 에이전트 이벤트 기록용 로거 (배치 단위로 한 번에 기록)
+event_logger = logging.getLogger("workflow.events")
+
+
+@dataclass(slots=True)
+class AgentEvent:
+    """노드가 발행하는 구조화된 이벤트"""
+
+    agent: str
+    type: str
+    content: str
+    timestamp: float
+    workflow_id: str | None = None
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+class EventBus:
+    """프로세스 내 비동기 이벤트 버스
+
+    publish 는 구독자 큐에 넣기만 하고 즉시 반환하므로 노드 실행 경로에서 I/O 나 대기가 없다.
+    구독자 큐가 가득 차면 가장 오래된 이벤트를 버린다 (느린 구독자가 발행자를 막지 않도록).
+    """
+
+    def __init__(self):
+        self._subscribers: list[asyncio.Queue[AgentEvent]] = []
+        self.dropped = 0
+
+    def subscribe(self, maxsize: int = 10000) -> asyncio.Queue[AgentEvent]:
+        queue: asyncio.Queue[AgentEvent] = asyncio.Queue(maxsize)
+        self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue[AgentEvent]) -> None:
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+
+    def publish(self, event: AgentEvent) -> None:
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+                EVENT_BUS_DROPPED.inc()
+            queue.put_nowait(event)
+
+
+class BatchedLogSink:
+    """이벤트 버스를 구독해 batch_size 개 또는 flush_seconds 마다 모아서 기록
+
+    기록(로깅 핸들러 I/O)은 스레드에서 수행하므로 이벤트 루프를 막지 않는다.
+    """
+
+    def __init__(self, bus: EventBus, batch_size: int = 100, flush_seconds: float = 1.0, queue_size: int = 10000):
+        self.bus = bus
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.queue_size = queue_size
+        self.written = 0
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        queue = self.bus.subscribe(self.queue_size)
+        batch: list[AgentEvent] = []
+        try:
+            while True:
+                batch.append(await queue.get())
+                # 첫 이벤트 이후 flush_seconds 동안 또는 batch_size 까지 모은다
+                deadline = loop.time() + self.flush_seconds
+                while len(batch) < self.batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                await asyncio.to_thread(self._write, batch)
+                batch = []
+        finally:
+            self.bus.unsubscribe(queue)
+            # 종료 시 남은 이벤트를 기록
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch: list[AgentEvent]) -> None:
+        try:
+            event_logger.info("\n".join(json.dumps(event.as_dict(), ensure_ascii=False) for event in batch))
+            self.written += len(batch)
+        except Exception:
+            logger.exception("에이전트 이벤트 기록 실패 (%d개)", len(batch))
+
+
+# 프로세스 전역 이벤트 버스 (구독자가 없으면 발행은 아무 일도 하지 않는다)
+event_bus = EventBus()
+
+
+def create_log_sink(settings: Settings, bus: EventBus = event_bus) -> BatchedLogSink | None:
+    """설정에 맞는 이벤트 로그 싱크 생성 (EVENT_SINK_ENABLED=False 이면 None)"""
+    if not settings.EVENT_SINK_ENABLED:
+        return None
+    return BatchedLogSink(
+        bus, settings.EVENT_SINK_BATCH_SIZE, settings.EVENT_SINK_FLUSH_SECONDS, settings.EVENT_BUS_QUEUE_SIZE
+    )
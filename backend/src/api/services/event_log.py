@@ -0,0 +1,158 @@
+import asyncio
+import re
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass, field
+
+import redis.asyncio as redis
+
+REDIS_STREAM_ID = re.compile(r"^\d+-\d+$")
+
+# 실행이 아직 진행 중인지 확인하는 콜백 (새 이벤트가 없는 동안 주기적으로 호출)
+ActivityCheck = Callable[[], Awaitable[bool]]
+
+
+class EventLog(ABC):
+    """워크플로우 실행별 SSE 이벤트 기록
+
+    모든 이벤트는 단조 증가하는 id 와 함께 추가(append)되며, 구독자는 마지막으로 받은 id
+    (Last-Event-ID) 이후의 이벤트를 다시 받은 뒤 실시간 이벤트를 이어서 받는다(tail).
+    하나의 실행 결과를 여러 시청자가 같은 기록으로 공유한다.
+    """
+
+    def __init__(self, ttl_seconds: int = 1800):
+        self.ttl_seconds = ttl_seconds
+
+    @abstractmethod
+    async def append(self, workflow_id: str, event: str) -> str:
+        """SSE 이벤트를 추가하고 부여된 id 를 반환"""
+
+    @abstractmethod
+    async def close(self, workflow_id: str) -> None:
+        """기록 종료. 이후 tail 은 남은 이벤트를 모두 보낸 뒤 끝난다."""
+
+    @abstractmethod
+    async def exists(self, workflow_id: str) -> bool: ...
+
+    @abstractmethod
+    def tail(
+        self, workflow_id: str, after: str | None = None, is_active: ActivityCheck | None = None
+    ) -> AsyncIterator[tuple[str, str]]:
+        """after 이후의 (id, 이벤트)를 재전송하고, 기록이 종료될 때까지 새 이벤트를 기다린다
+
+        is_active 가 주어지면 새 이벤트가 없는 동안 주기적으로 확인해, 실행이 종료 기록(close) 없이
+        끝났거나 멈춘 경우(실행 프로세스 종료 등) 기다리지 않고 끝낸다.
+        """
+
+
+class RedisEventLog(EventLog):
+    """Redis Streams 기반 이벤트 기록 (workflow:log:{workflow_id})
+
+    토큰 단위 이벤트가 많은 긴 토론도 처음부터 재전송할 수 있도록 스트림 길이를 자르지(MAXLEN) 않는다.
+    대신 이벤트를 추가할 때마다 TTL 을 갱신해, 종료 기록 없이 버려진 스트림도 마지막 이벤트 후 ttl_seconds 에 만료된다.
+    """
+
+    def __init__(self, client: redis.Redis, ttl_seconds: int = 1800, block_ms: int = 5_000):
+        super().__init__(ttl_seconds)
+        self.client = client
+        self.block_ms = block_ms
+
+    @staticmethod
+    def _key(workflow_id: str) -> str:
+        return f"workflow:log:{workflow_id}"
+
+    async def append(self, workflow_id: str, event: str) -> str:
+        entry_id, _ = await self._add(workflow_id, {"event": event})
+        return entry_id
+
+    async def close(self, workflow_id: str) -> None:
+        await self._add(workflow_id, {"end": "1"})
+
+    async def _add(self, workflow_id: str, fields: dict[str, str]) -> list:
+        key = self._key(workflow_id)
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.xadd(key, fields)
+            pipe.expire(key, self.ttl_seconds)
+            return await pipe.execute()
+
+    async def exists(self, workflow_id: str) -> bool:
+        return bool(await self.client.exists(self._key(workflow_id)))
+
+    async def tail(
+        self, workflow_id: str, after: str | None = None, is_active: ActivityCheck | None = None
+    ) -> AsyncIterator[tuple[str, str]]:
+        key = self._key(workflow_id)
+        last_id = after if after and REDIS_STREAM_ID.match(after) else "0-0"
+        while True:
+            response = await self.client.xread({key: last_id}, count=100, block=self.block_ms)
+            if not response and is_active is not None and not await is_active():
+                return
+            for _, entries in response or ():
+                for entry_id, fields in entries:
+                    last_id = entry_id
+                    if "end" in fields:
+                        return
+                    yield entry_id, fields["event"]
+
+
+@dataclass
+class _RunLog:
+    events: list[str] = field(default_factory=list)
+    closed: bool = False
+    changed: asyncio.Condition = field(default_factory=asyncio.Condition)
+
+
+class InMemoryEventLog(EventLog):
+    """프로세스 내 이벤트 기록 (Redis 를 사용할 수 없는 환경 및 테스트용)
+
+    id 는 1부터 증가하는 정수이며, 종료된 기록은 ttl_seconds 후 삭제된다.
+    """
+
+    def __init__(self, ttl_seconds: int = 1800, idle_seconds: float = 5.0):
+        super().__init__(ttl_seconds)
+        self.idle_seconds = idle_seconds  # 새 이벤트가 없을 때 is_active 를 확인하는 간격
+        self._logs: dict[str, _RunLog] = {}
+
+    def _log(self, workflow_id: str) -> _RunLog:
+        return self._logs.setdefault(workflow_id, _RunLog())
+
+    async def append(self, workflow_id: str, event: str) -> str:
+        log = self._log(workflow_id)
+        async with log.changed:
+            log.events.append(event)
+            log.changed.notify_all()
+        return str(len(log.events))
+
+    async def close(self, workflow_id: str) -> None:
+        log = self._log(workflow_id)
+        async with log.changed:
+            log.closed = True
+            log.changed.notify_all()
+        asyncio.get_running_loop().call_later(self.ttl_seconds, self._logs.pop, workflow_id, None)
+
+    async def exists(self, workflow_id: str) -> bool:
+        return workflow_id in self._logs
+
+    async def tail(
+        self, workflow_id: str, after: str | None = None, is_active: ActivityCheck | None = None
+    ) -> AsyncIterator[tuple[str, str]]:
+        log = self._log(workflow_id)
+        position = int(after) if after and after.isdigit() else 0
+        timeout = self.idle_seconds if is_active is not None else None
+        while True:
+            async with log.changed:
+                try:
+                    await asyncio.wait_for(
+                        log.changed.wait_for(lambda: len(log.events) > position or log.closed), timeout
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                pending = log.events[position:]
+                closed = log.closed
+            for event in pending:
+                position += 1
+                yield str(position), event
+            if closed and position >= len(log.events):
+                return
+            if not pending and is_active is not None and not await is_active():
+                return
@@ -0,0 +1,107 @@
+import asyncio
+import json
+import math
+import random
+import re
+from collections.abc import AsyncIterator
+from typing import Literal
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from config.settings import Settings
+
+LatencyDistribution = Literal["fixed", "uniform", "exponential", "lognormal"]
+
+ROUND_PATTERN = re.compile(r"현재 라운드:\s*(\d+)")
+
+
+class FakeChatModel:
+    """OpenAI 를 호출하지 않는 결정적 채팅 모델 (부하 테스트/개발용)
+
+    - 첫 토큰 지연은 latency 를 평균으로 하는 분포(fixed | uniform | exponential | lognormal)에서
+      seed 로 고정된 난수로 뽑고, 이후 토큰은 token_interval 간격으로 내보낸다.
+    - 판사 프롬프트("DECISION:" 포함)에는 decisions[라운드 - 1] 을 결정으로 붙인다.
+      structured 판사 결정 프롬프트('"decision"' 포함)에는 같은 결정을 JSON 으로만 돌려준다.
+      라운드는 프롬프트에서 읽으므로 동시에 여러 토론을 실행해도 토론마다 같은 흐름이 재현된다.
+      (예: ["REVISE_PLAN", "MORE_RESEARCH", "FINALIZE"])
+    """
+
+    def __init__(
+        self,
+        model_name: str = "fake-chat-model",
+        latency: float = 0.5,
+        distribution: LatencyDistribution = "fixed",
+        token_interval: float = 0.01,
+        response_tokens: int = 50,
+        decisions: list[str] | None = None,
+        seed: int | None = 0,
+    ):
+        self.model_name = model_name
+        self.temperature = 0.0
+        self.latency = latency
+        self.distribution = distribution
+        self.token_interval = token_interval
+        self.response_tokens = response_tokens
+        self.decisions = decisions or ["FINALIZE"]
+        self.calls = 0
+        self._random = random.Random(seed)
+
+    @classmethod
+    def from_settings(cls, settings: Settings, model_name: str) -> "FakeChatModel":
+        return cls(
+            model_name,
+            latency=settings.FAKE_LLM_LATENCY_SECONDS,
+            distribution=settings.FAKE_LLM_LATENCY_DISTRIBUTION,
+            token_interval=settings.FAKE_LLM_TOKEN_INTERVAL_SECONDS,
+            response_tokens=settings.FAKE_LLM_RESPONSE_TOKENS,
+            decisions=settings.FAKE_LLM_DECISIONS,
+            seed=settings.FAKE_LLM_SEED,
+        )
+
+    async def ainvoke(self, prompt: str) -> AIMessage:
+        tokens = self._respond(prompt)
+        await asyncio.sleep(self.sample_latency() + self.token_interval * (len(tokens) - 1))
+        return AIMessage(content="".join(tokens), usage_metadata=self._usage(prompt, tokens))
+
+    async def astream(self, prompt: str) -> AsyncIterator[AIMessageChunk]:
+        tokens = self._respond(prompt)
+        await asyncio.sleep(self.sample_latency())
+        for index, token in enumerate(tokens):
+            if index:
+                await asyncio.sleep(self.token_interval)
+            yield AIMessageChunk(content=token)
+        # 실제 공급자처럼 마지막 청크에 사용량을 싣는다
+        yield AIMessageChunk(content="", usage_metadata=self._usage(prompt, tokens))
+
+    def sample_latency(self) -> float:
+        """첫 토큰까지의 지연 (초)"""
+        if self.distribution == "uniform":
+            return self._random.uniform(0, 2 * self.latency)
+        if self.distribution == "exponential":
+            return self._random.expovariate(1 / self.latency) if self.latency > 0 else 0.0
+        if self.distribution == "lognormal":
+            # 평균이 latency 가 되도록 mu 를 맞춘 꼬리가 긴 분포 (sigma=0.5)
+            sigma = 0.5
+            return (
+                self._random.lognormvariate(math.log(self.latency) - sigma**2 / 2, sigma) if self.latency > 0 else 0.0
+            )
+        return self.latency
+
+    def decision_for(self, prompt: str) -> str:
+        match = ROUND_PATTERN.search(prompt)
+        round_number = int(match.group(1)) if match else 1
+        return self.decisions[min(round_number, len(self.decisions)) - 1]
+
+    def _respond(self, prompt: str) -> list[str]:
+        self.calls += 1
+        if '"decision"' in prompt:
+            # structured 판사 결정 프롬프트에는 JSON 결정만 돌려준다
+            return [json.dumps({"decision": self.decision_for(prompt), "reason": "가짜 결정 이유"}, ensure_ascii=False)]
+        tokens = ["가짜 "] + [f"응답{index} " for index in range(1, self.response_tokens)]
+        if "DECISION:" in prompt:
+            tokens.append(f"\nDECISION: {self.decision_for(prompt)}")
+        return tokens
+
+    def _usage(self, prompt: str, tokens: list[str]) -> dict:
+        input_tokens = max(1, len(prompt) // 4)
+        return {"input_tokens": input_tokens, "output_tokens": len(tokens), "total_tokens": input_tokens + len(tokens)}
@@ -0,0 +1,58 @@
+from typing import TypedDict
+
+# (발언자, 내용) 형태의 발언 1회. BaseMessage 대신 튜플을 사용해 직렬화/메모리 비용을 줄인다.
+Turn = tuple[str, str]
+
+
+class ConversationHistory(TypedDict, total=False):
+    summary: str  # 창 밖으로 밀려난 발언들의 요약
+    turns: list[Turn]  # 최근 window 개 발언
+    total_turns: int  # 지금까지의 전체 발언 수
+
+
+class HistoryManager:
+    """AgentState["history"] 리듀서
+
+    노드가 반환한 새 발언을 최근 window 개까지만 원문(turn_max_chars 로 잘라서)으로 유지하고,
+    창 밖으로 밀려난 발언은 첫 문장만 남긴 한 줄 요약으로 summary 에 누적한다.
+    summary 도 summary_max_chars 를 넘으면 오래된 부분부터 버리므로, 라운드 수와 관계없이
+    상태 크기가 일정하게 유지된다. 요약은 추출식이라 추가 LLM 호출이 없다.
+    """
+
+    def __init__(self, window: int = 8, turn_max_chars: int = 2000, summary_max_chars: int = 2000):
+        self.window = window
+        self.turn_max_chars = turn_max_chars
+        self.summary_max_chars = summary_max_chars
+
+    def reduce(self, current: ConversationHistory, new_turns: list[Turn]) -> ConversationHistory:
+        turns = current.get("turns", []) + [(speaker, self._clip(content)) for speaker, content in new_turns]
+        summary = current.get("summary", "")
+
+        overflow = len(turns) - self.window
+        if overflow > 0:
+            summary = self._summarize(summary, turns[:overflow])
+            turns = turns[overflow:]
+
+        return {"summary": summary, "turns": turns, "total_turns": current.get("total_turns", 0) + len(new_turns)}
+
+    def _clip(self, content: str) -> str:
+        return content if len(content) <= self.turn_max_chars else content[: self.turn_max_chars].rstrip() + "…"
+
+    def _summarize(self, summary: str, evicted: list[Turn]) -> str:
+        lines = [summary] if summary else []
+        lines += [f"{speaker}: {first_sentence(content)}" for speaker, content in evicted]
+        merged = "\n".join(lines)
+        if len(merged) <= self.summary_max_chars:
+            return merged
+        # 오래된 요약부터 버린다 (줄 단위)
+        return merged[-self.summary_max_chars :].split("\n", 1)[-1]
+
+
+def first_sentence(text: str, max_chars: int = 120) -> str:
+    """첫 문장(또는 첫 줄)을 max_chars 이내로 추출"""
+    line = next((line.strip() for line in text.strip().splitlines() if line.strip()), "")
+    for delimiter in (". ", "! ", "? "):
+        index = line.find(delimiter)
+        if 0 <= index < max_chars:
+            return line[: index + len(delimiter)].strip()
+    return line if len(line) <= max_chars else line[:max_chars] + "…"
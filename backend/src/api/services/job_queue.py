@@ -0,0 +1,79 @@
+import asyncio
+import json
+from abc import ABC, abstractmethod
+from typing import Any
+
+import redis.asyncio as redis
+
+
+class JobQueue(ABC):
+    """워크플로우 실행 작업 큐
+
+    작업(job)은 {"workflow_id": ...} 형태의 dict 이며, 워커는 dequeue 한 작업을 끝낸 뒤 ack 한다.
+    """
+
+    @abstractmethod
+    async def enqueue(self, job: dict[str, Any]) -> None: ...
+
+    @abstractmethod
+    async def dequeue(self, timeout: float = 1.0) -> dict[str, Any] | None:
+        """작업 하나를 꺼낸다. timeout 동안 작업이 없으면 None"""
+
+    @abstractmethod
+    async def ack(self, job: dict[str, Any]) -> None:
+        """처리가 끝난 작업을 처리 중 목록에서 제거"""
+
+
+class RedisJobQueue(JobQueue):
+    """Redis 리스트 기반 신뢰성 큐
+
+    BLMOVE 로 대기열에서 처리 중 목록으로 원자적으로 옮기므로, 워커가 죽어도 작업이
+    처리 중 목록(processing)에 남아 복구할 수 있다.
+    """
+
+    def __init__(self, client: redis.Redis, name: str = "workflow:jobs"):
+        self.client = client
+        self.name = name
+        self.processing_name = f"{name}:processing"
+
+    async def enqueue(self, job: dict[str, Any]) -> None:
+        await self.client.lpush(self.name, json.dumps(job, ensure_ascii=False))
+
+    async def dequeue(self, timeout: float = 1.0) -> dict[str, Any] | None:
+        payload = await self.client.blmove(self.name, self.processing_name, timeout, "RIGHT", "LEFT")
+        if payload is None:
+            return None
+        job = json.loads(payload)
+        job["_payload"] = payload
+        return job
+
+    async def ack(self, job: dict[str, Any]) -> None:
+        await self.client.lrem(self.processing_name, 1, job["_payload"])
+
+    async def requeue_processing(self) -> int:
+        """처리 중 목록에 남은 작업(비정상 종료된 워커의 작업)을 대기열로 되돌린다"""
+        moved = 0
+        while await self.client.lmove(self.processing_name, self.name, "RIGHT", "RIGHT"):
+            moved += 1
+        return moved
+
+
+class InMemoryJobQueue(JobQueue):
+    """프로세스 내 큐 (테스트 및 API 프로세스 내장 워커용)"""
+
+    def __init__(self):
+        self._queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+
+    async def enqueue(self, job: dict[str, Any]) -> None:
+        self._queue.put_nowait(job)
+
+    async def dequeue(self, timeout: float = 1.0) -> dict[str, Any] | None:
+        if not self._queue.empty():
+            return self._queue.get_nowait()
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def ack(self, job: dict[str, Any]) -> None:
+        self._queue.task_done()
@@ -0,0 +1,254 @@
+import hashlib
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+
+import redis.asyncio as redis
+from langchain_core.embeddings import Embeddings
+
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+# numpy 는 의미 기반 캐시(LLM_CACHE_SEMANTIC)에만 필요한 선택 의존성 (pip install .[semantic-cache])
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# -------------------- 1. 캐시 키 / 통계 --------------------
+def make_cache_key(model: str, temperature: float | None, prompt: str) -> str:
+    """모델, temperature, 렌더링된 프롬프트 전체로 캐시 키 생성"""
+    payload = json.dumps([model, temperature, prompt], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def make_cache_partition(model: str, temperature: float | None, node: str | None, options: dict | None = None) -> str:
+    """의미 기반 조회 범위 (모델, temperature, 노드, 호출 옵션이 모두 같은 호출끼리만 유사 응답을 재사용)"""
+    return json.dumps([model, temperature, node, options or {}], ensure_ascii=False, sort_keys=True, default=str)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    semantic_hits: int = 0
+    errors: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "hit_rate": round(self.hit_rate, 4)}
+
+
+# -------------------- 2. 캐시 백엔드 --------------------
+class ResponseCache(ABC):
+    """LLM 응답 캐시 인터페이스"""
+
+    def __init__(self):
+        self.stats = CacheStats()
+
+    async def get(self, key: str, prompt: str | None = None, partition: str = "") -> str | None:
+        """캐시 조회 (hit/miss 집계 포함)
+
+        prompt 와 partition 은 의미 기반 캐시에서만 사용한다 (prompt: 임베딩할 텍스트, partition: 조회 범위).
+        """
+        value = await self._get(key)
+        if value is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return value
+
+    async def set(self, key: str, value: str, prompt: str | None = None, partition: str = "") -> None:
+        await self._set(key, value)
+
+    @abstractmethod
+    async def _get(self, key: str) -> str | None: ...
+
+    @abstractmethod
+    async def _set(self, key: str, value: str) -> None: ...
+
+
+class InMemoryResponseCache(ResponseCache):
+    """프로세스 내 LRU + TTL 캐시"""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: int = 3600):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    async def _get(self, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def _set(self, key: str, value: str) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class RedisResponseCache(ResponseCache):
+    """Redis 캐시 (여러 워커/레플리카가 공유)
+
+    Redis 장애 시에는 캐시 미스로 처리하여 토론 자체는 계속 진행한다.
+    """
+
+    key_prefix = "llm_cache:"
+
+    def __init__(self, client: redis.Redis, ttl_seconds: int = 3600):
+        super().__init__()
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+
+    async def _get(self, key: str) -> str | None:
+        try:
+            return await self.client.get(self.key_prefix + key)
+        except redis.RedisError:
+            self.stats.errors += 1
+            logger.warning("LLM 캐시 조회 실패 (Redis)", exc_info=True)
+            return None
+
+    async def _set(self, key: str, value: str) -> None:
+        try:
+            await self.client.set(self.key_prefix + key, value, ex=self.ttl_seconds)
+        except redis.RedisError:
+            self.stats.errors += 1
+            logger.warning("LLM 캐시 저장 실패 (Redis)", exc_info=True)
+
+
+class SemanticIndex:
+    """partition 하나의 (캐시 키, 정규화된 임베딩) 목록 (오래된 항목부터 max_entries 개를 넘으면 버림)"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._keys: list[str] = []
+        self._vectors = np.empty((0, 0), dtype=np.float32)
+
+    def add(self, key: str, vector: np.ndarray) -> None:
+        if self._vectors.size == 0:
+            self._vectors = vector[np.newaxis, :]
+        else:
+            self._vectors = np.vstack([self._vectors, vector])
+        self._keys.append(key)
+        if len(self._keys) > self.max_entries:
+            self._keys = self._keys[-self.max_entries :]
+            self._vectors = self._vectors[-self.max_entries :]
+
+    def nearest(self, vector: np.ndarray) -> tuple[str, float]:
+        """코사인 유사도가 가장 높은 항목의 (캐시 키, 유사도)"""
+        similarities = self._vectors @ vector
+        best = int(np.argmax(similarities))
+        return self._keys[best], float(similarities[best])
+
+
+class SemanticResponseCache(ResponseCache):
+    """임베딩 유사도 기반 캐시
+
+    정확히 일치하는 키가 없으면 같은 partition(모델, temperature, 노드, 호출 옵션)에 저장된 항목 중
+    프롬프트 임베딩과 코사인 유사도가 threshold 이상인 항목의 응답을 재사용한다.
+    partition 별로 인덱스를 따로 두므로 내용이 비슷한 다른 노드(관점별 리서치, 판사 결정/설명)의 응답은
+    재사용하지 않는다. 실제 응답 저장은 backend 캐시에 위임하며, max_entries 는 partition 별 인덱스 크기다.
+    임베딩 인덱스는 프로세스 메모리에만 있으므로 backend 가 Redis 여도 유사 프롬프트 적중은
+    같은 프로세스가 저장한 항목에만 일어나며, 재시작하면 비워진다 (정확히 일치하는 키는 공유된다).
+    """
+
+    def __init__(
+        self, backend: ResponseCache, embeddings: Embeddings, threshold: float = 0.95, max_entries: int = 1024
+    ):
+        super().__init__()
+        self.stats = backend.stats
+        self.backend = backend
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._indexes: dict[str, SemanticIndex] = {}
+        # 조회에서 계산한 임베딩 (미스 후 set 에서 같은 프롬프트를 다시 임베딩하지 않도록 키별로 보관)
+        self._lookups: OrderedDict[str, np.ndarray] = OrderedDict()
+
+    async def get(self, key: str, prompt: str | None = None, partition: str = "") -> str | None:
+        value = await self.backend._get(key)
+        index = self._indexes.get(partition)
+        if value is None and prompt is not None and index is not None:
+            value = await self._get_similar(key, prompt, index)
+        if value is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return value
+
+    async def set(self, key: str, value: str, prompt: str | None = None, partition: str = "") -> None:
+        await self.backend._set(key, value)
+        if prompt is not None:
+            vector = self._lookups.pop(key, None)
+            if vector is None:
+                vector = await self._embed(prompt)
+            index = self._indexes.get(partition)
+            if index is None:
+                index = self._indexes[partition] = SemanticIndex(self.max_entries)
+            index.add(key, vector)
+
+    async def _get(self, key: str) -> str | None:
+        return await self.backend._get(key)
+
+    async def _set(self, key: str, value: str) -> None:
+        await self.backend._set(key, value)
+
+    async def _get_similar(self, key: str, prompt: str, index: SemanticIndex) -> str | None:
+        vector = await self._embed(prompt)
+        self._lookups[key] = vector
+        while len(self._lookups) > self.max_entries:
+            self._lookups.popitem(last=False)
+        best, similarity = index.nearest(vector)
+        if similarity < self.threshold:
+            return None
+        value = await self.backend._get(best)
+        if value is not None:
+            self.stats.semantic_hits += 1
+        return value
+
+    async def _embed(self, prompt: str) -> np.ndarray:
+        vector = np.asarray(await self.embeddings.aembed_query(prompt), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+# -------------------- 3. 팩토리 --------------------
+def create_response_cache(settings: Settings) -> ResponseCache | None:
+    """설정(LLM_CACHE_*)에 따라 응답 캐시 생성. none 이면 캐시를 사용하지 않는다."""
+    if settings.LLM_CACHE_BACKEND == "none":
+        return None
+
+    if settings.LLM_CACHE_BACKEND == "redis":
+        client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+        cache: ResponseCache = RedisResponseCache(client, settings.LLM_CACHE_TTL_SECONDS)
+    else:
+        cache = InMemoryResponseCache(settings.LLM_CACHE_MAX_ENTRIES, settings.LLM_CACHE_TTL_SECONDS)
+
+    if settings.LLM_CACHE_SEMANTIC and np is None:
+        logger.warning("numpy 가 설치되지 않아 의미 기반 캐시 없이 정확히 일치하는 응답만 캐시합니다")
+    elif settings.LLM_CACHE_SEMANTIC:
+        from langchain_openai import OpenAIEmbeddings
+
+        embeddings = OpenAIEmbeddings(api_key=settings.OPENAI_API_KEY)
+        cache = SemanticResponseCache(
+            cache, embeddings, settings.LLM_CACHE_SEMANTIC_THRESHOLD, settings.LLM_CACHE_MAX_ENTRIES
+        )
+
+    return cache
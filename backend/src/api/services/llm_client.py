@@ -0,0 +1,35 @@
+import httpx
+from langchain_openai import ChatOpenAI
+
+from api.services.fake_llm import FakeChatModel
+from config.settings import Settings
+
+
+def create_http_client(settings: Settings) -> httpx.AsyncClient:
+    """모든 LLM 호출이 공유하는 연결 풀 (요청마다 TCP/TLS 연결을 새로 맺지 않는다)"""
+    limits = httpx.Limits(
+        max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    )
+    return httpx.AsyncClient(limits=limits, timeout=httpx.Timeout(settings.LLM_TIMEOUT_SECONDS))
+
+
+def create_llm(settings: Settings, model: str, http_client: httpx.AsyncClient) -> ChatOpenAI | FakeChatModel:
+    """공유 연결 풀을 사용하는 ChatOpenAI 클라이언트 생성 (LLM_PROVIDER=fake 이면 가짜 모델)"""
+    if settings.LLM_PROVIDER == "fake":
+        return FakeChatModel.from_settings(settings, model)
+    return ChatOpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        model=model,
+        temperature=0.7,
+        http_async_client=http_client,
+        timeout=settings.LLM_TIMEOUT_SECONDS,
+        # 재시도는 LLMGateway 가 제한(동시 실행/분당 처리량)을 지키며 수행한다
+        max_retries=0,
+    )
+
+
+def bind_options(client, **options):
+    """호출 옵션(response_format, max_tokens 등) 고정. 가짜/테스트 모델은 옵션 없이 그대로 사용한다"""
+    return client.bind(**options) if isinstance(client, ChatOpenAI) else client
@@ -0,0 +1,298 @@
+import asyncio
+import logging
+import random
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import TypeVar
+
+import openai
+
+from api.services.telemetry import LLM_QUEUE_WAIT, LLM_RETRIES
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+# -------------------- 1. 동시 실행 / 처리량 제한 --------------------
+class FairLimiter:
+    """동시 실행 수 제한
+
+    자리가 없으면 대기열에 들어가며, 자리가 나면 키(워크플로우)별 라운드 로빈으로 넘겨준다.
+    병렬 브랜치가 많은 토론 하나가 대기열을 독차지해 다른 토론이 굶지 않도록 하기 위함이다.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self._waiters: OrderedDict[str, deque[asyncio.Future]] = OrderedDict()
+
+    @property
+    def waiting(self) -> int:
+        return sum(len(queue) for queue in self._waiters.values())
+
+    async def acquire(self, key: str) -> None:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(key, deque()).append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # 자리를 넘겨받은 직후 취소된 경우 다음 대기자에게 돌려준다
+                self.release()
+            else:
+                self._discard(key, future)
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            key, queue = next(iter(self._waiters.items()))
+            future = queue.popleft()
+            if queue:
+                self._waiters.move_to_end(key)
+            else:
+                del self._waiters[key]
+            if not future.done():
+                # 자리(active)를 그대로 넘겨준다
+                future.set_result(None)
+                return
+        self.active -= 1
+
+    def _discard(self, key: str, future: asyncio.Future) -> None:
+        queue = self._waiters.get(key)
+        if queue is None or future not in queue:
+            return
+        queue.remove(future)
+        if not queue:
+            del self._waiters[key]
+
+    @asynccontextmanager
+    async def slot(self, key: str):
+        await self.acquire(key)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+class TokenBucket:
+    """분당 처리량 제한 (요청 수 또는 토큰 수)
+
+    분당 rate_per_minute 만큼 연속적으로 채워지고 최대 capacity 까지 쌓인다.
+    대기자는 잠금 순서(FIFO)대로 필요한 양이 찰 때까지 기다린다.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float | None = None):
+        self.rate_per_second = rate_per_minute / 60
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount: float) -> float:
+        """amount 만큼 소비하고 기다린 시간(초)을 반환"""
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.rate_per_second
+                waited += delay
+                await asyncio.sleep(delay)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.rate_per_second)
+        self._updated_at = now
+
+
+# -------------------- 2. 게이트웨이 --------------------
+@dataclass
+class ModelLimits:
+    max_concurrency: int = 16
+    requests_per_minute: int = 0  # 0 이면 제한 없음
+    tokens_per_minute: int = 0  # 0 이면 제한 없음
+
+
+@dataclass
+class GatewayStats:
+    requests: int = 0
+    retries: int = 0
+    rate_limited: int = 0  # 공급자가 429 를 돌려준 횟수
+    failures: int = 0
+    throttle_wait_seconds: float = 0.0  # 토큰 버킷 대기 시간 합계
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "throttle_wait_seconds": round(self.throttle_wait_seconds, 3)}
+
+
+class _ModelState:
+    def __init__(self, limits: ModelLimits):
+        self.limiter = FairLimiter(limits.max_concurrency)
+        self.requests = TokenBucket(limits.requests_per_minute) if limits.requests_per_minute else None
+        self.tokens = TokenBucket(limits.tokens_per_minute) if limits.tokens_per_minute else None
+        self.paused_until = 0.0  # 429 응답 이후 모델 전체가 쉬는 시각 (monotonic)
+
+
+class LLMGateway:
+    """워크플로우 노드의 모든 LLM 호출이 거치는 스케줄러
+
+    - 전역/모델별 동시 실행 수를 제한하고, 대기자는 워크플로우별로 공평하게 처리한다.
+    - 모델별 분당 요청 수/토큰 수를 토큰 버킷으로 제한해 429 가 나기 전에 속도를 늦춘다.
+    - 재시도 가능한 오류는 지수 백오프 + 지터로 재시도하며, 429 의 Retry-After 동안에는
+      같은 모델의 다른 호출도 함께 쉰다.
+    - 노드 이름으로 모델을 선택한다 (routes 에 없으면 default_model).
+    """
+
+    def __init__(
+        self,
+        default_model: str,
+        routes: dict[str, str] | None = None,
+        limits: dict[str, ModelLimits] | None = None,
+        default_limits: ModelLimits | None = None,
+        global_concurrency: int = 32,
+        max_retries: int = 4,
+        retry_base_seconds: float = 0.5,
+        retry_max_seconds: float = 20.0,
+    ):
+        self.default_model = default_model
+        self.routes = routes or {}
+        self.limits = limits or {}
+        self.default_limits = default_limits or ModelLimits()
+        self.limiter = FairLimiter(global_concurrency)
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.stats = GatewayStats()
+        self._models: dict[str, _ModelState] = {}
+
+    @classmethod
+    def from_settings(cls, settings: Settings, default_model: str) -> "LLMGateway":
+        return cls(
+            default_model,
+            routes=settings.LLM_NODE_MODELS,
+            limits={model: ModelLimits(**limits) for model, limits in settings.LLM_MODEL_LIMITS.items()},
+            default_limits=ModelLimits(
+                settings.LLM_MODEL_CONCURRENCY, settings.LLM_REQUESTS_PER_MINUTE, settings.LLM_TOKENS_PER_MINUTE
+            ),
+            global_concurrency=settings.LLM_GLOBAL_CONCURRENCY,
+            max_retries=settings.LLM_MAX_RETRIES,
+            retry_base_seconds=settings.LLM_RETRY_BASE_SECONDS,
+            retry_max_seconds=settings.LLM_RETRY_MAX_SECONDS,
+        )
+
+    def model_for(self, node: str | None) -> str:
+        return self.routes.get(node, self.default_model) if node else self.default_model
+
+    async def invoke(self, model: str, key: str, tokens: int, call: Callable[[], Awaitable[T]]) -> T:
+        """제한을 지키며 call 을 실행 (재시도 가능한 오류는 재시도)"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self.reserve(model, key, tokens):
+                    return await call()
+            except Exception as e:
+                await self._handle_failure(model, attempt, e)
+        raise AssertionError("unreachable")
+
+    async def stream(self, model: str, key: str, tokens: int, call: Callable[[], AsyncIterator[T]]) -> AsyncIterator[T]:
+        """스트리밍 호출. 첫 청크를 받기 전의 오류만 재시도한다 (이미 전달한 토큰을 중복시키지 않기 위해)"""
+        for attempt in range(self.max_retries + 1):
+            started = False
+            try:
+                async with self.reserve(model, key, tokens):
+                    async for chunk in call():
+                        started = True
+                        yield chunk
+                return
+            except Exception as e:
+                if started:
+                    self.stats.failures += 1
+                    raise
+                await self._handle_failure(model, attempt, e)
+
+    @asynccontextmanager
+    async def reserve(self, model: str, key: str, tokens: int):
+        """모델 동시 실행 자리와 분당 처리량, 전역 동시 실행 자리를 차례로 확보
+
+        429 로 쉬거나 처리량 제한에 걸린 모델의 호출이 전역 자리를 잡고 기다리면 다른 모델의 호출까지 막히므로,
+        모델 자리 안에서 대기를 마친 뒤 실제 호출하는 동안에만 전역 자리를 잡는다.
+        """
+        state = self._state(model)
+        started = time.perf_counter()
+        async with state.limiter.slot(key):
+            pause = state.paused_until - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+            if state.requests is not None:
+                self.stats.throttle_wait_seconds += await state.requests.acquire(1)
+            if state.tokens is not None:
+                self.stats.throttle_wait_seconds += await state.tokens.acquire(tokens)
+            async with self.limiter.slot(key):
+                self.stats.requests += 1
+                LLM_QUEUE_WAIT.labels(model).observe(time.perf_counter() - started)
+                yield
+
+    def _state(self, model: str) -> _ModelState:
+        state = self._models.get(model)
+        if state is None:
+            state = self._models[model] = _ModelState(self.limits.get(model, self.default_limits))
+        return state
+
+    async def _handle_failure(self, model: str, attempt: int, error: Exception) -> None:
+        """재시도할 수 없거나 재시도 횟수를 다 쓰면 다시 발생시키고, 아니면 백오프만큼 대기"""
+        if not is_retryable(error) or attempt >= self.max_retries:
+            self.stats.failures += 1
+            raise error
+
+        delay = self.backoff(attempt)
+        retry_after = retry_after_seconds(error)
+        if status_code(error) == 429:
+            self.stats.rate_limited += 1
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+            # 같은 모델의 다른 호출도 함께 쉬도록 한다
+            state = self._state(model)
+            state.paused_until = max(state.paused_until, time.monotonic() + delay)
+
+        self.stats.retries += 1
+        LLM_RETRIES.labels(model, str(status_code(error) or type(error).__name__)).inc()
+        logger.warning("LLM 호출 재시도 (%s, %d회째, %.2f초 후): %s", model, attempt + 1, delay, error)
+        await asyncio.sleep(delay)
+
+    def backoff(self, attempt: int) -> float:
+        """지수 백오프 + full jitter"""
+        return random.uniform(0, min(self.retry_max_seconds, self.retry_base_seconds * 2**attempt))
+
+
+# -------------------- 3. 오류 분류 --------------------
+def status_code(error: Exception) -> int | None:
+    return getattr(error, "status_code", None)
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, openai.APIConnectionError | asyncio.TimeoutError):
+        return True
+    return status_code(error) in RETRYABLE_STATUS_CODES
+
+
+def retry_after_seconds(error: Exception) -> float | None:
+    """공급자 응답의 Retry-After 헤더 (초)"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers["retry-after"])
+    except (KeyError, TypeError, ValueError):
+        return None
@@ -0,0 +1,195 @@
+import hashlib
+import logging
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from typing import Literal
+
+import tiktoken
+
+logger = logging.getLogger(__name__)
+
+# 인코딩을 불러올 수 없을 때 사용하는 근사치 (약 4글자당 1토큰)
+CHARS_PER_TOKEN = 4
+# 잘라낸 구간을 표시하는 문자열
+TRUNCATION_MARKER = "\n…(중략)…\n"
+
+CompactionMethod = Literal["full", "truncate", "summary"]
+# (원문, 최대 토큰 수) → 요약문
+Summarizer = Callable[[str, int], Awaitable[str]]
+
+
+@lru_cache
+def load_encoding(model: str) -> tiktoken.Encoding | None:
+    """모델의 tiktoken 인코딩 로드 (최초 1회 BPE 파일을 내려받으며, 실패하면 None)"""
+    try:
+        name = tiktoken.encoding_name_for_model(model)
+    except KeyError:
+        name = "cl100k_base"
+    try:
+        return tiktoken.get_encoding(name)
+    except Exception:
+        logger.warning("tiktoken 인코딩을 불러오지 못해 글자 수 근사치를 사용합니다 (%s)", model, exc_info=True)
+        return None
+
+
+class Tokenizer:
+    """프롬프트 구간의 토큰 수 계산 및 토큰 단위 자르기"""
+
+    def __init__(self, model: str):
+        self.model = model
+
+    @property
+    def encoding(self) -> tiktoken.Encoding | None:
+        return load_encoding(self.model)
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        encoding = self.encoding
+        if encoding is None:
+            return -(-len(text) // CHARS_PER_TOKEN)
+        return len(encoding.encode(text, disallowed_special=()))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """앞부분 2/3, 뒷부분 1/3 을 남기고 가운데를 잘라 max_tokens 이내로 축소"""
+        if self.count(text) <= max_tokens:
+            return text
+        keep = max_tokens - self.count(TRUNCATION_MARKER)
+        if keep <= 0:
+            return ""
+        head = keep * 2 // 3
+        tail = keep - head
+
+        encoding = self.encoding
+        if encoding is None:
+            head_text = text[: head * CHARS_PER_TOKEN]
+            tail_text = text[len(text) - tail * CHARS_PER_TOKEN :] if tail else ""
+        else:
+            tokens = encoding.encode(text, disallowed_special=())
+            # 토큰 경계에서 잘린 멀티바이트 문자는 대체 문자(�)로 디코딩되므로 제거한다
+            head_text = encoding.decode(tokens[:head]).rstrip("�")
+            tail_text = encoding.decode(tokens[-tail:]).lstrip("�") if tail else ""
+        return head_text.rstrip() + TRUNCATION_MARKER + tail_text.lstrip()
+
+
+@dataclass
+class SectionUsage:
+    original_tokens: int  # 압축 전 토큰 수
+    tokens: int  # 프롬프트에 실제로 들어간 토큰 수
+    method: CompactionMethod = "full"
+
+
+@dataclass
+class PromptAccounting:
+    """노드 1회 실행의 토큰 사용 내역 (token_usage SSE 이벤트로 전송)"""
+
+    node: str
+    budget: int  # 0 이면 예산 없음
+    instruction_tokens: int  # 구간을 제외한 지시문(템플릿) 토큰 수
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    sections: dict[str, SectionUsage] = field(default_factory=dict)
+
+    @property
+    def saved_tokens(self) -> int:
+        return sum(section.original_tokens - section.tokens for section in self.sections.values())
+
+    def as_dict(self) -> dict:
+        return {
+            **asdict(self),
+            "total_tokens": self.prompt_tokens + self.completion_tokens,
+            "saved_tokens": self.saved_tokens,
+        }
+
+
+class PromptAssembler:
+    """노드별 토큰 예산에 맞춰 프롬프트를 조립
+
+    노드는 구간(이전 계획, 조사 내용, 비평 등)과 구간을 채워 넣는 렌더 함수를 넘긴다.
+    지시문을 제외한 남은 예산을 구간들에 고르게 나누되(작은 구간은 그대로 두고 남는 몫을 큰 구간에 배분),
+    몫을 넘는 구간만 요약(summarize 가 주어진 경우) 또는 앞/뒤만 남기는 자르기로 압축한다.
+    요약은 원문/길이 단위로 캐시하므로 같은 계획안이 여러 노드에 들어가도 한 번만 요약한다.
+    예산이 0 인 노드는 압축하지 않고 토큰 사용 내역만 기록한다.
+    """
+
+    def __init__(
+        self,
+        tokenizer: Tokenizer,
+        budgets: dict[str, int],
+        default_budget: int = 2000,
+        min_section_tokens: int = 64,
+        summary_cache_size: int = 256,
+    ):
+        self.tokenizer = tokenizer
+        self.budgets = budgets
+        self.default_budget = default_budget
+        self.min_section_tokens = min_section_tokens
+        self.summary_cache_size = summary_cache_size
+        self._summaries: OrderedDict[str, str] = OrderedDict()
+
+    def budget_for(self, node: str) -> int:
+        return self.budgets.get(node, self.default_budget)
+
+    async def assemble(
+        self,
+        node: str,
+        render: Callable[[dict[str, str]], str],
+        sections: dict[str, str],
+        summarize: Summarizer | None = None,
+    ) -> tuple[str, PromptAccounting]:
+        """예산에 맞게 압축한 구간으로 프롬프트를 렌더링하고 토큰 사용 내역과 함께 반환"""
+        budget = self.budget_for(node)
+        instruction_tokens = self.tokenizer.count(render({name: "" for name in sections}))
+        counts = {name: self.tokenizer.count(text) for name, text in sections.items()}
+        allocation = self._allocate(counts, budget - instruction_tokens) if budget > 0 else counts
+
+        accounting = PromptAccounting(node, budget, instruction_tokens)
+        compacted: dict[str, str] = {}
+        for name, text in sections.items():
+            method: CompactionMethod = "full"
+            if counts[name] > allocation[name]:
+                text, method = await self._compact(text, allocation[name], summarize)
+            compacted[name] = text
+            accounting.sections[name] = SectionUsage(counts[name], self.tokenizer.count(text), method)
+
+        prompt = render(compacted)
+        accounting.prompt_tokens = self.tokenizer.count(prompt)
+        return prompt, accounting
+
+    def _allocate(self, counts: dict[str, int], available: int) -> dict[str, int]:
+        """구간별 토큰 몫 계산 (작은 구간부터 채우고 남는 몫은 큰 구간으로 넘긴다)"""
+        if sum(counts.values()) <= available:
+            return dict(counts)
+
+        allocation: dict[str, int] = {}
+        remaining = max(0, available)
+        ordered = sorted(counts, key=counts.get)
+        for index, name in enumerate(ordered):
+            share = remaining // (len(ordered) - index)
+            # 예산이 부족해도 구간마다 최소한의 내용은 남긴다
+            allocation[name] = max(min(counts[name], share), min(counts[name], self.min_section_tokens))
+            remaining = max(0, remaining - allocation[name])
+        return allocation
+
+    async def _compact(self, text: str, max_tokens: int, summarize: Summarizer | None) -> tuple[str, CompactionMethod]:
+        if summarize is None:
+            return self.tokenizer.truncate(text, max_tokens), "truncate"
+
+        key = f"{hashlib.sha256(text.encode()).hexdigest()}:{max_tokens}"
+        summary = self._summaries.get(key)
+        if summary is None:
+            try:
+                summary = await summarize(text, max_tokens)
+            except Exception:
+                logger.warning("프롬프트 구간 요약 실패, 자르기로 대체합니다", exc_info=True)
+                return self.tokenizer.truncate(text, max_tokens), "truncate"
+            self._summaries[key] = summary
+            if len(self._summaries) > self.summary_cache_size:
+                self._summaries.popitem(last=False)
+        else:
+            self._summaries.move_to_end(key)
+
+        # 요약이 몫을 넘기면 요약문을 다시 자른다
+        return self.tokenizer.truncate(summary, max_tokens), "summary"
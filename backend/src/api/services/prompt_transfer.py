@@ -0,0 +1,130 @@
+import csv
+import io
+import logging
+from collections.abc import AsyncIterable, AsyncIterator
+from typing import Any, Literal
+from uuid import uuid4
+
+from pydantic import ValidationError
+
+from api.repositories.prompt import PromptRepository
+from api.schemas.prompt import PromptBulkItem, PromptBulkResponse, PromptBulkResult, PromptInDB
+
+logger = logging.getLogger(__name__)
+
+ExportFormat = Literal["ndjson", "csv"]
+CSV_FIELDS = ("id", "title", "content", "description", "created_at", "updated_at")
+
+
+# -------------------- 1. 일괄 등록 --------------------
+async def read_ndjson_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """요청 본문 스트림을 줄 단위로 분리 (본문 전체를 메모리에 올리지 않는다)"""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if buffer.strip():
+        yield buffer
+
+
+async def iterate_items(items: list[Any]) -> AsyncIterator[Any]:
+    """JSON 본문의 항목 목록을 import_prompts 입력 형태로 변환"""
+    for item in items:
+        yield item
+
+
+async def import_prompts(
+    repository: PromptRepository, records: AsyncIterable[bytes | Any], batch_size: int = 500
+) -> PromptBulkResponse:
+    """프롬프트를 batch_size 개씩 묶어 삽입/갱신하고 항목별 결과 반환
+
+    records 는 NDJSON 한 줄(bytes) 또는 JSON 객체이며, 검증에 실패한 항목만 failed 로 기록하고
+    나머지는 계속 처리한다. 같은 id 가 반복되면 뒤의 항목이 앞의 항목을 갱신한다.
+    """
+    response = PromptBulkResponse()
+    batch: dict[str, tuple[int, PromptBulkItem]] = {}
+    index = 0
+    async for record in records:
+        try:
+            if isinstance(record, bytes):
+                item = PromptBulkItem.model_validate_json(record)
+            else:
+                item = PromptBulkItem.model_validate(record)
+        except ValidationError as e:
+            _record(response, PromptBulkResult(index=index, status="failed", error=_summarize(e)))
+        else:
+            if item.id is None:
+                item.id = str(uuid4())
+            # 한 번의 upsert 문은 같은 행을 두 번 갱신할 수 없으므로 먼저 기록한다
+            if item.id in batch or len(batch) >= batch_size:
+                await _flush(repository, batch, response)
+            batch[item.id] = (index, item)
+        index += 1
+
+    await _flush(repository, batch, response)
+    response.results.sort(key=lambda result: result.index)
+    return response
+
+
+async def _flush(
+    repository: PromptRepository, batch: dict[str, tuple[int, PromptBulkItem]], response: PromptBulkResponse
+) -> None:
+    if not batch:
+        return
+    try:
+        created = await repository.bulk_upsert([item for _, item in batch.values()])
+    except Exception as e:
+        # 저장소 오류는 해당 배치만 실패로 기록하고 다음 배치를 계속 처리한다
+        logger.exception("프롬프트 일괄 등록 실패 (%d개)", len(batch))
+        for index, item in batch.values():
+            _record(response, PromptBulkResult(index=index, id=item.id, status="failed", error=str(e)))
+    else:
+        for index, item in batch.values():
+            status = "created" if created[item.id] else "updated"
+            _record(response, PromptBulkResult(index=index, id=item.id, status=status))
+    batch.clear()
+
+
+def _record(response: PromptBulkResponse, result: PromptBulkResult) -> None:
+    response.results.append(result)
+    setattr(response, result.status, getattr(response, result.status) + 1)
+
+
+def _summarize(error: ValidationError) -> str:
+    messages = []
+    for detail in error.errors():
+        location = ".".join(str(part) for part in detail["loc"])
+        messages.append(f"{location}: {detail['msg']}" if location else detail["msg"])
+    return "; ".join(messages)
+
+
+# -------------------- 2. 내보내기 --------------------
+async def export_prompts(
+    repository: PromptRepository, export_format: ExportFormat = "ndjson", batch_size: int = 500
+) -> AsyncIterator[str]:
+    """전체 프롬프트를 NDJSON 또는 CSV 로 직렬화하며 배치 단위로 전송"""
+    if export_format == "csv":
+        yield _csv_row(CSV_FIELDS)
+
+    lines: list[str] = []
+    async for prompt in repository.iterate(batch_size):
+        lines.append(prompt.model_dump_json() + "\n" if export_format == "ndjson" else _csv_prompt(prompt))
+        if len(lines) >= batch_size:
+            yield "".join(lines)
+            lines.clear()
+    if lines:
+        yield "".join(lines)
+
+
+def _csv_prompt(prompt: PromptInDB) -> str:
+    values = prompt.model_dump()
+    return _csv_row([values[field].isoformat() if field.endswith("_at") else values[field] for field in CSV_FIELDS])
+
+
+def _csv_row(values) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(values)
+    return buffer.getvalue()
@@ -0,0 +1,131 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from api.services.prompt_budget import PromptAccounting
+from api.services.telemetry import SPECULATION_RESULTS, SPECULATION_SAVED_SECONDS, SPECULATION_WASTED_TOKENS
+
+if TYPE_CHECKING:
+    from api.services.workflow import RunUsage
+
+logger = logging.getLogger(__name__)
+
+# 비평에 이런 표현이 많으면 판사가 추가 조사(MORE_RESEARCH)를 고를 가능성이 높다고 본다
+RESEARCH_HINTS = ("근거", "데이터", "자료", "조사", "사례", "통계", "검증", "출처")
+PLAN_HINTS = ("수정", "보완", "현실성", "일정", "목표", "구체", "재검토", "우선순위")
+
+SpeculativeResult = tuple[str, PromptAccounting]
+
+
+def predict_decision(critique: str, previous_decision: str | None) -> str:
+    """판사의 다음 결정 예측 (revise_plan | more_research)
+
+    직전 라운드에 계속 진행 결정이 있었으면 같은 결정을 반복한다고 보고, 없으면 비평의 표현으로 판단한다.
+    """
+    if previous_decision in ("revise_plan", "more_research"):
+        return previous_decision
+    research_score = sum(critique.count(hint) for hint in RESEARCH_HINTS)
+    plan_score = sum(critique.count(hint) for hint in PLAN_HINTS)
+    return "more_research" if research_score > plan_score else "revise_plan"
+
+
+@dataclass
+class SpeculativeTask:
+    """판사가 결정하는 동안 미리 실행 중인 다음 노드 1개"""
+
+    decision: str  # 이 결과를 쓰게 되는 판사의 결정
+    node: str
+    key: str  # 노드가 실제로 실행될 때의 프롬프트와 같아야 결과를 쓴다
+    task: asyncio.Task = field(repr=False)
+    started_at: float
+    finished_at: float | None = None
+    judged_at: float | None = None
+
+
+class Speculation:
+    """실행 1회의 투기적 실행 (configurable.speculation 으로 노드에 전달)
+
+    - 판사 노드가 시작할 때 예상되는 다음 노드(planning/researcher)의 LLM 호출을 함께 시작한다.
+    - 판사의 결정이 예측과 같으면(hit) 다음 노드가 미리 받은 응답을 그대로 쓰고, 다르면(miss) 취소하고 버린다.
+    - 판사와 겹친 시간을 절약한 지연으로, 버린 응답의 토큰을 낭비한 토큰으로 usage 와 지표에 기록한다.
+    """
+
+    def __init__(self, targets: dict[str, str], usage: "RunUsage | None" = None):
+        self.targets = targets  # 판사 결정 → 미리 실행할 노드
+        self.usage = usage
+        self._pending: SpeculativeTask | None = None
+
+    def start(self, decision: str, node: str, key: str, run: Callable[[], Awaitable[SpeculativeResult]]) -> None:
+        """다음 노드를 미리 실행 (이전 투기 실행이 남아 있으면 버린다)"""
+        self.cancel()
+        task = asyncio.create_task(run())
+        speculative = SpeculativeTask(decision, node, key, task, time.perf_counter())
+
+        def finished(_: asyncio.Task) -> None:
+            speculative.finished_at = time.perf_counter()
+
+        task.add_done_callback(finished)
+        self._pending = speculative
+
+    def resolve(self, decision: str) -> None:
+        """판사의 결정 확정. 예측과 다르면 미리 실행한 결과를 버린다"""
+        speculative = self._pending
+        if speculative is None:
+            return
+        if speculative.decision != decision:
+            self._discard()
+            return
+        speculative.judged_at = time.perf_counter()
+
+    async def take(self, node: str, key: str) -> SpeculativeResult | None:
+        """노드 실행 시 미리 받은 응답 조회 (적중하지 않았으면 None 이고 노드가 직접 생성한다)"""
+        speculative = self._pending
+        if speculative is None or speculative.judged_at is None:
+            return None
+        if speculative.node != node:
+            return None
+        if speculative.key != key:
+            self._discard()
+            return None
+        self._pending = None
+        try:
+            result = await speculative.task
+        except Exception:
+            logger.warning("투기 실행이 실패해 %s 노드를 다시 실행합니다", node, exc_info=True)
+            self._record("miss", 0.0, 0)
+            return None
+        overlap = min(speculative.finished_at or speculative.judged_at, speculative.judged_at)
+        self._record("hit", overlap - speculative.started_at, 0)
+        return result
+
+    def cancel(self) -> None:
+        """실행 종료/중단 시 남은 투기 실행 정리"""
+        if self._pending is not None:
+            self._discard()
+
+    def _discard(self) -> None:
+        speculative, self._pending = self._pending, None
+        wasted_tokens = 0
+        if speculative.task.done() and not speculative.task.cancelled() and speculative.task.exception() is None:
+            _, accounting = speculative.task.result()
+            wasted_tokens = accounting.prompt_tokens + accounting.completion_tokens
+        else:
+            # 응답을 받기 전에 취소하면 출력 토큰은 쓰지 않는다 (입력 토큰은 공급자에 따라 과금될 수 있다)
+            speculative.task.cancel()
+        self._record("miss", 0.0, wasted_tokens)
+
+    def _record(self, result: str, saved_seconds: float, wasted_tokens: int) -> None:
+        SPECULATION_RESULTS.labels(result).inc()
+        SPECULATION_SAVED_SECONDS.inc(saved_seconds)
+        SPECULATION_WASTED_TOKENS.inc(wasted_tokens)
+        if self.usage is None:
+            return
+        if result == "hit":
+            self.usage.speculative_hits += 1
+        else:
+            self.usage.speculative_misses += 1
+        self.usage.speculation_saved_seconds += saved_seconds
+        self.usage.speculation_wasted_tokens += wasted_tokens
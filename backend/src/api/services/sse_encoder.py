@@ -0,0 +1,111 @@
+import zlib
+from abc import ABC, abstractmethod
+from collections.abc import AsyncGenerator, AsyncIterator
+from typing import Any
+
+import orjson
+
+try:
+    import brotli
+except ImportError:  # brotli 는 선택 의존성 (없으면 gzip 만 사용)
+    brotli = None
+
+# orjson 은 datetime 을 isoformat 과 같은 형식으로 직렬화하므로 타임스탬프를 문자열로 바꾸지 않고 넘긴다
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+# -------------------- 1. 이벤트 직렬화 --------------------
+def encode_event(event_type: str, data: dict[str, Any]) -> str:
+    """SSE 이벤트 한 건을 orjson 으로 직렬화"""
+    payload = orjson.dumps(data, default=str, option=ORJSON_OPTIONS).decode()
+    return f"event: {event_type}\ndata: {payload}\n\n"
+
+
+class ArtifactTracker:
+    """에이전트 산출물(계획/조사/비평/결정)의 변경 감지
+
+    같은 필드에 직전과 같은 내용이 다시 오면(캐시 적중, 상태 재전송 등) 전송하지 않는다.
+    """
+
+    def __init__(self):
+        self._last: dict[str, Any] = {}
+
+    def changed(self, field: str, value: Any) -> bool:
+        if not value or self._last.get(field) == value:
+            return False
+        self._last[field] = value
+        return True
+
+
+# -------------------- 2. 스트림 압축 --------------------
+class StreamCompressor(ABC):
+    """이벤트마다 flush 하는 스트리밍 압축기 (압축 사전은 스트림 전체에서 공유)"""
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes: ...
+
+    @abstractmethod
+    def finish(self) -> bytes: ...
+
+
+class GzipCompressor(StreamCompressor):
+    def __init__(self, level: int = 6):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliCompressor(StreamCompressor):
+    def __init__(self, quality: int = 5):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+def supported_encodings() -> list[str]:
+    """선호 순서대로 사용할 수 있는 Content-Encoding"""
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """Accept-Encoding 헤더에서 사용할 압축 방식 선택 (없으면 None)"""
+    if not accept_encoding:
+        return None
+    accepted = set()
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        accepted.add(name.strip().lower())
+    for encoding in supported_encodings():
+        if encoding in accepted:
+            return encoding
+    return None
+
+
+def create_compressor(encoding: str) -> StreamCompressor:
+    if encoding == "br":
+        return BrotliCompressor()
+    if encoding == "gzip":
+        return GzipCompressor()
+    raise ValueError(f"지원하지 않는 압축 방식: {encoding}")
+
+
+async def compress_events(events: AsyncGenerator[str, None], encoding: str) -> AsyncIterator[bytes]:
+    """SSE 이벤트 스트림을 압축 (이벤트마다 flush 하므로 클라이언트는 바로 복원할 수 있다)"""
+    compressor = create_compressor(encoding)
+    try:
+        async for event in events:
+            yield compressor.compress(event.encode())
+        yield compressor.finish()
+    finally:
+        # 연결이 끊긴 경우에도 원본 스트림의 정리(시청자 수 감소 등)가 바로 실행되도록 닫는다
+        await events.aclose()
@@ -0,0 +1,158 @@
+import asyncio
+import functools
+import logging
+import os
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from langgraph.config import get_config
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    make_asgi_app,
+    multiprocess,
+    start_http_server,
+)
+
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    from opentelemetry import trace
+except ImportError:  # OpenTelemetry 는 선택 의존성 (pip install .[otel])
+    trace = None
+
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+# -------------------- 1. Prometheus 지표 --------------------
+NODE_DURATION = Histogram(
+    "workflow_node_duration_seconds", "LangGraph 노드 1회 실행 시간", ["node", "status"], buckets=DURATION_BUCKETS
+)
+LLM_CALL_DURATION = Histogram(
+    "llm_call_duration_seconds", "LLM 호출 1회 시간 (대기열 대기 포함)", ["model", "node"], buckets=DURATION_BUCKETS
+)
+LLM_TOKENS = Counter("llm_tokens_total", "LLM 입력/출력 토큰 수", ["model", "node", "direction"])
+LLM_CACHE_REQUESTS = Counter("llm_cache_requests_total", "LLM 응답 캐시 조회 수", ["result"])
+LLM_RETRIES = Counter("llm_retries_total", "LLM 호출 재시도 수", ["model", "reason"])
+LLM_QUEUE_WAIT = Histogram(
+    "llm_queue_wait_seconds", "LLM 게이트웨이 대기 시간 (동시 실행 자리 + 처리량 제한)", ["model"], buckets=WAIT_BUCKETS
+)
+ACTIVE_STREAMS = Gauge("workflow_active_streams", "연결 중인 워크플로우 SSE 스트림 수", multiprocess_mode="livesum")
+RUNNING_WORKFLOWS = Gauge("workflow_running", "실행 중인 워크플로우 수", multiprocess_mode="livesum")
+WORKFLOW_RUNS = Counter("workflow_runs_total", "종료된 워크플로우 실행 수", ["status"])
+EVENT_BUS_DROPPED = Counter("event_bus_dropped_total", "구독자 큐가 가득 차 버려진 에이전트 이벤트 수")
+ADMISSION_QUEUED = Gauge("workflow_admission_queued", "입장을 기다리는 워크플로우 수", multiprocess_mode="livesum")
+ADMISSION_REJECTED = Counter("workflow_admission_rejected_total", "대기열이 가득 차 거절된 워크플로우 실행 요청 수")
+JUDGE_DECISION_RESULTS = Counter(
+    "workflow_judge_decisions_total", "판사 결정 수 (unparsed: 결정을 읽지 못해 종료)", ["mode", "decision"]
+)
+CONVERGENCE_STOPS = Counter(
+    "workflow_convergence_stops_total", "이전 라운드와 거의 같은 산출물로 조기 종료한 토론 수", ["field"]
+)
+CONVERGENCE_ROUNDS_SAVED = Counter(
+    "workflow_convergence_rounds_saved_total", "수렴 조기 종료로 실행하지 않은 라운드 수"
+)
+CONVERGENCE_TOKENS_SAVED = Counter("workflow_convergence_tokens_saved_total", "수렴 조기 종료로 절감한 토큰 수 (추정)")
+SPECULATION_RESULTS = Counter(
+    "workflow_speculation_total", "판사 결정 중 미리 실행한 다음 노드의 적중/폐기 수", ["result"]
+)
+SPECULATION_SAVED_SECONDS = Counter("workflow_speculation_saved_seconds_total", "투기 실행이 판사와 겹쳐 줄인 지연")
+SPECULATION_WASTED_TOKENS = Counter("workflow_speculation_wasted_tokens_total", "폐기된 투기 실행이 사용한 토큰 수")
+
+
+def create_metrics_app():
+    """/metrics ASGI 앱 (PROMETHEUS_MULTIPROC_DIR 가 있으면 모든 워커 프로세스의 지표를 합산)"""
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return make_asgi_app()
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return make_asgi_app(registry)
+
+
+def start_metrics_server(port: int) -> None:
+    """API 서버가 없는 프로세스(워커)의 /metrics HTTP 서버"""
+    start_http_server(port)
+    logger.info("Prometheus 지표를 %d 포트로 노출합니다", port)
+
+
+def record_llm_call(model: str, node: str | None, seconds: float, input_tokens: int, output_tokens: int) -> None:
+    node = node or "unknown"
+    LLM_CALL_DURATION.labels(model, node).observe(seconds)
+    LLM_TOKENS.labels(model, node, "input").inc(input_tokens)
+    LLM_TOKENS.labels(model, node, "output").inc(output_tokens)
+
+
+# -------------------- 2. OpenTelemetry 트레이스 (선택) --------------------
+def configure_tracing(settings: Settings, service_name: str) -> None:
+    """OTEL_ENABLED 이면 OTLP(HTTP) 로 스팬을 내보내는 TracerProvider 설정
+
+    수집기 주소 등은 OTEL_EXPORTER_OTLP_ENDPOINT 같은 표준 환경변수를 따른다.
+    """
+    if not settings.OTEL_ENABLED:
+        return
+    try:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError:
+        logger.warning("OpenTelemetry SDK/OTLP exporter 가 설치되지 않아 트레이스를 내보내지 않습니다")
+        return
+
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
+
+
+def start_trace(name: str, attributes: dict[str, Any]) -> tuple[Any, Any]:
+    """루트 스팬을 시작하고 (스팬, 컨텍스트) 반환
+
+    컨텍스트는 LangGraph config 로 노드에 전달되어, 토론 1회의 노드/LLM 스팬이 하나의 트레이스로 묶인다.
+    비동기 제너레이터 안에서 현재 컨텍스트를 바꾸지 않도록 명시적으로 전달한다.
+    """
+    if trace is None:
+        return None, None
+    span = trace.get_tracer(__name__).start_span(name, attributes=attributes)
+    return span, trace.set_span_in_context(span)
+
+
+@contextmanager
+def span(name: str, attributes: dict[str, Any] | None = None, parent: Any = None) -> Iterator[Any]:
+    """현재(또는 parent) 컨텍스트 아래에 스팬 생성 (OpenTelemetry 가 없으면 아무것도 하지 않는다)"""
+    if trace is None:
+        yield None
+        return
+    with trace.get_tracer(__name__).start_as_current_span(name, context=parent, attributes=attributes) as current:
+        yield current
+
+
+def instrument_node(name: str, node: Callable) -> Callable:
+    """LangGraph 노드의 실행 시간을 기록하고 스팬으로 감싼다
+
+    functools.wraps 로 원래 시그니처를 유지하므로 LangGraph 가 config 인자 전달 여부를 그대로 판단한다.
+    """
+
+    @functools.wraps(node)
+    async def instrumented(*args, **kwargs):
+        parent = get_config().get("configurable", {}).get("trace_context")
+        started = time.perf_counter()
+        status = "error"
+        try:
+            with span(f"node {name}", {"workflow.node": name}, parent):
+                result = await node(*args, **kwargs)
+            status = "ok"
+            return result
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        finally:
+            NODE_DURATION.labels(name, status).observe(time.perf_counter() - started)
+
+    return instrumented
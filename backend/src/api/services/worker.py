@@ -0,0 +1,89 @@
+import asyncio
+import logging
+from typing import Any
+
+from api.repositories.workflow_run import TERMINAL_STATUSES, WorkflowRunRepository
+from api.services.event_log import EventLog
+from api.services.job_queue import JobQueue
+from api.services.workflow_runner import record_workflow_events, register_running_workflow
+
+logger = logging.getLogger(__name__)
+
+
+class WorkflowWorker:
+    """작업 큐에서 워크플로우를 꺼내 실행하는 워커
+
+    한 워커가 동시에 실행하는 토론 수는 concurrency 로 제한되며, 실행 중 생성된 SSE 이벤트는
+    EventLog 에 기록되어 API 프로세스의 /workflows/stream/{workflow_id} 구독자에게 전달된다.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        repository: WorkflowRunRepository,
+        event_log: EventLog,
+        concurrency: int = 4,
+    ):
+        self.queue = queue
+        self.repository = repository
+        self.event_log = event_log
+        self.concurrency = concurrency
+        self._slots = asyncio.Semaphore(concurrency)
+        self._in_flight: set[asyncio.Task] = set()
+        self._stopping = asyncio.Event()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    async def run(self) -> None:
+        """stop() 이 호출될 때까지 작업을 가져와 실행"""
+        logger.info("워크플로우 워커 시작 (concurrency=%d)", self.concurrency)
+        while not self._stopping.is_set():
+            # 빈 슬롯이 생길 때까지 큐에서 작업을 가져오지 않는다 (워커당 실행 수 제한)
+            await self._slots.acquire()
+            try:
+                job = await self.queue.dequeue(timeout=1.0)
+            except Exception:
+                self._slots.release()
+                logger.exception("작업 큐 조회 실패")
+                await asyncio.sleep(1.0)
+                continue
+
+            if job is None:
+                self._slots.release()
+                continue
+
+            task = asyncio.create_task(self._process(job))
+            self._in_flight.add(task)
+            task.add_done_callback(self._on_done)
+
+        # 종료 시에는 실행 중인 토론이 끝날 때까지 기다린다
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        logger.info("워크플로우 워커 종료")
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        self._in_flight.discard(task)
+        self._slots.release()
+
+    async def _process(self, job: dict[str, Any]) -> None:
+        workflow_id = job["workflow_id"]
+        try:
+            run = await self.repository.get(workflow_id)
+            if run is None or run["status"] in TERMINAL_STATUSES:
+                # 만료되었거나 실행 전에 중단된 작업
+                await self.event_log.close(workflow_id)
+                return
+
+            # 취소 요청(/workflows/stop)을 받을 수 있도록 등록
+            # (다시 배정된 작업도 다른 프로세스의 임대가 유효하면 실행하지 않는다)
+            register_running_workflow(workflow_id, asyncio.current_task())
+            await record_workflow_events(self.event_log, self.repository, workflow_id)
+        except Exception:
+            logger.exception("워크플로우 실행 실패: %s", workflow_id)
+        finally:
+            await self.queue.ack(job)
@@ -1,71 +1,434 @@
-import json
+import asyncio
+import logging
+import re
 import time
-from collections.abc import Generator
-from typing import TypedDict
+from collections.abc import AsyncGenerator, Callable
+from dataclasses import asdict, dataclass, fields
+from typing import Annotated, Literal, TypedDict, get_args
+from uuid import uuid4
 
-from langchain_core.messages import BaseMessage, HumanMessage
+import orjson
+from langchain_core.runnables import RunnableConfig
 from langchain_openai import ChatOpenAI
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.config import get_config, get_stream_writer
 from langgraph.graph import END, StateGraph
-
+from langgraph.graph.state import CompiledStateGraph
+
+from api.services.convergence import estimate_convergence_savings, similarity
+from api.services.event_bus import AgentEvent, event_bus
+from api.services.history import ConversationHistory, HistoryManager
+from api.services.llm_cache import create_response_cache, make_cache_key, make_cache_partition
+from api.services.llm_client import bind_options, create_http_client, create_llm
+from api.services.llm_gateway import LLMGateway
+from api.services.prompt_budget import PromptAccounting, PromptAssembler, Summarizer, Tokenizer
+from api.services.speculation import Speculation, predict_decision
+from api.services.telemetry import (
+    CONVERGENCE_ROUNDS_SAVED,
+    CONVERGENCE_STOPS,
+    CONVERGENCE_TOKENS_SAVED,
+    JUDGE_DECISION_RESULTS,
+    LLM_CACHE_REQUESTS,
+    instrument_node,
+    record_llm_call,
+    span,
+    start_trace,
+)
 from config.settings import get_settings
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 
 # -------------------- 1. 상태 정의 --------------------
+WorkflowTopology = Literal["linear", "parallel"]
+
+# 병렬 토폴로지에서 동시에 수행되는 리서치 관점 (키: 표시 이름)
+RESEARCH_PERSPECTIVES: dict[str, str] = {
+    "cost": "비용(시간, 노력) 분석",
+    "risk": "리스크 분석",
+    "case_study": "성공 사례",
+}
+
+
+# 판사 결정 표기 → 상태의 decision 값
+JUDGE_DECISIONS: dict[str, str] = {
+    "FINALIZE": "finalize",
+    "REVISE_PLAN": "revise_plan",
+    "MORE_RESEARCH": "more_research",
+}
+JUDGE_LABELS: dict[str, str] = {decision: label for label, decision in JUDGE_DECISIONS.items()}
+DECISION_PATTERN = re.compile(r"DECISION:\s*\[?\s*(FINALIZE|REVISE_PLAN|MORE_RESEARCH)")
+
+# structured 판사의 결정 이유 (stream: 결정을 알린 뒤 이유를 생성해 스트리밍 | skip: JSON 의 한 문장 이유만 사용)
+JudgeRationale = Literal["stream", "skip"]
+
+
+# 토폴로지별 라운드당 판사를 제외한 노드의 LLM 호출 수 (취소/수렴 시 절감량 추정에 사용)
+NODE_CALLS_PER_ROUND: dict[str, int] = {"linear": 3, "parallel": 2 + len(RESEARCH_PERSPECTIVES)}
+
+
+def judge_calls_per_round(judge_rationale: JudgeRationale | None = None) -> int:
+    """판사 노드 1회의 LLM 호출 수 (structured 는 결정 호출에 이유를 스트리밍하면 이유 호출이 더해진다)"""
+    if settings.JUDGE_DECISION_MODE != "structured":
+        return 1
+    return 2 if (judge_rationale or settings.JUDGE_RATIONALE) == "stream" else 1
+
+
+def llm_calls_per_round(topology: WorkflowTopology, judge_rationale: JudgeRationale | None = None) -> int:
+    """현재 설정에서 라운드 1회의 LLM 호출 수
+
+    예산을 넘는 구간의 요약 호출(PROMPT_COMPACTION=summary)은 프롬프트 크기에 따라 달라지므로 포함하지 않는다.
+    """
+    return NODE_CALLS_PER_ROUND[topology] + judge_calls_per_round(judge_rationale)
+
+
+def expected_llm_calls(
+    topology: WorkflowTopology, max_rounds: int, judge_rationale: JudgeRationale | None = None
+) -> int:
+    """max_rounds 까지 진행할 때의 LLM 호출 수 (structured 판사는 최종 라운드에 결정 호출을 하지 않는다)"""
+    skipped_decision = 1 if settings.JUDGE_DECISION_MODE == "structured" else 0
+    return llm_calls_per_round(topology, judge_rationale) * max_rounds - skipped_decision
+
+
+# 최근 발언 창 + 이전 발언 요약으로 대화 기록 크기를 제한
+history_manager = HistoryManager(
+    settings.HISTORY_WINDOW_TURNS, settings.HISTORY_TURN_MAX_CHARS, settings.HISTORY_SUMMARY_MAX_CHARS
+)
+
+
+def merge_research_notes(current: dict[str, str], update: dict[str, str]) -> dict[str, str]:
+    """리듀서: 병렬 리서치 브랜치의 결과를 관점별로 병합"""
+    return {**current, **update}
+
+
 class AgentState(TypedDict):
     task: str  # 초기 과제
     plan: str  # Planning 에이전트의 계획안
     research: str  # Research 에이전트의 조사 내용
     critique: str  # Critic 에이전트의 비평
     decision: str  # Judge 에이전트의 최종 결정 또는 다음 단계 지시
-    history: list[BaseMessage]  # 전체 대화 기록
+    history: Annotated[ConversationHistory, history_manager.reduce]  # 대화 기록 (노드는 새 (발언자, 내용)만 반환)
     round_count: int  # 현재 라운드 수
     max_rounds: int  # 최대 라운드 수
+    research_notes: Annotated[dict[str, str], merge_research_notes]  # 병렬 리서치 관점별 결과
+
+
+@dataclass
+class RunUsage:
+    """실행 단위 LLM 사용량 (configurable.usage 로 노드에 전달)"""
+
+    llm_calls: int = 0
+    cached_calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    summary_calls: int = 0  # llm_calls 중 예산을 넘는 프롬프트 구간의 요약 호출 수
+    # 투기 실행 (WORKFLOW_SPECULATION_ENABLED): 적중/폐기 수, 판사와 겹쳐 줄인 지연, 폐기한 응답의 토큰
+    speculative_hits: int = 0
+    speculative_misses: int = 0
+    speculation_saved_seconds: float = 0.0
+    speculation_wasted_tokens: int = 0
+    # 수렴 조기 종료 (WORKFLOW_CONVERGENCE_ENABLED): 종료한 라운드(0 이면 수렴하지 않음), 절감한 라운드/토큰 추정
+    converged_round: int = 0
+    convergence_rounds_saved: int = 0
+    convergence_tokens_saved: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    def record(self, prompt: str, content: str, usage_metadata: dict | None = None) -> None:
+        """LLM 호출 1회 기록"""
+        input_tokens, output_tokens = count_usage(prompt, content, usage_metadata)
+        self.llm_calls += 1
+        self.input_tokens += input_tokens
+        self.output_tokens += output_tokens
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "total_tokens": self.total_tokens}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RunUsage":
+        """저장된 사용량(as_dict)에서 복원 (중단된 실행을 이어서 실행할 때)"""
+        return cls(**{usage_field.name: data.get(usage_field.name, 0) for usage_field in fields(cls)})
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 근사치 (약 4글자당 1토큰)"""
+    return max(1, len(text) // 4)
+
+
+def count_usage(prompt: str, content: str, usage_metadata: dict | None) -> tuple[int, int]:
+    """(입력, 출력) 토큰 수. 공급자가 사용량을 주지 않으면 글자 수로 추정"""
+    if usage_metadata:
+        return usage_metadata.get("input_tokens", 0), usage_metadata.get("output_tokens", 0)
+    return estimate_tokens(prompt), estimate_tokens(content)
 
 
 # -------------------- 2. 출력 함수 정의 --------------------
-def emit_message(agent_name: str, message: str, message_type: str = "response"):
-    """실시간 메시지 출력 (SSE 형태로 구조화)"""
-    output = {"agent": agent_name, "type": message_type, "content": message, "timestamp": time.time()}
-    print(f"[{agent_name}] {message}")
-    print(f"SSE_DATA: {json.dumps(output, ensure_ascii=False)}")
-    print("-" * 50)
-    time.sleep(0.5)  # 대화 느낌을 위한 약간의 지연
+def emit_message(agent_name: str, message: str, message_type: str = "response", stream: bool = True):
+    """노드 내부 메시지를 이벤트 버스(로그 싱크)와 custom 스트림(SSE)으로 발행
+
+    큐에 넣기만 하므로 노드 실행 경로에서 블로킹 I/O 가 없다.
+    stream=False 는 상태 업데이트로 이미 전달되는 본문(계획/조사/비평/결정)에 사용한다.
+    """
+    try:
+        config = get_config()
+    except RuntimeError:  # 그래프 밖에서 호출된 경우
+        config = None
+    workflow_id = config.get("configurable", {}).get("workflow_id") if config else None
+    event = AgentEvent(agent_name, message_type, message, time.time(), workflow_id)
+    event_bus.publish(event)
+    if stream and config is not None:
+        get_stream_writer()({"event": "agent_message", **event.as_dict()})
 
 
 # -------------------- 3. 에이전트 노드 정의 --------------------
 # LLM 모델 설정
-llm = ChatOpenAI(api_key=settings.OPENAI_API_KEY, model="gpt-3.5-turbo-1106", temperature=0.7)
+LLM_MODEL = "gpt-3.5-turbo-1106"
+# 모든 실행이 하나의 HTTP 연결 풀을 공유한다 (종료 시 llm_http_client.aclose())
+llm_http_client = create_http_client(settings)
+llm = create_llm(settings, LLM_MODEL, llm_http_client)
+# 노드 라우팅(LLM_NODE_MODELS)으로 선택된 기본 모델 외 클라이언트
+llm_clients: dict[str, ChatOpenAI] = {}
+# 동시 실행/분당 처리량 제한, 재시도, 노드별 모델 선택
+llm_gateway = LLMGateway.from_settings(settings, LLM_MODEL)
+# 모델/temperature/렌더링된 프롬프트 단위 응답 캐시 (LLM_CACHE_BACKEND=none 이면 None)
+response_cache = create_response_cache(settings)
+# 노드별 토큰 예산에 맞춰 이전 계획/조사/비평 구간을 압축하는 프롬프트 조립기
+prompt_assembler = PromptAssembler(
+    Tokenizer(LLM_MODEL), settings.PROMPT_TOKEN_BUDGETS, settings.PROMPT_TOKEN_BUDGET_DEFAULT
+)
+
+
+def get_llm(model: str):
+    """모델 클라이언트 조회. 기본 모델은 llm 을 사용한다 (테스트/벤치마크에서 교체 가능)"""
+    if model == LLM_MODEL:
+        return llm
+    client = llm_clients.get(model)
+    if client is None:
+        client = llm_clients[model] = create_llm(settings, model, llm_http_client)
+    return client
+
+
+async def generate(
+    prompt: str,
+    config: RunnableConfig,
+    agent_name: str,
+    message_type: str,
+    node: str | None = None,
+    options: dict | None = None,
+    semantic_text: str | None = None,
+) -> str:
+    """LLM 응답 생성
+
+    configurable.stream_tokens 가 켜져 있으면 ChatOpenAI.astream 으로 받은 토큰을
+    custom 스트림(agent_delta)으로 즉시 흘려보내고, 완성된 전체 응답을 반환한다.
+    configurable.use_cache 가 켜져 있으면 응답 캐시를 먼저 조회한다. 의미 기반 캐시는 같은 모델/temperature/노드/옵션의
+    응답 중에서 semantic_text(없으면 프롬프트 전체)의 임베딩이 비슷한 응답을 찾는다.
+    호출은 llm_gateway 를 거치며, node 에 따라 모델이 선택된다.
+    options 는 호출 옵션(response_format, max_tokens 등)으로 OpenAI 클라이언트에만 적용된다.
+    """
+    configurable = config.get("configurable", {})
+    stream_tokens = configurable.get("stream_tokens", False)
+    cache = response_cache if configurable.get("use_cache", True) else None
+    usage: RunUsage | None = configurable.get("usage")
+    model = llm_gateway.model_for(node)
+    client = get_llm(model)
+
+    cache_key = cache_partition = None
+    semantic_text = semantic_text or prompt
+    if cache is not None:
+        model_name = getattr(client, "model_name", type(client).__name__)
+        temperature = getattr(client, "temperature", None)
+        cache_key = make_cache_key(model_name, temperature, prompt)
+        cache_partition = make_cache_partition(model_name, temperature, node, options)
+        cached = await cache.get(cache_key, semantic_text, cache_partition)
+        LLM_CACHE_REQUESTS.labels("miss" if cached is None else "hit").inc()
+        if cached is not None:
+            # 캐시 적중 시에도 동일한 이벤트 순서(delta → message)를 유지
+            if stream_tokens:
+                get_stream_writer()({"agent": agent_name, "type": message_type, "delta": cached})
+            if usage is not None:
+                usage.cached_calls += 1
+            return cached
+
+    # 같은 워크플로우의 호출끼리 묶어 대기열에서 공평하게 처리한다
+    queue_key = configurable.get("workflow_id") or "default"
+    options = options or {}
+    tokens = prompt_assembler.tokenizer.count(prompt) + options.get("max_tokens", settings.LLM_EXPECTED_OUTPUT_TOKENS)
+    if options:
+        client = bind_options(client, **options)
+    started = time.perf_counter()
+    with span("llm.call", {"llm.model": model, "workflow.node": node or "", "llm.stream": stream_tokens}) as current:
+        if not stream_tokens:
+            response = await llm_gateway.invoke(model, queue_key, tokens, lambda: client.ainvoke(prompt))
+            content = response.content
+            usage_metadata = getattr(response, "usage_metadata", None)
+        else:
+            writer = get_stream_writer()
+            chunks: list[str] = []
+            usage_metadata = None
+            async for chunk in llm_gateway.stream(model, queue_key, tokens, lambda: client.astream(prompt)):
+                usage_metadata = getattr(chunk, "usage_metadata", None) or usage_metadata
+                if not chunk.content:
+                    continue
+                chunks.append(chunk.content)
+                writer({"agent": agent_name, "type": message_type, "delta": chunk.content})
+            content = "".join(chunks)
+
+        input_tokens, output_tokens = count_usage(prompt, content, usage_metadata)
+        record_llm_call(model, node, time.perf_counter() - started, input_tokens, output_tokens)
+        if current is not None:
+            current.set_attributes({"llm.input_tokens": input_tokens, "llm.output_tokens": output_tokens})
+
+    if usage is not None:
+        usage.record(prompt, content, usage_metadata)
+    if cache is not None:
+        await cache.set(cache_key, content, semantic_text, cache_partition)
+    return content
+
+
+def make_section_summarizer(usage: RunUsage | None, queue_key: str) -> Summarizer:
+    """예산을 넘는 프롬프트 구간을 LLM 으로 요약하는 함수 생성 (요약 호출도 사용량에 기록)"""
+
+    async def summarize(text: str, max_tokens: int) -> str:
+        prompt = f"다음 내용을 {max_tokens} 토큰 이내로, 결론과 수치 위주로 요약해주세요.\n\n{text}"
+        model = llm_gateway.model_for("summary")
+        client = get_llm(model)
+        tokens = prompt_assembler.tokenizer.count(prompt) + max_tokens
+        response = await llm_gateway.invoke(model, queue_key, tokens, lambda: client.ainvoke(prompt))
+        if usage is not None:
+            usage.record(prompt, response.content, getattr(response, "usage_metadata", None))
+            usage.summary_calls += 1
+        return response.content
+
+    return summarize
+
+
+async def generate_within_budget(
+    node: str,
+    render: Callable[[dict[str, str]], str],
+    sections: dict[str, str],
+    config: RunnableConfig,
+    agent_name: str,
+    message_type: str,
+    options: dict | None = None,
+) -> str:
+    """노드 예산에 맞게 프롬프트를 조립해 응답을 생성하고, 구간별 토큰 사용 내역을 custom 스트림으로 전송
+
+    판사가 결정하는 동안 같은 프롬프트로 미리 실행한 응답(투기 실행 적중)이 있으면 그 응답을 쓴다.
+    """
+    configurable = config.get("configurable", {})
+    speculation: Speculation | None = configurable.get("speculation")
+    result = await speculation.take(node, render(sections)) if speculation is not None else None
+    if result is None:
+        result = await assemble_and_generate(node, render, sections, config, agent_name, message_type, options)
+    elif configurable.get("stream_tokens", False):
+        # 캐시 적중과 같이 미리 받은 응답을 하나의 델타로 보낸다
+        get_stream_writer()({"agent": agent_name, "type": message_type, "delta": result[0]})
+
+    content, accounting = result
+    get_stream_writer()({"event": "token_usage", "agent": agent_name, **accounting.as_dict()})
+    return content
+
+
+async def assemble_and_generate(
+    node: str,
+    render: Callable[[dict[str, str]], str],
+    sections: dict[str, str],
+    config: RunnableConfig,
+    agent_name: str,
+    message_type: str,
+    options: dict | None = None,
+) -> tuple[str, PromptAccounting]:
+    """노드 예산에 맞게 프롬프트를 조립해 응답 생성 (응답과 토큰 사용 내역 반환)"""
+    configurable = config.get("configurable", {})
+    summarize = None
+    if settings.PROMPT_COMPACTION == "summary":
+        summarize = make_section_summarizer(configurable.get("usage"), configurable.get("workflow_id") or "default")
+    prompt, accounting = await prompt_assembler.assemble(node, render, sections, summarize)
+
+    # 의미 기반 캐시는 지시문이 아닌 과제와 토론 내용으로 유사도를 비교한다
+    semantic_text = "\n\n".join([configurable.get("task") or "", *sections.values()])
+    content = await generate(prompt, config, agent_name, message_type, node, options, semantic_text)
+    accounting.completion_tokens = prompt_assembler.tokenizer.count(content)
+    return content, accounting
+
+
+# 수렴 판단 대상 산출물의 표시 이름
+CONVERGENCE_FIELDS = {"plan": "계획", "critique": "비평"}
+
+
+def check_convergence(
+    field: str, previous: str, current: str, state: AgentState, config: RunnableConfig, remaining_calls: int
+) -> dict:
+    """산출물이 이전 라운드와 거의 같으면 토론을 마무리하는 상태 변경 반환 (수렴하지 않았으면 빈 dict)
+
+    remaining_calls 는 이번 라운드에서 건너뛰게 되는 LLM 호출 수로, 절감량 추정에 사용한다.
+    """
+    if not settings.WORKFLOW_CONVERGENCE_ENABLED or state["round_count"] <= 1 or not previous:
+        return {}
+    threshold = settings.WORKFLOW_CONVERGENCE_THRESHOLD
+    score = similarity(previous, current, threshold)
+    if score < threshold:
+        return {}
+
+    configurable = config.get("configurable", {})
+    usage: RunUsage | None = configurable.get("usage")
+    tokens_per_call = (
+        usage.total_tokens / usage.llm_calls if usage and usage.llm_calls else settings.LLM_EXPECTED_OUTPUT_TOKENS
+    )
+    rounds_saved, tokens_saved = estimate_convergence_savings(
+        llm_calls_per_round(configurable.get("topology", "linear"), configurable.get("judge_rationale")),
+        remaining_calls,
+        state["round_count"],
+        state["max_rounds"],
+        tokens_per_call,
+    )
+    CONVERGENCE_STOPS.labels(field).inc()
+    CONVERGENCE_ROUNDS_SAVED.inc(rounds_saved)
+    CONVERGENCE_TOKENS_SAVED.inc(tokens_saved)
+    if usage is not None:
+        usage.converged_round = state["round_count"]
+        usage.convergence_rounds_saved = rounds_saved
+        usage.convergence_tokens_saved = tokens_saved
+
+    title = CONVERGENCE_FIELDS[field]
+    emit_message(
+        "매니저", f"📉 {title}이 이전 라운드와 거의 같습니다 (유사도 {score:.2f}). 토론을 마무리합니다.", "converged"
+    )
+    emit_message("판사", "🎉 최종 결정: 프로젝트 승인!", "final", stream=False)
+    return {"decision": "finalize"}
 
 
-def control_manager_node(state: AgentState):
+async def control_manager_node(state: AgentState):
     """Control Manager: 토론 시작 및 과제 제시"""
     emit_message("매니저", f"🎯 라운드 {state['round_count']}을 시작합니다!", "start")
     emit_message("매니저", f"오늘의 과제는 '{state['task']}'입니다.", "task")
     emit_message("매니저", "기획자님, 계획을 수립해주세요.", "request")
 
-    state["history"].append(
-        HumanMessage(content=f"라운드 {state['round_count']}: 과제 '{state['task']}'에 대한 논의를 시작합니다.")
-    )
-    return state
+    return {"history": [("매니저", f"라운드 {state['round_count']}: 과제 '{state['task']}'에 대한 논의를 시작합니다.")]}
 
 
-def planning_node(state: AgentState):
-    """Planning: 초기 계획 수립"""
-    emit_message("기획자", "네, 계획을 수립해보겠습니다.", "thinking")
-
+def planning_prompt(state: AgentState) -> tuple[Callable[[dict[str, str]], str], dict[str, str]]:
+    """Planning 프롬프트의 렌더 함수와 구간 (판사 노드의 투기 실행도 같은 프롬프트를 쓴다)"""
     # 이전 라운드 정보가 있다면 참고
-    previous_context = ""
+    sections = {}
     if state["round_count"] > 1:
-        previous_context = f"""
+        sections = {"plan": state.get("plan") or "N/A", "critique": state.get("critique") or "N/A"}
+
+    def render(sections: dict[str, str]) -> str:
+        previous_context = ""
+        if sections:
+            previous_context = f"""
         이전 라운드 정보:
-        - 이전 계획: {state.get("plan", "N/A")}
-        - 이전 비평: {state.get("critique", "N/A")}
+        - 이전 계획: {sections["plan"]}
+        - 이전 비평: {sections["critique"]}
         이전 피드백을 반영하여 계획을 수정해주세요.
         """
 
-    prompt = f"""
+        return f"""
     당신은 전문 기획자입니다. 다음 과제에 대해 간단하게 계획을 수립해주세요.
     과제: {state["task"]}
     현재 라운드: {state["round_count"]}
@@ -81,24 +444,35 @@ def planning_node(state: AgentState):
     친근하고 대화하는 톤으로 작성해주세요.
     """
 
-    response = llm.invoke(prompt)
-    state["plan"] = response.content
-    state["history"].append(HumanMessage(content=f"[기획자] {response.content}"))
+    return render, sections
 
-    emit_message("기획자", response.content, "plan")
-    emit_message("기획자", "리서처님, 이 계획에 대해 조사해주실 수 있나요?", "request")
 
-    return state
+async def planning_node(state: AgentState, config: RunnableConfig):
+    """Planning: 초기 계획 수립"""
+    emit_message("기획자", "네, 계획을 수립해보겠습니다.", "thinking")
 
+    render, sections = planning_prompt(state)
+    content = await generate_within_budget("planning", render, sections, config, "기획자", "plan")
+    emit_message("기획자", content, "plan", stream=False)
+
+    # 수정한 계획이 이전 계획과 거의 같으면 조사/비평/판단을 반복하지 않고 마무리한다
+    configurable = config.get("configurable", {})
+    calls_per_round = llm_calls_per_round(configurable.get("topology", "linear"), configurable.get("judge_rationale"))
+    converged = check_convergence("plan", state.get("plan", ""), content, state, config, calls_per_round - 1)
+    if not converged:
+        emit_message("기획자", "리서처님, 이 계획에 대해 조사해주실 수 있나요?", "request")
+
+    return {"plan": content, "history": [("기획자", content)], **converged}
 
-def research_node(state: AgentState):
-    """Research: 계획에 대한 정보 조사"""
-    emit_message("리서처", "기획자님의 계획을 검토해보겠습니다.", "thinking")
 
-    prompt = f"""
+def research_prompt(state: AgentState) -> tuple[Callable[[dict[str, str]], str], dict[str, str]]:
+    """Research 프롬프트의 렌더 함수와 구간 (판사 노드의 투기 실행도 같은 프롬프트를 쓴다)"""
+
+    def render(sections: dict[str, str]) -> str:
+        return f"""
     당신은 전문 리서처입니다. 기획자가 제시한 계획에 대해 간단하게 다각도로 조사해주세요.
     
-    계획안: {state["plan"]}
+    계획안: {sections["plan"]}
     현재 라운드: {state["round_count"]}
     
     다음 관점에서 조사해주세요:
@@ -109,25 +483,76 @@ def research_node(state: AgentState):
     조사 결과를 대화하듯이 친근하게 설명해주세요.
     """
 
-    response = llm.invoke(prompt)
-    state["research"] = response.content
-    state["history"].append(HumanMessage(content=f"[리서처] {response.content}"))
+    return render, {"plan": state["plan"]}
+
 
-    emit_message("리서처", response.content, "research")
+async def research_node(state: AgentState, config: RunnableConfig):
+    """Research: 계획에 대한 정보 조사"""
+    emit_message("리서처", "기획자님의 계획을 검토해보겠습니다.", "thinking")
+
+    render, sections = research_prompt(state)
+    content = await generate_within_budget("researcher", render, sections, config, "리서처", "research")
+    emit_message("리서처", content, "research", stream=False)
     emit_message("리서처", "비평가님, 이 계획과 조사 결과에 대해 어떻게 생각하시나요?", "request")
 
-    return state
+    return {"research": content, "history": [("리서처", content)]}
+
+
+async def research_fan_out_node(state: AgentState):
+    """Research (병렬): 관점별 브랜치로 조사를 분배"""
+    emit_message("리서처", "관점별로 나누어 동시에 조사하겠습니다.", "thinking")
+    return {}
+
+
+def make_research_perspective_node(perspective: str, title: str):
+    """Research (병렬): 하나의 관점만 조사하는 브랜치 노드 생성"""
+    agent_name = f"리서처({title})"
+
+    async def research_perspective_node(state: AgentState, config: RunnableConfig):
+        def render(sections: dict[str, str]) -> str:
+            return f"""
+        당신은 전문 리서처입니다. 기획자가 제시한 계획을 '{title}' 관점에서만 간단하게 조사해주세요.
 
+        계획안: {sections["plan"]}
+        현재 라운드: {state["round_count"]}
+
+        조사 결과를 대화하듯이 친근하게 설명해주세요.
+        """
+
+        content = await generate_within_budget(
+            f"research_{perspective}", render, {"plan": state["plan"]}, config, agent_name, "research"
+        )
+        emit_message(agent_name, content, "research", stream=False)
+        return {"research_notes": {perspective: content}}
+
+    return research_perspective_node
+
+
+async def research_merge_node(state: AgentState):
+    """Research (병렬): 관점별 조사 결과를 하나의 조사 내용으로 병합"""
+    notes = state["research_notes"]
+    content = "\n\n".join(
+        f"[{title}]\n{notes[perspective]}"
+        for perspective, title in RESEARCH_PERSPECTIVES.items()
+        if perspective in notes
+    )
 
-def critic_node(state: AgentState):
+    emit_message("리서처", content, "research", stream=False)
+    emit_message("리서처", "비평가님, 이 계획과 조사 결과에 대해 어떻게 생각하시나요?", "request")
+
+    return {"research": content, "history": [("리서처", content)]}
+
+
+async def critic_node(state: AgentState, config: RunnableConfig):
     """Critic: 계획과 조사를 바탕으로 비판적 검토"""
     emit_message("비평가", "계획과 조사 내용을 꼼꼼히 살펴보겠습니다.", "thinking")
 
-    prompt = f"""
+    def render(sections: dict[str, str]) -> str:
+        return f"""
     당신은 예리한 비평가입니다. 기획자의 계획과 리서처의 조사 결과를 종합적으로 간단하게 검토해주세요.
     
-    계획안: {state["plan"]}
-    조사 내용: {state["research"]}
+    계획안: {sections["plan"]}
+    조사 내용: {sections["research"]}
     현재 라운드: {state["round_count"]}
     
     다음 관점에서 비판적으로 검토해주세요:
@@ -140,38 +565,147 @@ def critic_node(state: AgentState):
     건설적인 비판을 대화하듯이 친근하게 제시해주세요.
     """
 
-    response = llm.invoke(prompt)
-    state["critique"] = response.content
-    state["history"].append(HumanMessage(content=f"[비평가] {response.content}"))
+    sections = {"plan": state["plan"], "research": state["research"]}
+    content = await generate_within_budget("critic", render, sections, config, "비평가", "critique")
+    emit_message("비평가", content, "critique", stream=False)
+
+    # 비평이 이전 라운드와 거의 같으면 판사가 같은 결정을 반복할 뿐이므로 마무리한다
+    judge_calls = judge_calls_per_round(config.get("configurable", {}).get("judge_rationale"))
+    converged = check_convergence("critique", state.get("critique", ""), content, state, config, judge_calls)
+    if not converged:
+        emit_message("비평가", "판사님, 최종 결정을 내려주세요.", "request")
+
+    return {"critique": content, "history": [("비평가", content)], **converged}
+
+
+# 투기 실행할 수 있는 노드의 프롬프트와 발언자 정보
+SPECULATIVE_PROMPTS = {
+    "planning": (planning_prompt, "기획자", "plan"),
+    "researcher": (research_prompt, "리서처", "research"),
+}
+# 토폴로지별 판사 결정 → 미리 실행할 다음 노드 (병렬 리서치는 관점별 브랜치로 나뉘어 제외)
+SPECULATIVE_NODES: dict[WorkflowTopology, dict[str, str]] = {
+    "linear": {"revise_plan": "planning", "more_research": "researcher"},
+    "parallel": {"revise_plan": "planning"},
+}
+
+
+def start_speculation(speculation: Speculation, state: AgentState, config: RunnableConfig) -> None:
+    """판사가 결정하는 동안 예상되는 다음 라운드 노드의 LLM 호출을 미리 시작"""
+    decision = predict_decision(state["critique"], state.get("decision"))
+    node = speculation.targets.get(decision)
+    if node is None:
+        return
+    prompt, agent_name, message_type = SPECULATIVE_PROMPTS[node]
+    render, sections = prompt({**state, "round_count": state["round_count"] + 1})
+    # 결과를 쓸지 모르므로 토큰을 흘려보내지 않는다 (적중하면 노드가 응답 전체를 한 번에 보낸다)
+    speculative_config = {**config, "configurable": {**config.get("configurable", {}), "stream_tokens": False}}
+    speculation.start(
+        decision,
+        node,
+        render(sections),
+        lambda: assemble_and_generate(node, render, sections, speculative_config, agent_name, message_type),
+    )
+
+
+def parse_decision(text: str) -> str | None:
+    """판사 응답에서 결정 읽기 (JSON 의 decision 필드 또는 마지막 "DECISION: ..." 줄, 읽지 못하면 None)"""
+    start, end = text.find("{"), text.rfind("}")
+    if start != -1 and end > start:
+        try:
+            label = orjson.loads(text[start : end + 1]).get("decision")
+        except (orjson.JSONDecodeError, AttributeError):
+            label = None
+        if isinstance(label, str) and label.strip().upper() in JUDGE_DECISIONS:
+            return JUDGE_DECISIONS[label.strip().upper()]
+    labels = DECISION_PATTERN.findall(text)
+    return JUDGE_DECISIONS[labels[-1]] if labels else None
+
+
+async def decide_structured(
+    state: AgentState, sections: dict[str, str], config: RunnableConfig
+) -> tuple[str | None, str]:
+    """JSON 결정만 짧게 생성 (결정, 한 문장 이유). 설명을 기다리지 않고 바로 라우팅할 수 있다"""
+
+    def render(sections: dict[str, str]) -> str:
+        return f"""
+    당신은 최종 의사결정권자인 판사입니다. 토론 내용을 검토하고 다음 단계를 결정해주세요.
+
+    계획안: {sections["plan"]}
+    조사 내용: {sections["research"]}
+    비평: {sections["critique"]}
+    현재 라운드: {state["round_count"]}
+    최대 라운드: {state["max_rounds"]}
+
+    - 계획에 근본적인 수정이 필요하면 REVISE_PLAN
+    - 정보가 더 필요하면 MORE_RESEARCH
+    - 계획이 타당하고 실행 가능하면 FINALIZE
+
+    설명 없이 다음 형식의 JSON 객체 하나만 출력해주세요.
+    {{"decision": "REVISE_PLAN" | "MORE_RESEARCH" | "FINALIZE", "reason": "한 문장 이유"}}
+    """
+
+    # JSON 은 사용자에게 토큰 단위로 보여줄 내용이 아니므로 흘려보내지 않는다
+    decision_config = {**config, "configurable": {**config.get("configurable", {}), "stream_tokens": False}}
+    options = {"response_format": {"type": "json_object"}, "max_tokens": settings.JUDGE_DECISION_MAX_TOKENS}
+    content = await generate_within_budget("judge", render, sections, decision_config, "판사", "decision", options)
+    try:
+        reason = orjson.loads(content[content.find("{") : content.rfind("}") + 1]).get("reason") or ""
+    except (orjson.JSONDecodeError, AttributeError):
+        reason = ""
+    return parse_decision(content), str(reason)
 
-    emit_message("비평가", response.content, "critique")
-    emit_message("비평가", "판사님, 최종 결정을 내려주세요.", "request")
 
-    return state
+async def explain_decision(state: AgentState, sections: dict[str, str], config: RunnableConfig, decision: str) -> str:
+    """결정 이유를 대화체로 생성 (결정을 먼저 알린 뒤 스트리밍)"""
+    label = JUDGE_LABELS[decision]
 
+    def render(sections: dict[str, str]) -> str:
+        return f"""
+    당신은 최종 의사결정권자인 판사입니다. 토론 내용을 검토한 뒤 '{label}' 결정을 내렸습니다.
 
-def judge_node(state: AgentState):
-    """Judge: 모든 내용을 종합하여 다음 단계를 결정"""
+    계획안: {sections["plan"]}
+    조사 내용: {sections["research"]}
+    비평: {sections["critique"]}
+    현재 라운드: {state["round_count"]}
+
+    이 결정을 내린 이유를 대화하듯이 친근하게 설명해주세요.
+    """
+
+    return await generate_within_budget("judge_rationale", render, sections, config, "판사", "decision")
+
+
+async def judge_node(state: AgentState, config: RunnableConfig):
+    """Judge: 모든 내용을 종합하여 다음 단계를 결정
+
+    JUDGE_DECISION_MODE=structured 이면 JSON 결정을 먼저 받아 바로 알리고, 이유는 그 뒤에 따로 생성한다
+    (configurable.judge_rationale=skip 이면 생략).
+    """
     emit_message("판사", "모든 의견을 종합하여 판단해보겠습니다.", "thinking")
 
     # 최대 라운드 체크
     is_final_round = state["round_count"] >= state["max_rounds"]
+    configurable = config.get("configurable", {})
+    speculation: Speculation | None = configurable.get("speculation")
+    if speculation is not None and not is_final_round:
+        start_speculation(speculation, state, config)
 
-    prompt = f"""
+    def render(sections: dict[str, str]) -> str:
+        return f"""
     당신은 최종 의사결정권자인 판사입니다. 모든 토론 내용을 종합하여 결정해주세요.
     
-    계획안: {state["plan"]}
-    조사 내용: {state["research"]}
-    비평: {state["critique"]}
+    계획안: {sections["plan"]}
+    조사 내용: {sections["research"]}
+    비평: {sections["critique"]}
     현재 라운드: {state["round_count"]}
     최대 라운드: {state["max_rounds"]}
     최종 라운드 여부: {is_final_round}
     
     {
-        "최종 라운드이므로 반드시 FINALIZE를 선택해야 합니다."
-        if is_final_round
-        else "다음 세 가지 옵션 중 하나로 결정해주세요:"
-    }
+            "최종 라운드이므로 반드시 FINALIZE를 선택해야 합니다."
+            if is_final_round
+            else "다음 세 가지 옵션 중 하나로 결정해주세요:"
+        }
     
     - 계획에 근본적인 수정이 필요하면 'REVISE_PLAN'
     - 정보가 더 필요하면 'MORE_RESEARCH'  
@@ -181,32 +715,55 @@ def judge_node(state: AgentState):
     대화하듯이 친근하게 설명해주세요.
     """
 
-    response = llm.invoke(prompt)
-    decision_text = response.content
-    state["history"].append(HumanMessage(content=f"[판사] {decision_text}"))
-
-    emit_message("판사", decision_text, "decision")
-
-    # 결정 파싱
-    if is_final_round or "DECISION: FINALIZE" in decision_text:
-        state["decision"] = "finalize"
-        emit_message("판사", "🎉 최종 결정: 프로젝트 승인!", "final")
-    elif "DECISION: REVISE_PLAN" in decision_text:
-        state["decision"] = "revise_plan"
-        state["round_count"] += 1
-        emit_message("판사", f"🔄 라운드 {state['round_count']}에서 계획을 수정하겠습니다.", "continue")
-    elif "DECISION: MORE_RESEARCH" in decision_text:
-        state["decision"] = "more_research"
-        state["round_count"] += 1
-        emit_message("판사", f"🔍 라운드 {state['round_count']}에서 추가 조사하겠습니다.", "continue")
+    sections = {"plan": state["plan"], "research": state["research"], "critique": state["critique"]}
+    mode = settings.JUDGE_DECISION_MODE
+    decision_text = reason = ""
+    if mode == "structured":
+        # 최종 라운드는 결정이 정해져 있으므로 결정 호출을 하지 않는다
+        decision, reason = ("finalize", "") if is_final_round else await decide_structured(state, sections, config)
+    else:
+        decision_text = await generate_within_budget("judge", render, sections, config, "판사", "decision")
+        emit_message("판사", decision_text, "decision", stream=False)
+        decision = "finalize" if is_final_round else parse_decision(decision_text)
+
+    # 결정을 읽지 못하면 종료하되, 조용히 넘어가지 않도록 지표와 로그를 남긴다
+    JUDGE_DECISION_RESULTS.labels(mode, decision or "unparsed").inc()
+    if decision is None:
+        logger.warning("판사 결정을 읽지 못해 토론을 종료합니다 (workflow_id=%s)", configurable.get("workflow_id"))
+        decision = "finalize"
+    if speculation is not None:
+        speculation.resolve(decision)
+
+    next_round = state["round_count"] + 1
+    update = {"decision": decision}
+    if decision == "revise_plan":
+        update["round_count"] = next_round
+        emit_message("판사", f"🔄 라운드 {next_round}에서 계획을 수정하겠습니다.", "continue")
+    elif decision == "more_research":
+        update["round_count"] = next_round
+        emit_message("판사", f"🔍 라운드 {next_round}에서 추가 조사하겠습니다.", "continue")
     else:
-        state["decision"] = "finalize"
-        emit_message("판사", "🎉 최종 결정: 프로젝트 승인!", "final")
+        emit_message("판사", "🎉 최종 결정: 프로젝트 승인!", "final", stream=False)
 
-    return state
+    if mode == "structured":
+        if configurable.get("judge_rationale", settings.JUDGE_RATIONALE) == "stream":
+            reason = await explain_decision(state, sections, config, decision)
+            emit_message("판사", reason, "decision", stream=False)
+        decision_text = f"{reason}\nDECISION: {JUDGE_LABELS[decision]}".strip()
+    update["history"] = [("판사", decision_text)]
+    return update
 
 
 # -------------------- 4. 조건부 엣지(라우터) 정의 --------------------
+def stop_if_converged(next_node: str) -> Callable[[AgentState], str]:
+    """라우터 생성: 수렴으로 마무리(decision=finalize)했으면 종료하고, 아니면 next_node 로 진행"""
+
+    def route(state: AgentState) -> str:
+        return END if state.get("decision") == "finalize" else next_node
+
+    return route
+
+
 def router(state: AgentState):
     """라우터: 판사의 결정에 따라 다음 단계 결정"""
     decision = state.get("decision", "finalize")
@@ -220,53 +777,185 @@ def router(state: AgentState):
 
 
 # -------------------- 5. 그래프 구성 및 실행 --------------------
-def create_discussion_workflow():
-    """토론 워크플로우 생성"""
+def create_discussion_workflow(
+    topology: WorkflowTopology = "linear", checkpointer: BaseCheckpointSaver | None = None
+) -> CompiledStateGraph:
+    """토론 워크플로우 생성
+
+    - linear: control_manager → planning → researcher → critic → judge
+    - parallel: researcher 가 관점별 브랜치로 fan-out 되고 research_merge 에서 합류한 뒤 critic 으로 진행
+    - checkpointer 가 있으면 노드가 끝날 때마다 상태를 저장해 중단된 실행을 이어서 실행할 수 있다
+    - 계획/비평이 이전 라운드와 거의 같으면(수렴) planning/critic 에서 바로 종료한다
+    """
     # 그래프 생성
     workflow = StateGraph(AgentState)
 
+    def add_node(name: str, node) -> None:
+        # 노드별 실행 시간 지표와 트레이스 스팬을 기록
+        workflow.add_node(name, instrument_node(name, node))
+
     # 노드 추가
-    workflow.add_node("control_manager", control_manager_node)
-    workflow.add_node("planning", planning_node)
-    workflow.add_node("researcher", research_node)
-    workflow.add_node("critic", critic_node)
-    workflow.add_node("judge", judge_node)
+    add_node("control_manager", control_manager_node)
+    add_node("planning", planning_node)
+    add_node("critic", critic_node)
+    add_node("judge", judge_node)
 
     # 엣지 연결
     workflow.set_entry_point("control_manager")
     workflow.add_edge("control_manager", "planning")
-    workflow.add_edge("planning", "researcher")
-    workflow.add_edge("researcher", "critic")
-    workflow.add_edge("critic", "judge")
+    workflow.add_conditional_edges("planning", stop_if_converged("researcher"), ["researcher", END])
+    workflow.add_conditional_edges("critic", stop_if_converged("judge"), ["judge", END])
+
+    if topology == "parallel":
+        add_node("researcher", research_fan_out_node)
+        add_node("research_merge", research_merge_node)
+        branches = []
+        for perspective, title in RESEARCH_PERSPECTIVES.items():
+            branch = f"research_{perspective}"
+            add_node(branch, make_research_perspective_node(perspective, title))
+            workflow.add_edge("researcher", branch)
+            branches.append(branch)
+        # 모든 브랜치가 끝난 뒤에만 병합 노드가 실행된다
+        workflow.add_edge(branches, "research_merge")
+        workflow.add_edge("research_merge", "critic")
+    else:
+        add_node("researcher", research_node)
+        workflow.add_edge("researcher", "critic")
 
     # 조건부 엣지 연결
     workflow.add_conditional_edges("judge", router, {"planning": "planning", "research": "researcher", END: END})
 
-    return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer)
 
 
-def run_discussion(task: str, max_rounds: int = 2) -> Generator[dict, None, None]:
-    """토론 실행 및 실시간 결과 반환"""
-    app = create_discussion_workflow()
+class WorkflowRegistry:
+    """토폴로지별로 한 번만 컴파일한 토론 그래프를 모든 실행이 공유
+
+    실행 상태는 체크포인터에 thread_id(workflow_id)별로 저장되므로 동시 실행에 재사용해도 안전하다.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[WorkflowTopology, BaseCheckpointSaver | None], CompiledStateGraph] = (
+            create_discussion_workflow
+        ),
+        checkpointer: BaseCheckpointSaver | None = None,
+    ):
+        self.factory = factory
+        self.checkpointer = checkpointer
+        self._graphs: dict[WorkflowTopology, CompiledStateGraph] = {}
+
+    def get(self, topology: WorkflowTopology = "linear") -> CompiledStateGraph:
+        graph = self._graphs.get(topology)
+        if graph is None:
+            graph = self._graphs[topology] = self.factory(topology, self.checkpointer)
+        return graph
+
+    def use_checkpointer(self, checkpointer: BaseCheckpointSaver | None) -> None:
+        """체크포인터를 바꾸고 그래프를 다시 컴파일하도록 비운다 (서버/워커 시작 시 1회)"""
+        self.checkpointer = checkpointer
+        self.clear()
+
+    def warm_up(self) -> None:
+        """모든 토폴로지를 미리 컴파일"""
+        for topology in get_args(WorkflowTopology):
+            self.get(topology)
+
+    def clear(self) -> None:
+        self._graphs.clear()
+
+
+workflow_registry = WorkflowRegistry()
+
+
+async def warm_up() -> None:
+    """서버/워커 시작 시 그래프 컴파일과 토크나이저 로드를 미리 수행 (첫 요청의 지연 제거)"""
+    workflow_registry.warm_up()
+    # tiktoken 인코딩은 최초 1회 파일을 읽으므로(필요하면 내려받음) 이벤트 루프 밖에서 로드한다
+    await asyncio.to_thread(prompt_assembler.tokenizer.count, "warm-up")
+
+
+async def run_discussion(
+    task: str,
+    max_rounds: int = 2,
+    stream_tokens: bool = False,
+    topology: WorkflowTopology = "linear",
+    use_cache: bool = True,
+    usage: RunUsage | None = None,
+    workflow_id: str | None = None,
+    resume: bool = False,
+    speculate: bool | None = None,
+    judge_rationale: JudgeRationale | None = None,
+) -> AsyncGenerator[tuple[str, dict], None]:
+    """토론 실행 및 실시간 결과 반환 (비동기 스트림)
+
+    ("updates", 노드 하나가 변경한 상태 + node) 또는 stream_tokens 사용 시 ("custom", 토큰 델타) 튜플을
+    반환한다. 단계마다 전체 상태가 아닌 변경분만 전달되므로 라운드가 늘어도 단계당 비용이 일정하다.
+    resume 이면 체크포인트에 저장된 마지막 완료 노드 다음부터 이어서 실행한다 (체크포인트가 없으면 처음부터).
+    speculate 이면 판사가 결정하는 동안 다음 노드를 미리 실행한다 (None 이면 WORKFLOW_SPECULATION_ENABLED).
+    judge_rationale 은 structured 판사의 이유 생성 여부 (None 이면 JUDGE_RATIONALE).
+    """
+    app = workflow_registry.get(topology)
+    if speculate is None:
+        speculate = settings.WORKFLOW_SPECULATION_ENABLED
+    speculation = Speculation(SPECULATIVE_NODES[topology], usage) if speculate else None
 
     initial_state = {
         "task": task,
-        "history": [],
         "round_count": 1,
         "max_rounds": max_rounds,
         "plan": "",
         "research": "",
         "critique": "",
         "decision": "",
+        "research_notes": {},
     }
 
-    print("=" * 60)
-    print("🤖 AI 에이전트 토론 시스템 시작")
-    print("=" * 60)
+    # 토론 1회를 하나의 트레이스로 묶는다 (노드/LLM 스팬의 부모)
+    root_span, trace_context = start_trace(
+        "workflow.run",
+        {
+            "workflow.id": workflow_id or "",
+            "workflow.topology": topology,
+            "workflow.max_rounds": max_rounds,
+            "workflow.resume": resume,
+        },
+    )
 
     # 스트림으로 실행하며 각 단계 결과 반환
-    yield from app.stream(initial_state, stream_mode="values")
-
-    print("=" * 60)
-    print("✅ 토론 완료")
-    print("=" * 60)
+    config = {
+        "configurable": {
+            "stream_tokens": stream_tokens,
+            "use_cache": use_cache,
+            "usage": usage,
+            "workflow_id": workflow_id,
+            "task": task,
+            "trace_context": trace_context,
+            "speculation": speculation,
+            "judge_rationale": judge_rationale or settings.JUDGE_RATIONALE,
+            "topology": topology,
+            # 체크포인트 키 (workflow_id 가 없는 일회성 실행은 임의의 키)
+            "thread_id": workflow_id or uuid4().hex,
+        }
+    }
+    graph_input = initial_state
+    if resume and app.checkpointer is not None:
+        snapshot = await app.aget_state(config)
+        if snapshot.values or snapshot.next:
+            # 입력 없이 실행하면 마지막 체크포인트에서 이어서 진행한다
+            graph_input = None
+    try:
+        async for mode, chunk in app.astream(graph_input, config, stream_mode=["updates", "custom"]):
+            if mode == "custom":
+                yield mode, chunk
+                continue
+            for node, update in chunk.items():
+                # 이어서 실행할 때 체크포인트의 완료된 쓰기를 재생하며 붙는 메타데이터는 건너뛴다
+                if node.startswith("__"):
+                    continue
+                yield mode, {"node": node, **(update or {})}
+    finally:
+        if speculation is not None:
+            speculation.cancel()
+        if root_span is not None:
+            root_span.end()
@@ -0,0 +1,474 @@
+import asyncio
+import logging
+import os
+import socket
+from collections import Counter
+from collections.abc import AsyncIterator
+from datetime import datetime
+from functools import partial
+from typing import Any
+from uuid import uuid4
+
+from api.repositories.workflow_run import TERMINAL_STATUSES, WorkflowRunRepository
+from api.services.admission import AdmissionTicket
+from api.services.event_log import EventLog
+from api.services.sse_encoder import ArtifactTracker, encode_event
+from api.services.telemetry import ACTIVE_STREAMS, RUNNING_WORKFLOWS, WORKFLOW_RUNS
+from api.services.workflow import JudgeRationale, RunUsage, WorkflowTopology, expected_llm_calls, run_discussion
+
+logger = logging.getLogger(__name__)
+
+# 사용량 정보 없이 중단된 실행의 LLM 호출당 토큰 추정치
+DEFAULT_TOKENS_PER_CALL = 1500
+
+
+class WorkflowStopped(Exception):
+    """저장소에서 중단(stopped) 상태가 확인된 워크플로우"""
+
+
+# -------------------- 1. SSE 이벤트 포맷터 --------------------
+def format_sse_event(event_type: str, data: dict[str, Any]) -> str:
+    """SSE 이벤트 포맷팅"""
+    return encode_event(event_type, data)
+
+
+def format_logged_event(event_id: str, event: str) -> str:
+    """이벤트 기록의 id 를 붙여 SSE 이벤트로 전송 (클라이언트 재접속 시 Last-Event-ID 로 사용)"""
+    return f"id: {event_id}\n{event}"
+
+
+def format_agent_message(agent: str, message_type: str, content: str, workflow_id: str) -> str:
+    """에이전트 메시지를 SSE 형태로 포맷팅"""
+    event_data = {
+        "workflow_id": workflow_id,
+        "agent": agent,
+        "type": message_type,
+        "content": content,
+        "timestamp": datetime.now(),
+    }
+    return format_sse_event("agent_message", event_data)
+
+
+def format_agent_delta(agent: str, message_type: str, delta: str, workflow_id: str) -> str:
+    """토큰 단위 에이전트 출력을 SSE 형태로 포맷팅"""
+    event_data = {
+        "workflow_id": workflow_id,
+        "agent": agent,
+        "type": message_type,
+        "delta": delta,
+        "timestamp": datetime.now(),
+    }
+    return format_sse_event("agent_delta", event_data)
+
+
+def format_token_usage(usage: dict[str, Any], workflow_id: str) -> str:
+    """노드 1회 실행의 구간별 토큰 사용 내역을 SSE 형태로 포맷팅"""
+    event_data = {"workflow_id": workflow_id, **usage, "timestamp": datetime.now()}
+    return format_sse_event("token_usage", event_data)
+
+
+def format_status_update(
+    workflow_id: str, status: str, current_round: int, max_rounds: int, queue_position: int | None = None
+) -> str:
+    """상태 업데이트를 SSE 형태로 포맷팅 (queued 상태는 대기열 순번 포함)"""
+    event_data = {
+        "workflow_id": workflow_id,
+        "status": status,
+        "current_round": current_round,
+        "max_rounds": max_rounds,
+        "timestamp": datetime.now(),
+    }
+    if queue_position is not None:
+        event_data["queue_position"] = queue_position
+    return format_sse_event("status_update", event_data)
+
+
+# -------------------- 2. 워크플로우 실행 래퍼 --------------------
+def estimate_savings(
+    usage: RunUsage, topology: WorkflowTopology, max_rounds: int, judge_rationale: JudgeRationale | None = None
+) -> dict[str, int]:
+    """중단으로 실행되지 않은 LLM 호출 수와 토큰 수 추정 (max_rounds 까지 진행한다고 가정한 상한)
+
+    예상 호출 수는 판사 설정(결정/이유 호출, judge_rationale 이 None 이면 JUDGE_RATIONALE)을 반영하며,
+    크기에 따라 달라지는 요약 호출은 양쪽에서 모두 제외한다.
+    """
+    expected_calls = expected_llm_calls(topology, max_rounds, judge_rationale)
+    skipped_calls = max(0, expected_calls - (usage.llm_calls - usage.summary_calls) - usage.cached_calls)
+    tokens_per_call = usage.total_tokens / usage.llm_calls if usage.llm_calls else DEFAULT_TOKENS_PER_CALL
+    return {"llm_calls_skipped": skipped_calls, "estimated_tokens_saved": int(skipped_calls * tokens_per_call)}
+
+
+def new_run_owner() -> str:
+    """실행 소유자 id (어느 프로세스가 실행 중인지 운영 중에 알아볼 수 있도록 호스트/PID 포함)"""
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid4().hex[:8]}"
+
+
+async def keep_lease(repository: WorkflowRunRepository, workflow_id: str, owner: str) -> None:
+    """실행하는 동안 임대를 lease_seconds 의 1/3 간격으로 갱신 (노드 하나가 오래 걸려도 다른 프로세스가 가져가지 않는다)
+
+    소유권을 잃으면(다른 프로세스가 가져감/종료) 갱신을 멈추며, 이후의 실행 기록 갱신도 owner 조건으로 거절된다.
+    """
+    while True:
+        await asyncio.sleep(repository.lease_seconds / 3)
+        try:
+            if not await repository.renew_lease(workflow_id, owner):
+                return
+        except Exception:
+            logger.warning("워크플로우 임대 갱신 실패: %s", workflow_id, exc_info=True)
+
+
+async def run_workflow_with_sse(
+    repository: WorkflowRunRepository,
+    workflow_id: str,
+    task: str,
+    max_rounds: int,
+    stream_tokens: bool = False,
+    topology: WorkflowTopology = "linear",
+    use_cache: bool = True,
+    resume: bool = False,
+    owner: str | None = None,
+    speculate: bool | None = None,
+    judge_rationale: JudgeRationale | None = None,
+):
+    """워크플로우를 실행하고 SSE 이벤트 생성
+
+    실행 태스크가 취소되거나(진행 중인 LLM 요청도 함께 중단) 노드 사이에서 저장소의
+    중단 상태가 확인되면 stopped 이벤트와 절감량을 기록하고 종료한다.
+    resume 이면 다른 프로세스가 실행하다 멈춘 토론을 체크포인트에서 이어서 실행한다 (사용량/라운드도 이어받음).
+    owner 는 claim 으로 가져온 소유자 id 로, 실행하는 동안 임대를 갱신하고 모든 실행 기록 갱신을 이 소유자로 한정한다.
+    speculate/judge_rationale 은 요청별 설정으로, None 이면 전역 설정을 따른다 (run_discussion 참고).
+    """
+    usage = RunUsage()
+    artifacts = ArtifactTracker()
+    current_round = 1
+    completed = False
+    heartbeat = None
+    RUNNING_WORKFLOWS.inc()
+    try:
+        # 워크플로우 상태 초기화
+        now = datetime.now()
+        fields = {"status": "running", "last_updated": now}
+        if not resume:
+            fields.update(current_round=1, started_at=now)
+        run = await repository.update(workflow_id, fields, statuses=("pending", "running"), owner=owner)
+        if run is None:
+            raise WorkflowStopped(workflow_id)
+        if owner is not None:
+            heartbeat = asyncio.create_task(keep_lease(repository, workflow_id, owner))
+        if resume:
+            current_round = run.get("current_round", 1)
+            usage = RunUsage.from_dict(run.get("usage") or {})
+
+        # 시작 이벤트 전송
+        if resume:
+            yield format_status_update(workflow_id, "resumed", current_round, max_rounds)
+            yield format_agent_message("시스템", "info", f"워크플로우 '{workflow_id}' 이어서 실행", workflow_id)
+        else:
+            yield format_status_update(workflow_id, "started", 1, max_rounds)
+            yield format_agent_message("시스템", "info", f"워크플로우 '{workflow_id}' 시작", workflow_id)
+
+        # 워크플로우 실행
+        previous_round = current_round
+        async for mode, step_result in run_discussion(
+            task,
+            max_rounds,
+            stream_tokens,
+            topology,
+            use_cache,
+            usage,
+            workflow_id,
+            resume,
+            speculate=speculate,
+            judge_rationale=judge_rationale,
+        ):
+            # 토큰 델타, 노드 내부 메시지(thinking/request 등), 노드별 토큰 사용 내역은 도착 즉시 전달
+            if mode == "custom":
+                if step_result.get("event") == "token_usage":
+                    yield format_token_usage(
+                        {key: value for key, value in step_result.items() if key != "event"}, workflow_id
+                    )
+                elif step_result.get("event") == "agent_message":
+                    yield format_agent_message(
+                        step_result["agent"], step_result["type"], step_result["content"], workflow_id
+                    )
+                else:
+                    yield format_agent_delta(
+                        step_result["agent"], step_result["type"], step_result["delta"], workflow_id
+                    )
+                continue
+
+            # 라운드 변경 감지 (step_result 는 노드 하나의 변경분)
+            current_round = step_result.get("round_count", current_round)
+            if current_round > previous_round:
+                yield format_status_update(workflow_id, "round_changed", current_round, max_rounds)
+                previous_round = current_round
+
+            # 상태 업데이트 (다른 프로세스에서 중단된 경우 다음 노드로 진행하지 않는다)
+            run = await repository.update(
+                workflow_id,
+                {"current_round": current_round, "usage": usage.as_dict(), "last_updated": datetime.now()},
+                statuses=("running",),
+                owner=owner,
+            )
+            if run is None:
+                raise WorkflowStopped(workflow_id)
+
+            # 각 에이전트별 메시지 추출 및 전송 (직전과 같은 산출물은 다시 보내지 않는다)
+            if artifacts.changed("plan", step_result.get("plan")):
+                yield format_agent_message("기획자", "plan", step_result["plan"], workflow_id)
+
+            if artifacts.changed("research", step_result.get("research")):
+                yield format_agent_message("리서처", "research", step_result["research"], workflow_id)
+
+            if artifacts.changed("critique", step_result.get("critique")):
+                yield format_agent_message("비평가", "critique", step_result["critique"], workflow_id)
+
+            if step_result.get("decision"):
+                decision = step_result["decision"]
+                if decision == "finalize":
+                    yield format_agent_message("판사", "final_decision", "프로젝트 최종 승인!", workflow_id)
+                elif decision == "revise_plan":
+                    yield format_agent_message("판사", "decision", "계획을 수정하겠습니다.", workflow_id)
+                elif decision == "more_research":
+                    yield format_agent_message("판사", "decision", "추가 조사가 필요합니다.", workflow_id)
+
+            # 약간의 딜레이로 자연스러운 흐름 연출
+            await asyncio.sleep(0.1)
+
+        # 완료 상태 업데이트 (아직 running 일 때만, 이후의 취소 요청은 무시)
+        now = datetime.now()
+        fields = {"status": "completed", "completed_at": now, "usage": usage.as_dict(), "last_updated": now}
+        if await repository.update(workflow_id, fields, statuses=("running",), owner=owner) is None:
+            raise WorkflowStopped(workflow_id)
+        completed = True
+
+        WORKFLOW_RUNS.labels("completed").inc()
+        yield format_status_update(workflow_id, "completed", current_round, max_rounds)
+        if usage.converged_round:
+            yield format_agent_message(
+                "시스템",
+                "info",
+                f"라운드 {usage.converged_round}에서 수렴해 조기 종료 "
+                f"(예상 절감: 라운드 {usage.convergence_rounds_saved}회, 약 {usage.convergence_tokens_saved} 토큰)",
+                workflow_id,
+            )
+        yield format_agent_message("시스템", "info", "워크플로우 완료", workflow_id)
+
+    except (asyncio.CancelledError, WorkflowStopped):
+        if completed:
+            return
+
+        # 중단 처리: 취소 시점까지의 사용량과 절감량을 기록 (/stop 이 먼저 중단한 경우 포함, 다른 종료 상태는 유지)
+        savings = estimate_savings(usage, topology, max_rounds, judge_rationale)
+        now = datetime.now()
+        fields = {"status": "stopped", "usage": usage.as_dict(), "savings": savings, "last_updated": now}
+        if await repository.update(workflow_id, fields, statuses=("running", "stopped"), owner=owner) is None:
+            return
+        WORKFLOW_RUNS.labels("stopped").inc()
+
+        yield format_status_update(workflow_id, "stopped", current_round, max_rounds)
+        yield format_agent_message(
+            "시스템",
+            "info",
+            f"워크플로우 중단 (예상 절감: LLM 호출 {savings['llm_calls_skipped']}회, "
+            f"약 {savings['estimated_tokens_saved']} 토큰)",
+            workflow_id,
+        )
+
+    except Exception as e:
+        # 에러 처리
+        error_message = f"워크플로우 실행 중 오류 발생: {str(e)}"
+
+        # 만료(TTL)는 저장소가 처리하므로 별도의 정리 태스크가 필요 없다
+        fields = {"status": "failed", "error": str(e), "last_updated": datetime.now()}
+        await repository.update(workflow_id, fields, statuses=("pending", "running"), owner=owner)
+        WORKFLOW_RUNS.labels("failed").inc()
+
+        yield format_status_update(workflow_id, "failed", 0, max_rounds)
+        yield format_agent_message("시스템", "error", error_message, workflow_id)
+
+    finally:
+        if heartbeat is not None:
+            heartbeat.cancel()
+        RUNNING_WORKFLOWS.dec()
+
+
+# 이 프로세스에서 실행 중인 워크플로우 태스크 (태스크가 GC 되지 않도록 참조 유지, 취소 대상)
+running_workflows: dict[str, asyncio.Task] = {}
+# 이 프로세스에서 실행 중인 워크플로우별 SSE 시청자 수
+stream_viewers: Counter[str] = Counter()
+_pending_cancellations: set[asyncio.Task] = set()
+
+
+def register_running_workflow(workflow_id: str, task: asyncio.Task) -> None:
+    """취소 요청을 받을 수 있도록 실행 태스크 등록 (완료 시 자동 해제)"""
+    running_workflows[workflow_id] = task
+    task.add_done_callback(lambda _: running_workflows.pop(workflow_id, None))
+
+
+def cancel_running_workflow(workflow_id: str) -> bool:
+    """이 프로세스에서 실행 중인 워크플로우 취소. 실행 중이 아니면 False"""
+    task = running_workflows.get(workflow_id)
+    if task is None or task.done():
+        return False
+    return task.cancel()
+
+
+def start_workflow_run(
+    event_log: EventLog, repository: WorkflowRunRepository, workflow_id: str, owner: str | None = None
+) -> asyncio.Task:
+    """요청 연결과 분리된 태스크에서 워크플로우를 한 번 실행 (owner: 이미 claim 으로 가져온 실행의 소유자 id)"""
+    task = asyncio.create_task(record_workflow_events(event_log, repository, workflow_id, owner))
+    register_running_workflow(workflow_id, task)
+    return task
+
+
+def start_admitted_workflow_run(
+    ticket: AdmissionTicket, event_log: EventLog, repository: WorkflowRunRepository, workflow_id: str, max_rounds: int
+) -> asyncio.Task:
+    """입장 순서를 기다렸다가 실행하는 태스크 시작 (대기 중에도 /stop 과 연결 종료로 취소할 수 있다)"""
+    task = asyncio.create_task(run_when_admitted(ticket, event_log, repository, workflow_id, max_rounds))
+    register_running_workflow(workflow_id, task)
+    return task
+
+
+async def run_when_admitted(
+    ticket: AdmissionTicket, event_log: EventLog, repository: WorkflowRunRepository, workflow_id: str, max_rounds: int
+) -> None:
+    """대기열 순번을 queued 이벤트로 기록하며 기다리다가 입장하면 실행하고, 끝나면 자리를 반납"""
+    try:
+        position = None
+        while not ticket.admitted:
+            if ticket.position != position:
+                position = ticket.position
+                await event_log.append(
+                    workflow_id, format_status_update(workflow_id, "queued", 1, max_rounds, queue_position=position)
+                )
+            await ticket.wait_for_change()
+    except asyncio.CancelledError:
+        # 입장 전에 취소되면 LLM 호출 없이 중단으로 기록
+        ticket.release()
+        fields = {"status": "stopped", "usage": RunUsage().as_dict(), "last_updated": datetime.now()}
+        run = await repository.get(workflow_id)
+        if run is not None and "savings" not in run:
+            fields["savings"] = estimate_savings(RunUsage(), run["topology"], max_rounds, run.get("judge_rationale"))
+        await repository.update(workflow_id, fields, statuses=("pending", "stopped"))
+        await event_log.append(workflow_id, format_status_update(workflow_id, "stopped", 1, max_rounds))
+        await event_log.close(workflow_id)
+        raise
+
+    try:
+        await record_workflow_events(event_log, repository, workflow_id)
+    finally:
+        ticket.release()
+
+
+async def record_workflow_events(
+    event_log: EventLog, repository: WorkflowRunRepository, workflow_id: str, owner: str | None = None
+) -> None:
+    """워크플로우를 한 번 실행하고 생성된 SSE 이벤트를 모두 이벤트 기록에 추가
+
+    owner 가 없으면 실행을 이 프로세스 소유로 가져온다(claim). 다른 프로세스가 임대 중인 실행이면
+    그 프로세스의 이벤트 기록을 건드리지 않고 돌아간다.
+    """
+    if owner is None:
+        owner = new_run_owner()
+        run = await repository.claim(workflow_id, owner)
+        if run is None and await run_in_progress(repository, workflow_id):
+            return
+    else:
+        run = await repository.get(workflow_id)
+
+    try:
+        if run is None or run["status"] in TERMINAL_STATUSES:
+            return
+
+        # 이미 running 이면 다른 프로세스가 실행하다 멈춘 토론이므로 체크포인트에서 이어서 실행
+        events = run_workflow_with_sse(
+            repository,
+            workflow_id,
+            run["task"],
+            run["max_rounds"],
+            run["stream_tokens"],
+            run["topology"],
+            run["use_cache"],
+            resume=run["status"] == "running",
+            owner=owner,
+            # 이 필드가 생기기 전에 저장된 실행은 전역 설정을 따른다
+            speculate=run.get("speculate"),
+            judge_rationale=run.get("judge_rationale"),
+        )
+        try:
+            async for event in events:
+                await event_log.append(workflow_id, event)
+        except asyncio.CancelledError:
+            # 이벤트 기록 중에 취소된 경우에도 실행 래퍼가 중단 상태와 절감량을 기록하도록 전달
+            try:
+                event = await events.athrow(asyncio.CancelledError())
+            except StopAsyncIteration:
+                return
+            await event_log.append(workflow_id, event)
+            async for event in events:
+                await event_log.append(workflow_id, event)
+    finally:
+        await event_log.close(workflow_id)
+
+
+async def wait_for_stopped(
+    repository: WorkflowRunRepository, workflow_id: str, timeout: float, interval: float = 0.1
+) -> dict[str, Any] | None:
+    """중단된 실행이 절감량(savings)을 기록할 때까지 최대 timeout 초 대기 후 실행 문서 반환"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        run = await repository.get(workflow_id)
+        if run is None or "savings" in run or loop.time() >= deadline:
+            return run
+        await asyncio.sleep(interval)
+
+
+async def run_in_progress(repository: WorkflowRunRepository, workflow_id: str) -> bool:
+    """실행 기록이 남아 있고 종료되지 않았으며, running 이면 실행 프로세스의 임대가 유효한 경우 True"""
+    run = await repository.get(workflow_id)
+    if run is None or run["status"] in TERMINAL_STATUSES:
+        return False
+    if run["status"] != "running" or run.get("lease_expires_at") is None:
+        return True
+    return run["lease_expires_at"] >= datetime.now()
+
+
+async def stream_logged_events(
+    event_log: EventLog,
+    workflow_id: str,
+    last_event_id: str | None = None,
+    cancel_when_abandoned: float | None = None,
+    repository: WorkflowRunRepository | None = None,
+) -> AsyncIterator[str]:
+    """이벤트 기록을 last_event_id 이후부터 재전송하고 실시간 이벤트를 이어서 전송
+
+    cancel_when_abandoned(초)가 주어지면, 클라이언트 연결이 끊겨 이 프로세스의 시청자가
+    모두 떠난 뒤 그 시간 안에 아무도 다시 접속하지 않을 때 실행을 취소한다.
+    repository 가 주어지면 새 이벤트가 없는 동안 실행 기록을 확인해, 실행이 종료되었거나
+    실행 프로세스의 임대가 만료되면(프로세스 종료 등) 스트림을 끝낸다.
+    """
+    is_active = partial(run_in_progress, repository, workflow_id) if repository else None
+    stream_viewers[workflow_id] += 1
+    ACTIVE_STREAMS.inc()
+    try:
+        async for event_id, event in event_log.tail(workflow_id, last_event_id, is_active):
+            yield format_logged_event(event_id, event)
+    finally:
+        ACTIVE_STREAMS.dec()
+        stream_viewers[workflow_id] -= 1
+        if stream_viewers[workflow_id] <= 0:
+            del stream_viewers[workflow_id]
+            if cancel_when_abandoned is not None and workflow_id in running_workflows:
+                task = asyncio.create_task(_cancel_if_abandoned(workflow_id, cancel_when_abandoned))
+                _pending_cancellations.add(task)
+                task.add_done_callback(_pending_cancellations.discard)
+
+
+async def _cancel_if_abandoned(workflow_id: str, grace_seconds: float) -> None:
+    await asyncio.sleep(grace_seconds)
+    if stream_viewers[workflow_id] == 0:
+        cancel_running_workflow(workflow_id)
@@ -1,6 +1,7 @@
 import os
 from functools import lru_cache
 from pathlib import Path
+from typing import Literal
 
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -32,6 +33,16 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str
     POSTGRES_DB: str
     POSTGRES_URL: str
+    POSTGRES_POOL_SIZE: int = 10  # 프로세스당 유지하는 커넥션 수
+    POSTGRES_MAX_OVERFLOW: int = 20  # 부하 시 추가로 여는 커넥션 수
+    POSTGRES_POOL_RECYCLE_SECONDS: int = 1800
+
+    # 프롬프트 저장소 (postgres | memory)
+    PROMPT_STORE_BACKEND: Literal["postgres", "memory"] = "postgres"
+    PROMPT_BULK_BATCH_SIZE: int = 500  # 일괄 등록/내보내기 시 한 번에 처리하는 프롬프트 수
+    PROMPT_CACHE_BACKEND: Literal["none", "redis"] = "redis"  # 프롬프트 조회 캐시
+    PROMPT_CACHE_TTL_SECONDS: int = 300
+    PROMPT_CACHE_LOCK_SECONDS: float = 5.0  # 캐시 미스 시 DB 조회를 한 곳으로 모으는 잠금 유지 시간
 
     # MongoDB
     MONGODB_HOST: str
@@ -39,6 +50,7 @@ class Settings(BaseSettings):
     MONGODB_USERNAME: str
     MONGODB_PASSWORD: str
     MONGODB_URL: str
+    MONGODB_DATABASE: str = "daily_pilot"
 
     # Mongo Express (웹 UI용)
     ME_ADMIN: str
@@ -51,6 +63,103 @@ class Settings(BaseSettings):
 
     OPENAI_API_KEY: str
 
+    # 워크플로우 실행 기록 저장소 (mongodb | memory)
+    WORKFLOW_STORE_BACKEND: Literal["mongodb", "memory"] = "mongodb"
+    WORKFLOW_RUN_TTL_SECONDS: int = 1800  # 마지막 갱신 후 만료까지의 시간
+
+    # 워크플로우 작업 큐 / 워커 (redis | memory)
+    JOB_QUEUE_BACKEND: Literal["redis", "memory"] = "redis"
+    WORKER_PROCESSES: int = 1  # 워커 프로세스 수
+    WORKER_CONCURRENCY: int = 4  # 워커 프로세스당 동시에 실행하는 토론 수
+    WORKER_EMBEDDED: bool = False  # API 프로세스 안에서 워커를 함께 실행 (개발용)
+
+    # 워크플로우 SSE 이벤트 기록 (redis: Redis Streams | memory: 단일 프로세스용)
+    EVENT_LOG_BACKEND: Literal["redis", "memory"] = "redis"
+
+    # 워크플로우 중단
+    WORKFLOW_DISCONNECT_GRACE_SECONDS: float = 10.0  # 시청자가 모두 떠난 뒤 실행을 취소하기까지 대기 시간
+    WORKFLOW_STOP_WAIT_SECONDS: float = 3.0  # /stop 응답 전 실행 종료(절감량 기록)를 기다리는 최대 시간
+    SSE_COMPRESSION_ENABLED: bool = False  # Accept-Encoding 에 따라 SSE 스트림을 br/gzip 으로 압축
+
+    # /workflows/execute 입장 제어 (프로세스당 동시 실행 토론 수 제한과 대기열)
+    WORKFLOW_MAX_ACTIVE: int = 32
+    WORKFLOW_MAX_ACTIVE_PER_CLIENT: int = 4  # 클라이언트(X-Client-Id 또는 IP)별 동시 실행 수
+    WORKFLOW_ADMISSION_QUEUE_SIZE: int = 100  # 대기열이 가득 차면 503 + Retry-After 로 즉시 거절
+    WORKFLOW_ADMISSION_RETRY_AFTER_SECONDS: float = 10.0
+    WORKFLOW_BATCH_CONCURRENCY: int = 8  # /workflows/batch 요청 1건이 동시에 실행하는 토론 수
+    WORKFLOW_BATCH_MAX_ITEMS: int = 1000
+
+    # 토론 체크포인트 (노드별 상태 저장 후 다른 워커/프로세스에서 이어서 실행, mongodb | memory | none)
+    WORKFLOW_CHECKPOINT_BACKEND: Literal["mongodb", "memory", "none"] = "mongodb"
+    # 실행 프로세스의 소유 임대 시간 (실행 중 1/3 간격으로 갱신, 만료된 running 실행은 /stream 에서 이어서 실행)
+    WORKFLOW_RUN_LEASE_SECONDS: float = 30.0
+
+    # 판사가 결정하는 동안 예상되는 다음 노드(계획 수정/추가 조사)를 미리 실행 (예측이 틀리면 토큰을 낭비한다)
+    WORKFLOW_SPECULATION_ENABLED: bool = False
+
+    # 수렴 조기 종료 (계획/비평이 이전 라운드와 거의 같으면 남은 단계를 건너뛰고 마무리)
+    WORKFLOW_CONVERGENCE_ENABLED: bool = False
+    WORKFLOW_CONVERGENCE_THRESHOLD: float = 0.95  # 단어 단위 difflib 유사도가 이 값 이상이면 수렴
+
+    # 판사 결정 방식 (text: 긴 설명 끝의 "DECISION:" 줄 | structured: JSON 결정을 먼저 받고 이유는 따로 생성)
+    JUDGE_DECISION_MODE: Literal["text", "structured"] = "text"
+    JUDGE_DECISION_MAX_TOKENS: int = 80  # structured 결정 호출의 최대 출력 토큰
+    JUDGE_RATIONALE: Literal["stream", "skip"] = "stream"  # structured 결정 이유 생성 여부 (일괄 실행은 skip)
+
+    # 토론 대화 기록 (최근 발언 창 + 이전 발언 요약)
+    HISTORY_WINDOW_TURNS: int = 8  # 원문으로 유지하는 최근 발언 수
+    HISTORY_TURN_MAX_CHARS: int = 2000  # 발언 1개당 보관하는 최대 글자 수
+    HISTORY_SUMMARY_MAX_CHARS: int = 2000  # 이전 발언 요약의 최대 글자 수
+
+    # 노드 프롬프트 토큰 예산 (예산을 넘는 구간은 compaction 방식으로 압축, 0 이면 예산 없음)
+    PROMPT_TOKEN_BUDGETS: dict[str, int] = {}  # 노드 이름 → 예산 (예: {"critic": 2000, "judge": 2000})
+    PROMPT_TOKEN_BUDGET_DEFAULT: int = 0  # 예산이 지정되지 않은 노드 (병렬 리서치 브랜치 등)
+    PROMPT_COMPACTION: Literal["truncate", "summary"] = "truncate"  # summary: LLM 요약 (캐시됨)
+
+    # LLM HTTP 연결 풀 (모든 토론 실행이 공유)
+    LLM_HTTP_MAX_CONNECTIONS: int = 100
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    LLM_TIMEOUT_SECONDS: float = 60.0
+
+    # LLM 공급자 (openai | fake: 비용 없는 부하 테스트/개발용 가짜 모델)
+    LLM_PROVIDER: Literal["openai", "fake"] = "openai"
+    FAKE_LLM_LATENCY_SECONDS: float = 0.5  # 첫 토큰까지의 평균 지연
+    FAKE_LLM_LATENCY_DISTRIBUTION: Literal["fixed", "uniform", "exponential", "lognormal"] = "fixed"
+    FAKE_LLM_TOKEN_INTERVAL_SECONDS: float = 0.01  # 이후 토큰 간격
+    FAKE_LLM_RESPONSE_TOKENS: int = 50
+    FAKE_LLM_DECISIONS: list[str] = ["FINALIZE"]  # 라운드별 판사 결정 (예: ["REVISE_PLAN", "FINALIZE"])
+    FAKE_LLM_SEED: int | None = 0
+
+    # LLM 게이트웨이 (동시 실행 / 분당 처리량 제한, 재시도, 노드별 모델 선택)
+    LLM_NODE_MODELS: dict[str, str] = {}  # 노드 이름 → 모델 (예: {"judge": "gpt-4o", "researcher": "gpt-4o-mini"})
+    LLM_GLOBAL_CONCURRENCY: int = 32  # 프로세스 전체 동시 LLM 호출 수
+    LLM_MODEL_CONCURRENCY: int = 16  # 모델별 동시 LLM 호출 수
+    LLM_REQUESTS_PER_MINUTE: int = 3000  # 모델별 분당 요청 수 (0 이면 제한 없음)
+    LLM_TOKENS_PER_MINUTE: int = 160000  # 모델별 분당 토큰 수 (0 이면 제한 없음)
+    LLM_MODEL_LIMITS: dict[str, dict[str, int]] = {}  # 모델별 개별 제한 (max_concurrency, *_per_minute)
+    LLM_EXPECTED_OUTPUT_TOKENS: int = 500  # 분당 토큰 제한 계산 시 응답 1개의 예상 토큰 수
+    LLM_MAX_RETRIES: int = 4
+    LLM_RETRY_BASE_SECONDS: float = 0.5
+    LLM_RETRY_MAX_SECONDS: float = 20.0
+
+    # OpenTelemetry 트레이스 내보내기 (OTLP/HTTP, 수집기 주소는 OTEL_EXPORTER_OTLP_ENDPOINT)
+    OTEL_ENABLED: bool = False
+    WORKER_METRICS_PORT: int | None = None  # 워커 프로세스 /metrics 포트 (프로세스마다 +1)
+
+    # 에이전트 이벤트 로그 싱크 (이벤트 버스를 구독해 배치 단위로 기록)
+    EVENT_SINK_ENABLED: bool = True
+    EVENT_SINK_BATCH_SIZE: int = 100
+    EVENT_SINK_FLUSH_SECONDS: float = 1.0
+    EVENT_BUS_QUEUE_SIZE: int = 10000  # 구독자 큐 크기 (가득 차면 오래된 이벤트부터 버림)
+
+    # LLM 응답 캐시 (none | memory | redis)
+    LLM_CACHE_BACKEND: Literal["none", "memory", "redis"] = "memory"
+    LLM_CACHE_TTL_SECONDS: int = 3600
+    LLM_CACHE_MAX_ENTRIES: int = 1024
+    LLM_CACHE_SEMANTIC: bool = False  # 임베딩 유사도로 유사 과제까지 매칭 (인덱스는 프로세스별 메모리, numpy 필요)
+    LLM_CACHE_SEMANTIC_THRESHOLD: float = 0.95
+
 
 @lru_cache
 def get_settings():
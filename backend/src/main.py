@@ -1,10 +1,28 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from api.dependencies import (
+    get_cancellation_broker,
+    get_checkpointer,
+    get_event_log,
+    get_job_queue,
+    get_postgres_engine,
+    get_workflow_run_repository,
+)
+from api.repositories.checkpoint import MongoCheckpointSaver
+from api.repositories.prompt import create_prompt_tables
 from api.routers.v1 import api_router
+from api.services import workflow
+from api.services.event_bus import create_log_sink
+from api.services.telemetry import configure_tracing, create_metrics_app
+from api.services.worker import WorkflowWorker
 from config.settings import get_settings
 
 settings = get_settings()
+configure_tracing(settings, "daily-pilot-api")
 
 SWAGGER_TITLE = "Daily Pilot API"
 SWAGGER_DESCRIPTION = "Daily Pilot API Documentation"
@@ -14,12 +32,60 @@ SWAGGER_DOCS_URL = "/docs"
 SWAGGER_REDOC_URL = "/redoc"
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """애플리케이션 시작/종료 훅"""
+    # 워크플로우 실행 기록 인덱스(TTL 포함) 생성
+    repository = get_workflow_run_repository()
+    await repository.ensure_indexes()
+
+    # 프롬프트 테이블 및 검색 인덱스 생성
+    if settings.PROMPT_STORE_BACKEND == "postgres":
+        await create_prompt_tables(get_postgres_engine())
+
+    # 노드별 상태를 체크포인터에 저장해 중단된 토론을 다른 프로세스에서 이어서 실행할 수 있게 한다
+    checkpointer = get_checkpointer()
+    if isinstance(checkpointer, MongoCheckpointSaver):
+        await checkpointer.ensure_indexes()
+    workflow.workflow_registry.use_checkpointer(checkpointer)
+
+    # 토론 그래프 컴파일 / 토크나이저 로드를 첫 요청 전에 수행
+    await workflow.warm_up()
+
+    # 다른 프로세스에서 요청된 중단을 이 프로세스의 실행 태스크에 전달
+    cancellation_task = asyncio.create_task(get_cancellation_broker().listen())
+
+    # 노드 내부 메시지를 배치로 기록하는 로그 싱크
+    sink = create_log_sink(settings)
+    sink_task = asyncio.create_task(sink.run()) if sink is not None else None
+
+    # 개발 환경에서는 별도 워커 프로세스 없이 API 프로세스 안에서 작업 큐를 처리할 수 있다
+    worker = worker_task = None
+    if settings.WORKER_EMBEDDED:
+        worker = WorkflowWorker(get_job_queue(), repository, get_event_log(), settings.WORKER_CONCURRENCY)
+        worker_task = asyncio.create_task(worker.run())
+
+    yield
+
+    if worker is not None:
+        worker.stop()
+        await worker_task
+    cancellation_task.cancel()
+    if sink_task is not None:
+        # 취소되면 남은 이벤트를 기록하고 종료한다
+        sink_task.cancel()
+        await asyncio.gather(sink_task, return_exceptions=True)
+    await get_postgres_engine().dispose()
+    await workflow.llm_http_client.aclose()
+
+
 app = FastAPI(
     title=SWAGGER_TITLE,
     description=SWAGGER_DESCRIPTION,
     version=SWAGGER_VERSION,
     docs_url=SWAGGER_URL,
     redoc_url=SWAGGER_REDOC_URL,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -31,3 +97,6 @@ app.add_middleware(
 )
 
 app.include_router(api_router)
+
+# Prometheus 지표 (노드/LLM 호출 지연, 토큰, 캐시, 재시도, 대기 시간, 활성 스트림)
+app.mount("/metrics", create_metrics_app())
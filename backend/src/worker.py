@@ -0,0 +1,115 @@
+"""워크플로우 워커 실행
+
+/workflows/start 로 등록된 작업을 API 서버와 독립적으로 실행한다.
+
+    python src/worker.py                                # WORKER_PROCESSES, WORKER_CONCURRENCY 설정 사용
+    python src/worker.py --processes 4 --concurrency 8  # 프로세스 4개 x 프로세스당 토론 8개
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import signal
+
+from api.dependencies import (
+    get_cancellation_broker,
+    get_checkpointer,
+    get_event_log,
+    get_job_queue,
+    get_workflow_run_repository,
+)
+from api.repositories.checkpoint import MongoCheckpointSaver
+from api.services import workflow
+from api.services.event_bus import create_log_sink
+from api.services.job_queue import RedisJobQueue
+from api.services.telemetry import configure_tracing, start_metrics_server
+from api.services.worker import WorkflowWorker
+from config.settings import get_settings
+
+logger = logging.getLogger("worker")
+
+
+async def serve(concurrency: int) -> None:
+    repository = get_workflow_run_repository()
+    await repository.ensure_indexes()
+    checkpointer = get_checkpointer()
+    if isinstance(checkpointer, MongoCheckpointSaver):
+        await checkpointer.ensure_indexes()
+    workflow.workflow_registry.use_checkpointer(checkpointer)
+    await workflow.warm_up()
+    worker = WorkflowWorker(get_job_queue(), repository, get_event_log(), concurrency)
+
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, worker.stop)
+
+    cancellation_task = asyncio.create_task(get_cancellation_broker().listen())
+    sink = create_log_sink(get_settings())
+    sink_task = asyncio.create_task(sink.run()) if sink is not None else None
+    try:
+        await worker.run()
+    finally:
+        cancellation_task.cancel()
+        if sink_task is not None:
+            sink_task.cancel()
+            await asyncio.gather(sink_task, return_exceptions=True)
+        await workflow.llm_http_client.aclose()
+
+
+async def recover() -> None:
+    """비정상 종료된 워커가 처리 중이던 작업을 대기열로 되돌린다"""
+    queue = get_job_queue()
+    if isinstance(queue, RedisJobQueue):
+        moved = await queue.requeue_processing()
+        logger.info("처리 중이던 작업 %d개를 다시 등록했습니다", moved)
+
+
+def run_process(concurrency: int, index: int = 0) -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(processName)s %(levelname)s %(message)s")
+    settings = get_settings()
+    configure_tracing(settings, "daily-pilot-worker")
+    # 워커 프로세스마다 별도 포트로 /metrics 를 노출 (WORKER_METRICS_PORT + 프로세스 번호)
+    if settings.WORKER_METRICS_PORT is not None:
+        start_metrics_server(settings.WORKER_METRICS_PORT + index)
+    asyncio.run(serve(concurrency))
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Daily Pilot workflow worker")
+    parser.add_argument("--processes", type=int, default=settings.WORKER_PROCESSES, help="워커 프로세스 수")
+    parser.add_argument(
+        "--concurrency", type=int, default=settings.WORKER_CONCURRENCY, help="프로세스당 동시 실행 토론 수"
+    )
+    parser.add_argument(
+        "--recover", action="store_true", help="시작 전 처리 중 목록의 작업을 대기열로 복구 (모든 워커 중단 후 사용)"
+    )
+    args = parser.parse_args()
+
+    if args.recover:
+        asyncio.run(recover())
+
+    if args.processes <= 1:
+        run_process(args.concurrency)
+        return
+
+    processes = [
+        multiprocessing.Process(target=run_process, args=(args.concurrency, index), name=f"workflow-worker-{index}")
+        for index in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+
+    # 상위 프로세스가 받은 종료 신호를 워커 프로세스로 전달
+    def terminate(signum, frame):
+        for process in processes:
+            process.terminate()
+
+    signal.signal(signal.SIGTERM, terminate)
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,18 @@
 # backend/tests/conftest.py
 
+import asyncio
+
 import psycopg2
+import pytest
 import pytest_asyncio
 import redis.asyncio as redis
+from langchain_core.messages import AIMessage, AIMessageChunk
 from motor.motor_asyncio import AsyncIOMotorClient
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
+from api.services import workflow
 from src.config.settings import get_settings
 
 settings = get_settings()
@@ -82,3 +87,34 @@ async def redis_client():
         await client.flushdb()
     except RuntimeError:
         pass
+
+
+class StubLLM:
+    """OpenAI 호출 없이 고정 지연 후 응답하는 테스트용 LLM"""
+
+    def __init__(self, latency: float = 0.05, decision: str = "FINALIZE"):
+        self.latency = latency
+        self.decision = decision
+        self.calls = 0
+
+    async def ainvoke(self, prompt: str) -> AIMessage:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return AIMessage(content=self._content())
+
+    async def astream(self, prompt: str):
+        self.calls += 1
+        for token in self._content().split(" "):
+            await asyncio.sleep(self.latency / 10)
+            yield AIMessageChunk(content=token + " ")
+
+    def _content(self) -> str:
+        return f"응답 {self.calls}\nDECISION: {self.decision}"
+
+
+@pytest.fixture
+def stub_llm(monkeypatch):
+    llm = StubLLM()
+    monkeypatch.setattr(workflow, "llm", llm)
+    monkeypatch.setattr(workflow, "response_cache", None)
+    return llm
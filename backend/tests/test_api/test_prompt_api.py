@@ -0,0 +1,94 @@
+import httpx
+import pytest
+
+from api.dependencies import get_prompt_repository
+from api.repositories.prompt import InMemoryPromptRepository
+from main import app
+
+
+@pytest.fixture
+async def client():
+    repository = InMemoryPromptRepository()
+    app.dependency_overrides[get_prompt_repository] = lambda: repository
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+async def test_prompt_crud(client):
+    created = (await client.post("/api/v1/prompts/", json={"title": "제목", "content": "내용"})).json()["data"]
+
+    response = await client.put(f"/api/v1/prompts/{created['id']}", json={"description": "설명"})
+    assert response.json()["data"]["description"] == "설명"
+    assert (await client.get(f"/api/v1/prompts/{created['id']}")).json()["data"]["title"] == "제목"
+
+    assert (await client.delete(f"/api/v1/prompts/{created['id']}")).status_code == 200
+    assert (await client.get(f"/api/v1/prompts/{created['id']}")).status_code == 404
+
+
+async def test_page_response_includes_cursor_for_next_page(client):
+    for index in range(3):
+        await client.post("/api/v1/prompts/", json={"title": f"제목 {index}", "content": "내용"})
+
+    first = (await client.get("/api/v1/prompts/", params={"size": 2})).json()
+    cursor = first["pagination"]["next_cursor"]
+    second = (await client.get("/api/v1/prompts/", params={"size": 2, "cursor": cursor})).json()
+
+    assert first["pagination"]["total"] == 3
+    assert [prompt["title"] for prompt in first["data"] + second["data"]] == ["제목 2", "제목 1", "제목 0"]
+    assert second["pagination"]["has_next"] is False
+
+
+async def test_search_and_invalid_cursor(client):
+    await client.post("/api/v1/prompts/", json={"title": "주간 회고", "content": "내용"})
+    await client.post("/api/v1/prompts/", json={"title": "일일 계획", "content": "회고 없이"})
+    await client.post("/api/v1/prompts/", json={"title": "기타", "content": "내용"})
+
+    response = await client.get("/api/v1/prompts/search", params={"q": "회고"})
+
+    assert len(response.json()["data"]) == 2
+    assert (await client.get("/api/v1/prompts/", params={"cursor": "broken"})).status_code == 400
+
+
+async def test_bulk_upsert_reports_per_item_results(client):
+    existing = (await client.post("/api/v1/prompts/", json={"title": "기존", "content": "내용"})).json()["data"]
+    items = [
+        {"title": "새 프롬프트", "content": "내용"},
+        {"id": existing["id"], "title": "수정된 기존", "content": "내용"},
+        {"title": "내용 누락"},
+    ]
+
+    response = await client.post("/api/v1/prompts/bulk", json={"items": items})
+
+    data = response.json()["data"]
+    assert (data["created"], data["updated"], data["failed"]) == (1, 1, 1)
+    assert [result["status"] for result in data["results"]] == ["created", "updated", "failed"]
+    assert "content" in data["results"][2]["error"]
+    assert (await client.get(f"/api/v1/prompts/{existing['id']}")).json()["data"]["title"] == "수정된 기존"
+
+
+async def test_bulk_ndjson_import_and_export_round_trip(client):
+    lines = [f'{{"id": "p-{index}", "title": "제목 {index}", "content": "내용"}}' for index in range(5)]
+    body = "\n".join(lines + ["not json", lines[0].replace("제목 0", "다시 제목 0")]) + "\n"
+
+    response = await client.post(
+        "/api/v1/prompts/bulk", content=body.encode(), headers={"Content-Type": "application/x-ndjson"}
+    )
+    data = response.json()["data"]
+    assert (data["created"], data["updated"], data["failed"]) == (5, 1, 1)
+
+    exported = (await client.get("/api/v1/prompts/export")).text.splitlines()
+    assert len(exported) == 5
+    assert any("다시 제목 0" in line for line in exported)
+
+    csv_export = await client.get("/api/v1/prompts/export", params={"format": "csv"})
+    assert csv_export.headers["content-type"].startswith("text/csv")
+    assert csv_export.text.splitlines()[0] == "id,title,content,description,created_at,updated_at"
+    assert len(csv_export.text.splitlines()) == 6
+
+
+async def test_cache_stats_reports_disabled_without_cache(client):
+    response = await client.get("/api/v1/prompts/cache/stats")
+
+    assert response.json() == {"enabled": False}
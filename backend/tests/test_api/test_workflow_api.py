@@ -0,0 +1,253 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from langgraph.checkpoint.memory import InMemorySaver
+
+from api.dependencies import (
+    get_admission_controller,
+    get_cancellation_broker,
+    get_event_log,
+    get_job_queue,
+    get_workflow_run_repository,
+)
+from api.repositories.workflow_run import InMemoryWorkflowRunRepository
+from api.routers.v1.endpoints import workflow as workflow_endpoint
+from api.services import workflow as workflow_service
+from api.services import workflow_runner
+from api.services.admission import AdmissionController
+from api.services.cancellation import LocalCancellationBroker
+from api.services.event_log import InMemoryEventLog
+from api.services.job_queue import InMemoryJobQueue
+from api.services.workflow_runner import record_workflow_events, start_workflow_run
+from main import app
+
+
+@pytest.fixture
+def repository():
+    repository = InMemoryWorkflowRunRepository()
+    event_log = InMemoryEventLog()
+    app.dependency_overrides[get_workflow_run_repository] = lambda: repository
+    app.dependency_overrides[get_event_log] = lambda: event_log
+    app.dependency_overrides[get_cancellation_broker] = LocalCancellationBroker
+    yield repository
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def queue():
+    queue = InMemoryJobQueue()
+    app.dependency_overrides[get_job_queue] = lambda: queue
+    return queue
+
+
+@pytest.fixture
+async def client(repository):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+async def test_execute_streams_and_records_run(client, stub_llm, repository):
+    async with client.stream(
+        "POST", "/api/v1/workflows/execute", json={"task": "API 과제", "max_rounds": 1}
+    ) as response:
+        body = "".join([line + "\n" async for line in response.aiter_lines()])
+
+    assert response.status_code == 200
+    assert "event: agent_message" in body
+    assert '"status":"completed"' in body
+
+    listing = (await client.get("/api/v1/workflows/list")).json()
+    assert listing["total"] == 1
+    workflow_id = listing["workflows"][0]["workflow_id"]
+
+    status_response = await client.get(f"/api/v1/workflows/status/{workflow_id}")
+    assert status_response.json()["status"] == "completed"
+
+
+async def test_status_of_unknown_workflow_is_404(client):
+    response = await client.get("/api/v1/workflows/status/unknown")
+
+    assert response.status_code == 404
+
+
+async def test_start_enqueues_pending_run(client, repository, queue):
+    response = await client.post("/api/v1/workflows/start", json={"task": "큐 과제"})
+
+    workflow_id = response.json()["workflow_id"]
+    assert response.json()["status"] == "pending"
+    assert (await queue.dequeue(timeout=0))["workflow_id"] == workflow_id
+    assert (await repository.get(workflow_id))["queued"] is True
+
+
+async def test_queued_run_uses_per_request_judge_and_speculation_options(client, repository, queue, monkeypatch):
+    calls = []
+
+    async def fake_run_discussion(*args, **kwargs):
+        calls.append(kwargs)
+        yield "updates", {"node": "judge_node", "decision": "finalize"}
+
+    monkeypatch.setattr(workflow_runner, "run_discussion", fake_run_discussion)
+    response = await client.post(
+        "/api/v1/workflows/start", json={"task": "옵션 과제", "speculate": True, "judge_rationale": "skip"}
+    )
+    workflow_id = response.json()["workflow_id"]
+
+    # 워커가 큐에서 꺼내 실행하는 경로
+    await record_workflow_events(InMemoryEventLog(), repository, workflow_id)
+
+    assert calls == [{"speculate": True, "judge_rationale": "skip"}]
+    assert (await repository.get(workflow_id))["status"] == "completed"
+
+
+async def test_stream_replays_events_after_last_event_id_without_rerunning(client, stub_llm):
+    async with client.stream(
+        "POST", "/api/v1/workflows/execute", json={"task": "재접속 과제", "max_rounds": 1}
+    ) as response:
+        lines = [line async for line in response.aiter_lines()]
+    event_ids = [line.removeprefix("id: ") for line in lines if line.startswith("id: ")]
+    workflow_id = (await client.get("/api/v1/workflows/list")).json()["workflows"][0]["workflow_id"]
+    calls = stub_llm.calls
+
+    async with client.stream(
+        "GET", f"/api/v1/workflows/stream/{workflow_id}", headers={"Last-Event-ID": event_ids[2]}
+    ) as response:
+        replayed = [line.removeprefix("id: ") async for line in response.aiter_lines() if line.startswith("id: ")]
+
+    assert event_ids == sorted(event_ids, key=int)
+    assert replayed == event_ids[3:]
+    assert stub_llm.calls == calls
+
+
+async def test_stop_cancels_running_workflow_and_reports_savings(client, stub_llm, repository, queue):
+    stub_llm.latency = 0.5
+    workflow_id = (await client.post("/api/v1/workflows/start", json={"task": "중단 과제"})).json()["workflow_id"]
+    start_workflow_run(InMemoryEventLog(), repository, workflow_id)
+    while stub_llm.calls == 0:
+        await asyncio.sleep(0.01)
+
+    response = await client.delete(f"/api/v1/workflows/stop/{workflow_id}")
+
+    assert response.status_code == 200
+    assert response.json()["savings"]["llm_calls_skipped"] == 8
+    assert stub_llm.calls == 1
+
+    response = await client.delete(f"/api/v1/workflows/stop/{workflow_id}")
+    assert response.status_code == 409
+
+
+async def test_metrics_endpoint_exposes_node_and_llm_metrics(client, stub_llm):
+    async with client.stream(
+        "POST", "/api/v1/workflows/execute", json={"task": "지표 과제", "max_rounds": 1}
+    ) as response:
+        async for _ in response.aiter_lines():
+            pass
+
+    response = await client.get("/metrics/")
+
+    assert response.status_code == 200
+    assert 'workflow_node_duration_seconds_count{node="judge",status="ok"}' in response.text
+    assert "llm_tokens_total" in response.text
+    assert "workflow_active_streams" in response.text
+
+
+async def test_execute_compresses_stream_when_enabled(client, stub_llm, monkeypatch):
+    monkeypatch.setattr(workflow_endpoint.settings, "SSE_COMPRESSION_ENABLED", True)
+
+    async with client.stream(
+        "POST",
+        "/api/v1/workflows/execute",
+        json={"task": "압축 과제", "max_rounds": 1},
+        headers={"Accept-Encoding": "gzip"},
+    ) as response:
+        body = "".join([line + "\n" async for line in response.aiter_lines()])
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert '"status":"completed"' in body
+
+
+async def test_stream_resumes_stalled_run_from_checkpoint(client, stub_llm, repository, monkeypatch):
+    monkeypatch.setattr(
+        workflow_service, "workflow_registry", workflow_service.WorkflowRegistry(checkpointer=InMemorySaver())
+    )
+    # 다른 프로세스가 기획/리서치까지 실행하고 종료된 상태
+    steps = workflow_service.run_discussion("재개 과제", 1, workflow_id="wf-stalled")
+    async for mode, step in steps:
+        if mode == "updates" and step["node"] == "researcher":
+            break
+    await steps.aclose()
+    await repository.create(
+        "wf-stalled",
+        {
+            "task": "재개 과제",
+            "max_rounds": 1,
+            "stream_tokens": False,
+            "topology": "linear",
+            "use_cache": False,
+            "status": "running",
+            "current_round": 1,
+            "usage": {"llm_calls": 2},
+            "last_updated": datetime.now() - timedelta(minutes=10),
+            "owner": "stopped-worker",
+            "lease_expires_at": datetime.now() - timedelta(seconds=1),
+        },
+    )
+
+    async with client.stream("GET", "/api/v1/workflows/stream/wf-stalled") as response:
+        body = "".join([line + "\n" async for line in response.aiter_lines()])
+
+    assert '"status":"resumed"' in body
+    assert '"status":"completed"' in body
+    assert stub_llm.calls == 4
+    run = await repository.get("wf-stalled")
+    assert run["status"] == "completed"
+    assert run["usage"]["llm_calls"] == 4
+    assert run["owner"] != "stopped-worker"
+
+
+async def test_execute_queues_then_rejects_when_over_capacity(client, stub_llm):
+    stub_llm.latency = 0.1
+    admission = AdmissionController(max_active=1, max_active_per_client=1, max_queue=1, retry_after_seconds=7)
+    app.dependency_overrides[get_admission_controller] = lambda: admission
+
+    async def execute(task: str) -> str:
+        async with client.stream("POST", "/api/v1/workflows/execute", json={"task": task, "max_rounds": 1}) as response:
+            return "".join([line + "\n" async for line in response.aiter_lines()])
+
+    running = asyncio.create_task(execute("첫 번째"))
+    while admission.active == 0:
+        await asyncio.sleep(0.01)
+    queued = asyncio.create_task(execute("두 번째"))
+    while admission.queued == 0:
+        await asyncio.sleep(0.01)
+
+    rejected = await client.post("/api/v1/workflows/execute", json={"task": "세 번째", "max_rounds": 1})
+
+    assert rejected.status_code == 503
+    assert rejected.headers["retry-after"] == "7"
+    assert '"status":"queued"' not in await running
+    body = await queued
+    assert '"status":"queued"' in body and '"queue_position":1' in body
+    assert body.index('"status":"queued"') < body.index('"status":"started"')
+    assert '"status":"completed"' in body
+    assert admission.active == 0
+
+
+async def test_batch_streams_ndjson_results_and_summary(client, stub_llm, repository):
+    items = [{"task": "일괄 과제 A", "max_rounds": 1}, {"task": "일괄 과제 B", "max_rounds": 1}]
+    response = await client.post("/api/v1/workflows/batch", json={"items": [*items, items[0]], "concurrency": 2})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    records = [json.loads(line) for line in response.text.splitlines()]
+    results, summary = records[:-1], records[-1]
+    assert sorted(record["index"] for record in results) == [0, 1, 2]
+    assert all(record["status"] == "completed" and record["decision"] == "finalize" for record in results)
+    assert summary["deduplicated"] == 1
+    assert stub_llm.calls == 8
+    runs, total = await repository.list_runs(status="completed")
+    assert total == 2
+    assert all(run["workflow_id"].startswith(summary["batch_id"]) for run in runs)
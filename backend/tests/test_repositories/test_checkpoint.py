@@ -0,0 +1,35 @@
+import pytest
+
+from api.repositories.checkpoint import MongoCheckpointSaver
+from api.services import workflow
+
+
+@pytest.mark.asyncio
+@pytest.mark.connection
+async def test_mongo_checkpointer_resumes_debate(mongo_collection, stub_llm, monkeypatch):
+    writes = mongo_collection.database["test_checkpoint_writes"]
+    await writes.delete_many({})
+    saver = MongoCheckpointSaver(mongo_collection, writes, ttl_seconds=60)
+    await saver.ensure_indexes()
+    monkeypatch.setattr(workflow, "workflow_registry", workflow.WorkflowRegistry(checkpointer=saver))
+
+    steps = workflow.run_discussion("체크포인트 과제", 1, workflow_id="wf-mongo")
+    async for mode, step in steps:
+        if mode == "updates" and step["node"] == "researcher":
+            break
+    await steps.aclose()
+
+    checkpoint = await saver.aget_tuple({"configurable": {"thread_id": "wf-mongo"}})
+    assert checkpoint.checkpoint["channel_values"]["plan"]
+    assert len([item async for item in saver.alist({"configurable": {"thread_id": "wf-mongo"}}, limit=2)]) == 2
+
+    nodes = [
+        step["node"]
+        async for mode, step in workflow.run_discussion("체크포인트 과제", 1, workflow_id="wf-mongo", resume=True)
+        if mode == "updates"
+    ]
+    assert nodes == ["critic", "judge"]
+
+    await saver.adelete_thread("wf-mongo")
+    assert await saver.aget_tuple({"configurable": {"thread_id": "wf-mongo"}}) is None
+    await writes.drop()
@@ -0,0 +1,71 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from api.repositories.prompt import InMemoryPromptRepository, SqlPromptRepository, create_prompt_tables, decode_cursor
+from api.schemas.prompt import PromptBulkItem, PromptCreate
+
+
+async def seed(repository, count: int) -> list[str]:
+    ids = []
+    for index in range(count):
+        prompt = await repository.create(
+            PromptCreate(title=f"프롬프트 {index}", content=f"내용 {index}", description="회의" if index % 2 else None)
+        )
+        ids.append(prompt.id)
+    return ids
+
+
+async def collect_pages(repository, size: int, query: str | None = None) -> list[str]:
+    collected, cursor = [], None
+    while True:
+        prompts, cursor = await repository.list_after(cursor, size, query=query)
+        collected += [prompt.id for prompt in prompts]
+        if cursor is None:
+            return collected
+
+
+async def test_in_memory_repository_cursor_pages_cover_all_prompts_newest_first():
+    repository = InMemoryPromptRepository()
+    ids = await seed(repository, 7)
+
+    assert await collect_pages(repository, size=3) == [prompt.id for prompt in (await repository.list_page(1, 10))[0]]
+    assert sorted(await collect_pages(repository, size=3)) == sorted(ids)
+
+
+async def test_in_memory_repository_search_matches_description():
+    repository = InMemoryPromptRepository()
+    await seed(repository, 6)
+
+    assert len(await collect_pages(repository, size=2, query="회의")) == 3
+
+
+def test_decode_cursor_rejects_garbage():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+@pytest.mark.asyncio
+@pytest.mark.connection
+async def test_sql_repository_crud_cursor_and_search(pg_session, setup_postgres_test_db):
+    await create_prompt_tables(pg_session.bind)
+    repository = SqlPromptRepository(async_sessionmaker(pg_session.bind, expire_on_commit=False))
+    try:
+        ids = await seed(repository, 5)
+
+        updated = await repository.update(ids[0], {"title": "수정된 제목"})
+        assert updated.title == "수정된 제목"
+        assert sorted(await collect_pages(repository, size=2)) == sorted(ids)
+        assert len(await collect_pages(repository, size=2, query="회의")) == 2
+        upserted = await repository.bulk_upsert(
+            [
+                PromptBulkItem(id=ids[1], title="일괄 수정", content="내용"),
+                PromptBulkItem(id="bulk-new", title="일괄 생성", content="내용"),
+            ]
+        )
+        assert upserted == {ids[1]: False, "bulk-new": True}
+        assert (await repository.delete(ids[0])).id == ids[0]
+        assert await repository.get(ids[0]) is None
+    finally:
+        await pg_session.execute(text("DROP TABLE IF EXISTS prompts"))
+        await pg_session.commit()
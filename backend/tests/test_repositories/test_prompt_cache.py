@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+
+from api.repositories.prompt import InMemoryPromptRepository
+from api.repositories.prompt_cache import CachedPromptRepository
+from api.schemas.prompt import PromptCreate
+
+
+class FakeRedis:
+    """테스트에 필요한 명령만 구현한 인메모리 Redis"""
+
+    def __init__(self):
+        self.values: dict[str, str] = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None, px=None, nx=False):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value.decode() if isinstance(value, bytes) else value
+        return True
+
+    async def incr(self, key):
+        self.values[key] = str(int(self.values.get(key, 0)) + 1)
+        return int(self.values[key])
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+
+    async def eval(self, script, numkeys, key, token):
+        # 잠금 해제 스크립트(compare-and-delete)만 흉내 낸다
+        if self.values.get(key) != token:
+            return 0
+        del self.values[key]
+        return 1
+
+
+class SlowRepository(InMemoryPromptRepository):
+    """조회 횟수를 세고 DB 지연을 흉내 내는 저장소"""
+
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+
+    async def list_page(self, page=1, size=10):
+        self.reads += 1
+        await asyncio.sleep(0.05)
+        return await super().list_page(page, size)
+
+
+async def test_cache_hits_until_write_invalidates():
+    backend = SlowRepository()
+    repository = CachedPromptRepository(backend, FakeRedis())
+    created = await repository.create(PromptCreate(title="제목", content="내용"))
+
+    await repository.list_page(1, 10)
+    await repository.list_page(1, 10)
+    assert backend.reads == 1
+
+    await repository.update(created.id, {"title": "수정"})
+    prompts, total = await repository.list_page(1, 10)
+
+    assert backend.reads == 2
+    assert prompts[0].title == "수정"
+    assert (await repository.get(created.id)).title == "수정"
+    assert repository.stats.hits == 1
+
+
+async def test_concurrent_misses_share_one_load():
+    backend = SlowRepository()
+    repository = CachedPromptRepository(backend, FakeRedis())
+
+    await asyncio.gather(*(repository.list_page(1, 10) for _ in range(20)))
+
+    assert backend.reads == 1
+    assert repository.stats.coalesced == 19
+
+
+async def test_waits_for_other_process_holding_the_lock():
+    backend = SlowRepository()
+    client = FakeRedis()
+    other_process = CachedPromptRepository(backend, client)
+    repository = CachedPromptRepository(backend, client, lock_seconds=1)
+
+    await asyncio.gather(other_process.list_page(1, 10), repository.list_page(1, 10))
+
+    assert backend.reads == 1
+    assert repository.stats.lock_waits == 1
+
+
+async def test_unlock_keeps_lock_taken_over_after_expiry():
+    client = FakeRedis()
+
+    class ExpiringLockRepository(SlowRepository):
+        async def list_page(self, page=1, size=10):
+            # 로드가 잠금 만료 시간을 넘겨 다른 프로세스가 같은 잠금을 새로 잡은 상황
+            for key in client.values:
+                if ":lock:" in key:
+                    client.values[key] = "other-process"
+            return await super().list_page(page, size)
+
+    repository = CachedPromptRepository(ExpiringLockRepository(), client)
+    await repository.list_page(1, 10)
+
+    assert [value for key, value in client.values.items() if ":lock:" in key] == ["other-process"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.connection
+async def test_cached_repository_with_redis(redis_client):
+    repository = CachedPromptRepository(InMemoryPromptRepository(), redis_client)
+    created = await repository.create(PromptCreate(title="제목", content="내용"))
+
+    assert (await repository.get(created.id)).title == "제목"
+    assert (await repository.get(created.id)).title == "제목"
+    await repository.delete(created.id)
+
+    assert await repository.get(created.id) is None
+    assert repository.stats.hits == 1
@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from api.repositories.workflow_run import InMemoryWorkflowRunRepository, MongoWorkflowRunRepository
+
+
+def make_run(status: str, minutes_ago: int = 0) -> dict:
+    return {
+        "task": "과제",
+        "status": status,
+        "current_round": 1,
+        "max_rounds": 2,
+        "last_updated": datetime.now() - timedelta(minutes=minutes_ago),
+    }
+
+
+async def test_in_memory_repository_lists_latest_first_with_pagination():
+    repository = InMemoryWorkflowRunRepository()
+    await repository.create("old", make_run("completed", minutes_ago=10))
+    await repository.create("new", make_run("running"))
+    await repository.create("mid", make_run("completed", minutes_ago=5))
+
+    runs, total = await repository.list_runs(page=1, size=2)
+    assert [run["workflow_id"] for run in runs] == ["new", "mid"]
+    assert total == 3
+
+    runs, total = await repository.list_runs(page=1, size=10, status="completed")
+    assert [run["workflow_id"] for run in runs] == ["mid", "old"]
+    assert total == 2
+
+
+async def test_in_memory_repository_expires_runs():
+    repository = InMemoryWorkflowRunRepository(ttl_seconds=-1)
+    await repository.create("run", make_run("completed"))
+
+    assert await repository.get("run") is None
+    assert await repository.update("run", {"current_round": 2}) is None
+
+
+async def test_in_memory_repository_updates_only_from_expected_statuses():
+    repository = InMemoryWorkflowRunRepository()
+    await repository.create("run", make_run("completed"))
+
+    # 완료된 실행은 늦게 도착한 중단 요청으로 덮어쓰지 않는다
+    assert await repository.update("run", {"status": "stopped"}, statuses=("pending", "running")) is None
+    assert (await repository.get("run"))["status"] == "completed"
+    assert (await repository.update("run", {"current_round": 2}, statuses=("completed",)))["current_round"] == 2
+
+
+async def test_in_memory_repository_claims_only_expired_leases():
+    repository = InMemoryWorkflowRunRepository(lease_seconds=60)
+    # 노드 하나가 오래 걸려 last_updated 가 오래되어도 임대가 유효하면 가져가지 않는다
+    await repository.create("busy", {**make_run("running", minutes_ago=10), "owner": "a", "lease_expires_at": None})
+    assert (await repository.claim("busy", "a"))["owner"] == "a"
+    assert await repository.claim("busy", "b") is None
+
+    await repository.create("abandoned", {**make_run("running"), "owner": "a", "lease_expires_at": datetime.now()})
+    assert (await repository.claim("abandoned", "b"))["owner"] == "b"
+    assert await repository.claim("abandoned", "c") is None
+    await repository.create("done", make_run("completed"))
+    assert await repository.claim("done", "b") is None
+
+
+async def test_in_memory_repository_filters_updates_and_renewals_on_owner():
+    repository = InMemoryWorkflowRunRepository(lease_seconds=60)
+    await repository.create("run", {**make_run("running"), "owner": "b", "lease_expires_at": datetime.now()})
+
+    # 소유권을 잃은 프로세스의 기록과 임대 갱신은 반영되지 않는다
+    assert await repository.update("run", {"current_round": 2}, owner="a") is None
+    assert not await repository.renew_lease("run", "a")
+    assert await repository.renew_lease("run", "b")
+    assert (await repository.get("run"))["lease_expires_at"] > datetime.now() + timedelta(seconds=30)
+
+
+@pytest.mark.asyncio
+@pytest.mark.connection
+async def test_mongo_repository_crud(mongo_collection):
+    repository = MongoWorkflowRunRepository(mongo_collection, ttl_seconds=60)
+    await repository.ensure_indexes()
+
+    await repository.create("run-1", make_run("pending"))
+    updated = await repository.update("run-1", {"status": "running", "current_round": 2})
+    assert updated["workflow_id"] == "run-1"
+    assert updated["current_round"] == 2
+
+    runs, total = await repository.list_runs(status="running")
+    assert total == 1
+    assert runs[0]["workflow_id"] == "run-1"
+    assert "expires_at" not in runs[0]
+    assert await repository.update("missing", {"status": "running"}) is None
+    assert await repository.update("run-1", {"status": "stopped"}, statuses=("pending",)) is None
+
+    await repository.create("stale", make_run("running", minutes_ago=10))
+    assert (await repository.claim("stale", "a"))["owner"] == "a"
+    assert await repository.claim("stale", "b") is None
+    assert await repository.update("stale", {"current_round": 2}, owner="b") is None
+    assert await repository.renew_lease("stale", "a")
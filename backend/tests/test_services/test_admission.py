@@ -0,0 +1,45 @@
+import pytest
+
+from api.services.admission import AdmissionController, AdmissionRejected
+
+
+def test_queues_beyond_global_cap_and_rejects_when_queue_is_full():
+    controller = AdmissionController(max_active=1, max_active_per_client=1, max_queue=2)
+
+    first = controller.enter("a")
+    second = controller.enter("b")
+    third = controller.enter("c")
+
+    assert first.admitted and not second.admitted
+    assert (second.position, third.position) == (1, 2)
+    with pytest.raises(AdmissionRejected):
+        controller.enter("d")
+
+    first.release()
+    assert second.admitted
+    assert third.position == 1
+
+
+def test_client_at_its_cap_does_not_block_other_clients():
+    controller = AdmissionController(max_active=3, max_active_per_client=1, max_queue=10)
+
+    controller.enter("a")
+    waiting = controller.enter("a")
+    other = controller.enter("b")
+
+    assert not waiting.admitted
+    assert other.admitted
+    assert controller.active == 2
+
+
+def test_released_waiter_leaves_queue():
+    controller = AdmissionController(max_active=1, max_active_per_client=1, max_queue=10)
+    running = controller.enter("a")
+    first, second = controller.enter("b"), controller.enter("c")
+
+    first.release()
+    running.release()
+
+    assert second.admitted
+    assert controller.queued == 0
+    assert controller.active == 1
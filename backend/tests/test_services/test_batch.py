@@ -0,0 +1,75 @@
+import asyncio
+
+from api.repositories.workflow_run import InMemoryWorkflowRunRepository
+from api.services.admission import AdmissionController
+from api.services.batch import run_batch
+from api.services.workflow_runner import cancel_running_workflow
+
+
+def make_item(task: str) -> dict:
+    return {"task": task, "max_rounds": 1, "topology": "linear", "use_cache": True}
+
+
+async def fake_debate(item: dict, workflow_id: str) -> dict:
+    # 과제 이름의 숫자만큼 기다려 완료 순서를 정한다
+    await asyncio.sleep(int(item["task"][-1]) * 0.02)
+    return {"status": "completed", "decision": "finalize", "usage": {"llm_calls": 4, "total_tokens": 100}}
+
+
+async def test_batch_deduplicates_and_streams_in_completion_order():
+    items = [make_item("과제 3"), make_item("과제 1"), make_item("  과제  3 "), make_item("과제 2")]
+
+    records = [record async for record in run_batch("batch-1", items, concurrency=4, debate=fake_debate)]
+
+    results, summary = records[:-1], records[-1]
+    assert [record["index"] for record in results] == [1, 3, 0, 2]
+    assert [record["deduplicated"] for record in results] == [False, False, False, True]
+    assert summary["type"] == "summary"
+    assert (summary["tasks"], summary["unique_tasks"], summary["deduplicated"]) == (4, 3, 1)
+    assert summary["llm_calls"] == 12
+    # 처리량은 실제로 실행한 토론 3개 기준
+    assert summary["debates"] == 3
+    assert summary["tokens_per_debate"] == 100.0
+
+
+async def test_batch_respects_concurrency_limit():
+    running = peak = 0
+
+    async def tracked_debate(item: dict, workflow_id: str) -> dict:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return {"status": "completed", "usage": {}}
+
+    items = [make_item(f"과제 {index}") for index in range(10)]
+    records = [record async for record in run_batch("batch-2", items, concurrency=3, debate=tracked_debate)]
+
+    assert len(records) == 11
+    assert peak == 3
+
+
+async def test_batch_records_runs_and_stops_single_item_through_admission():
+    repository = InMemoryWorkflowRunRepository()
+    admission = AdmissionController(max_active=2, max_active_per_client=1)
+    items = [make_item(f"과제 {index}") for index in (1, 2, 3)]
+    records = run_batch("batch-3", items, concurrency=3, debate=fake_debate, repository=repository, admission=admission)
+
+    first = await anext(records)
+    # 클라이언트별 한도 1 이므로 나머지는 입장을 기다리는 중이다 (실행 기록은 /list 에서 보인다)
+    runs, total = await repository.list_runs()
+    assert total == 3
+    assert {run["batch_id"] for run in runs} == {"batch-3"}
+    assert (await repository.get(f"batch-3-{first['index']}"))["status"] == "completed"
+    # 입장 전에 취소된 과제는 LLM 호출 없이 중단으로 기록된다
+    assert cancel_running_workflow("batch-3-2")
+
+    rest = [record async for record in records]
+    results, summary = [first, *rest[:-1]], rest[-1]
+    assert {record["index"]: record["status"] for record in results} == {0: "completed", 1: "completed", 2: "stopped"}
+    assert (summary["debates"], summary["completed"], summary["stopped"]) == (2, 2, 1)
+    stopped = await repository.get("batch-3-2")
+    assert stopped["status"] == "stopped"
+    assert stopped["savings"]["llm_calls_skipped"] == 4
+    assert admission.active == 0 and admission.queued == 0
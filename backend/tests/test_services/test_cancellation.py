@@ -0,0 +1,113 @@
+import asyncio
+
+from api.repositories.workflow_run import InMemoryWorkflowRunRepository
+from api.services.admission import AdmissionController
+from api.services.event_log import InMemoryEventLog
+from api.services.workflow_runner import (
+    cancel_running_workflow,
+    start_admitted_workflow_run,
+    start_workflow_run,
+    stream_logged_events,
+)
+
+
+async def start_run(stub_llm, max_rounds: int = 2):
+    repository = InMemoryWorkflowRunRepository()
+    event_log = InMemoryEventLog()
+    await repository.create(
+        "wf-1",
+        {
+            "task": "중단 과제",
+            "max_rounds": max_rounds,
+            "stream_tokens": False,
+            "topology": "linear",
+            "use_cache": False,
+            "status": "pending",
+            "current_round": 1,
+            "last_updated": None,
+        },
+    )
+    task = start_workflow_run(event_log, repository, "wf-1")
+    while stub_llm.calls == 0:
+        await asyncio.sleep(0.01)
+    return repository, event_log, task
+
+
+async def logged_events(event_log: InMemoryEventLog) -> str:
+    return "".join([event async for _, event in event_log.tail("wf-1")])
+
+
+async def test_cancel_aborts_in_flight_llm_call(stub_llm):
+    stub_llm.latency = 0.5
+    repository, event_log, task = await start_run(stub_llm)
+
+    assert cancel_running_workflow("wf-1")
+    await asyncio.wait_for(task, timeout=0.2)
+
+    run = await repository.get("wf-1")
+    assert run["status"] == "stopped"
+    assert run["savings"]["llm_calls_skipped"] == 8
+    assert stub_llm.calls == 1
+    assert '"status":"stopped"' in await logged_events(event_log)
+
+
+async def test_run_stops_between_nodes_when_stopped_elsewhere(stub_llm):
+    stub_llm.latency = 0.1
+    repository, event_log, task = await start_run(stub_llm)
+
+    # 다른 프로세스의 /stop 처럼 저장소 상태만 변경
+    await repository.update("wf-1", {"status": "stopped"})
+    await asyncio.wait_for(task, timeout=1)
+
+    run = await repository.get("wf-1")
+    assert stub_llm.calls == 1
+    assert run["usage"]["llm_calls"] == 1
+    assert run["savings"]["llm_calls_skipped"] == 7
+
+
+async def test_run_never_overwrites_status_finished_elsewhere(stub_llm):
+    stub_llm.latency = 0.1
+    repository, event_log, task = await start_run(stub_llm)
+
+    # 다른 프로세스가 먼저 종료 상태를 기록하면 실행은 멈추고 그 상태를 덮어쓰지 않는다
+    await repository.update("wf-1", {"status": "completed"})
+    await asyncio.wait_for(task, timeout=1)
+
+    run = await repository.get("wf-1")
+    assert run["status"] == "completed"
+    assert "savings" not in run
+    assert '"status":"stopped"' not in await logged_events(event_log)
+
+
+async def test_abandoned_stream_cancels_run_after_grace(stub_llm):
+    stub_llm.latency = 0.5
+    repository, event_log, task = await start_run(stub_llm)
+
+    stream = stream_logged_events(event_log, "wf-1", cancel_when_abandoned=0)
+    await anext(stream)
+    await stream.aclose()
+    await asyncio.wait_for(task, timeout=0.2)
+
+    assert (await repository.get("wf-1"))["status"] == "stopped"
+
+
+async def test_cancel_while_queued_skips_every_llm_call(stub_llm):
+    repository = InMemoryWorkflowRunRepository()
+    event_log = InMemoryEventLog()
+    await repository.create("wf-1", {"topology": "linear", "max_rounds": 2, "status": "pending", "current_round": 1})
+    admission = AdmissionController(max_active=1, max_active_per_client=1)
+    running = admission.enter("other")
+    task = start_admitted_workflow_run(admission.enter("client"), event_log, repository, "wf-1", 2)
+    await asyncio.sleep(0.01)
+
+    assert cancel_running_workflow("wf-1")
+    await asyncio.gather(task, return_exceptions=True)
+
+    run = await repository.get("wf-1")
+    assert run["status"] == "stopped"
+    assert run["savings"]["llm_calls_skipped"] == 8
+    assert stub_llm.calls == 0
+    events = await logged_events(event_log)
+    assert '"status":"queued"' in events and '"status":"stopped"' in events
+    assert admission.queued == 0
+    running.release()
@@ -0,0 +1,37 @@
+import pytest
+
+from api.services import workflow
+from api.services.convergence import estimate_convergence_savings, similarity
+
+
+def test_similarity_uses_cheap_upper_bound_below_threshold():
+    plan = "목표 설정 후 주간 일정과 필요 자원을 정리합니다"
+
+    assert similarity(plan, plan) == 1.0
+    assert similarity(plan, plan + " 예상 효과도 적습니다") > 0.8
+    assert similarity(plan, "전혀 다른 내용", threshold=0.95) < 0.95
+
+
+def test_estimate_convergence_savings_counts_rest_of_round_and_remaining_rounds():
+    assert estimate_convergence_savings(4, 3, round_count=2, max_rounds=3, tokens_per_call=100) == (1, 700)
+    assert estimate_convergence_savings(4, 1, round_count=3, max_rounds=3, tokens_per_call=100) == (0, 100)
+
+
+@pytest.mark.parametrize(
+    ("decision", "last_node", "calls"),
+    [("REVISE_PLAN", "planning", 5), ("MORE_RESEARCH", "critic", 6)],
+)
+async def test_converged_round_finalizes_without_judge(stub_llm, monkeypatch, decision, last_node, calls):
+    monkeypatch.setattr(workflow.settings, "WORKFLOW_CONVERGENCE_ENABLED", True)
+    # 스텁 응답은 호출 번호만 다르므로("응답 N ...") 단어 유사도가 0.75 이다
+    monkeypatch.setattr(workflow.settings, "WORKFLOW_CONVERGENCE_THRESHOLD", 0.7)
+    stub_llm.decision = decision
+    usage = workflow.RunUsage()
+
+    steps = [step async for mode, step in workflow.run_discussion("수렴 과제", 3, usage=usage) if mode == "updates"]
+
+    assert steps[-1]["node"] == last_node
+    assert steps[-1]["decision"] == "finalize"
+    assert stub_llm.calls == calls
+    assert (usage.converged_round, usage.convergence_rounds_saved) == (2, 1)
+    assert usage.convergence_tokens_saved > 0
@@ -0,0 +1,62 @@
+import asyncio
+import json
+import logging
+
+from api.repositories.workflow_run import InMemoryWorkflowRunRepository
+from api.services.event_bus import AgentEvent, BatchedLogSink, EventBus, event_bus
+from api.services.workflow_runner import run_workflow_with_sse
+
+
+def make_event(index: int) -> AgentEvent:
+    return AgentEvent("기획자", "thinking", f"메시지 {index}", 0.0, "wf-1")
+
+
+def test_publish_drops_oldest_when_subscriber_is_full():
+    bus = EventBus()
+    queue = bus.subscribe(maxsize=2)
+
+    for index in range(3):
+        bus.publish(make_event(index))
+
+    assert bus.dropped == 1
+    assert [queue.get_nowait().content for _ in range(2)] == ["메시지 1", "메시지 2"]
+
+
+async def test_log_sink_writes_events_in_batches(caplog):
+    bus = EventBus()
+    sink = BatchedLogSink(bus, batch_size=10, flush_seconds=0.05)
+    task = asyncio.create_task(sink.run())
+    await asyncio.sleep(0)
+
+    with caplog.at_level(logging.INFO, logger="workflow.events"):
+        for index in range(25):
+            bus.publish(make_event(index))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    lines = [line for record in caplog.records for line in record.getMessage().splitlines()]
+    assert sink.written == 25
+    assert len(caplog.records) == 3
+    assert json.loads(lines[-1])["content"] == "메시지 24"
+
+
+async def test_node_messages_reach_bus_and_sse_stream(stub_llm):
+    repository = InMemoryWorkflowRunRepository()
+    await repository.create("wf-bus", {"status": "pending", "current_round": 1})
+    queue = event_bus.subscribe()
+    try:
+        events = [event async for event in run_workflow_with_sse(repository, "wf-bus", "이벤트 버스", 1)]
+    finally:
+        event_bus.unsubscribe(queue)
+
+    messages = [json.loads(event.split("data: ", 1)[1]) for event in events if event.startswith("event: agent_message")]
+    types = {(message["agent"], message["type"]) for message in messages}
+    assert ("기획자", "thinking") in types
+    assert ("리서처", "request") in types
+    # 본문은 상태 업데이트로 한 번만 전달된다
+    assert sum(message["type"] == "plan" for message in messages) == 1
+
+    published = [queue.get_nowait() for _ in range(queue.qsize())]
+    assert {event.workflow_id for event in published} == {"wf-bus"}
+    assert any(event.type == "plan" for event in published)
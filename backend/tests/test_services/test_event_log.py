@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from api.services.event_log import InMemoryEventLog, RedisEventLog
+
+
+async def test_tail_replays_after_last_event_id_then_follows_live_events():
+    event_log = InMemoryEventLog()
+    for index in range(3):
+        await event_log.append("run", f"event-{index}")
+
+    received = []
+
+    async def follow():
+        async for event_id, event in event_log.tail("run", after="1"):
+            received.append((event_id, event))
+
+    follower = asyncio.create_task(follow())
+    await asyncio.sleep(0)
+    await event_log.append("run", "event-3")
+    await event_log.close("run")
+    await follower
+
+    assert received == [("2", "event-1"), ("3", "event-2"), ("4", "event-3")]
+
+
+async def test_multiple_viewers_share_one_log():
+    event_log = InMemoryEventLog()
+
+    async def watch() -> list[str]:
+        return [event async for _, event in event_log.tail("run")]
+
+    viewers = [asyncio.create_task(watch()) for _ in range(3)]
+    await asyncio.sleep(0)
+    await event_log.append("run", "event")
+    await event_log.close("run")
+
+    assert await asyncio.gather(*viewers) == [["event"]] * 3
+    assert await event_log.exists("run")
+
+
+async def test_tail_stops_when_run_is_no_longer_active():
+    event_log = InMemoryEventLog(idle_seconds=0.01)
+    await event_log.append("run", "event")
+    checks = []
+
+    async def is_active() -> bool:
+        checks.append(True)
+        return len(checks) < 3
+
+    # 실행 프로세스가 close 없이 사라진 기록도 끝까지 기다리지 않는다
+    received = await asyncio.wait_for(_collect(event_log.tail("run", is_active=is_active)), timeout=1)
+
+    assert received == ["event"]
+    assert len(checks) == 3
+
+
+async def _collect(events) -> list[str]:
+    return [event async for _, event in events]
+
+
+@pytest.mark.asyncio
+@pytest.mark.connection
+async def test_redis_event_log_resumes_from_stream_id(redis_client):
+    event_log = RedisEventLog(redis_client, ttl_seconds=60, block_ms=100)
+    first_id = await event_log.append("run", "event-0")
+    assert await redis_client.ttl("workflow:log:run") > 0
+    await event_log.append("run", "event-1")
+    await event_log.close("run")
+
+    replayed = [event async for _, event in event_log.tail("run", after=first_id)]
+
+    assert replayed == ["event-1"]
+    assert await redis_client.ttl("workflow:log:run") > 0
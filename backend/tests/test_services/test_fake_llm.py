@@ -0,0 +1,45 @@
+from api.services import workflow
+from api.services.fake_llm import FakeChatModel
+from api.services.llm_client import create_http_client, create_llm
+from config.settings import get_settings
+
+
+async def test_fake_model_streams_tokens_with_usage():
+    model = FakeChatModel(latency=0, token_interval=0, response_tokens=5)
+
+    chunks = [chunk async for chunk in model.astream("프롬프트")]
+
+    assert len([chunk for chunk in chunks if chunk.content]) == 5
+    assert chunks[-1].usage_metadata["output_tokens"] == 5
+
+
+def test_fake_model_latency_is_deterministic_for_seed():
+    first = FakeChatModel(latency=0.2, distribution="lognormal", seed=7)
+    second = FakeChatModel(latency=0.2, distribution="lognormal", seed=7)
+
+    samples = [first.sample_latency() for _ in range(100)]
+    assert samples == [second.sample_latency() for _ in range(100)]
+    assert 0.15 < sum(samples) / len(samples) < 0.25
+
+
+async def test_scripted_decisions_drive_debate_rounds(monkeypatch):
+    model = FakeChatModel(latency=0, token_interval=0, decisions=["REVISE_PLAN", "MORE_RESEARCH", "FINALIZE"])
+    monkeypatch.setattr(workflow, "llm", model)
+    monkeypatch.setattr(workflow, "response_cache", None)
+
+    nodes = [step["node"] async for mode, step in workflow.run_discussion("가짜 모델", 5) if mode == "updates"]
+
+    # 1라운드: 계획 수정 → 2라운드: 추가 조사 → 3라운드: 승인
+    assert nodes.count("planning") == 2
+    assert nodes.count("researcher") == 3
+    assert nodes.count("judge") == 3
+
+
+def test_create_llm_uses_fake_provider():
+    settings = get_settings().model_copy(update={"LLM_PROVIDER": "fake", "FAKE_LLM_DECISIONS": ["REVISE_PLAN"]})
+
+    model = create_llm(settings, "gpt-test", create_http_client(settings))
+
+    assert isinstance(model, FakeChatModel)
+    assert model.model_name == "gpt-test"
+    assert model.decisions == ["REVISE_PLAN"]
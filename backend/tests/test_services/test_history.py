@@ -0,0 +1,53 @@
+from langgraph.checkpoint.memory import InMemorySaver
+
+from api.services import workflow
+from api.services.history import HistoryManager, first_sentence
+
+
+def test_history_keeps_window_and_summarizes_evicted_turns():
+    manager = HistoryManager(window=2, turn_max_chars=10, summary_max_chars=1000)
+    history = {}
+    for index in range(5):
+        history = manager.reduce(history, [(f"에이전트{index}", f"발언 {index}. 나머지 내용")])
+
+    assert [speaker for speaker, _ in history["turns"]] == ["에이전트3", "에이전트4"]
+    assert history["turns"][0][1] == "발언 3. 나머지…"
+    assert history["summary"].splitlines() == ["에이전트0: 발언 0.", "에이전트1: 발언 1.", "에이전트2: 발언 2."]
+    assert history["total_turns"] == 5
+
+
+def test_history_summary_is_bounded():
+    manager = HistoryManager(window=1, summary_max_chars=50)
+    history = {}
+    for index in range(100):
+        history = manager.reduce(history, [("판사", f"긴 결정문 {index}. " + "내용" * 100)])
+
+    assert len(history["summary"]) <= 50
+    assert history["summary"].endswith("긴 결정문 98.")
+
+
+def test_first_sentence_falls_back_to_first_line():
+    assert first_sentence("\n첫 줄 문장\n둘째 줄") == "첫 줄 문장"
+
+
+async def test_debate_history_stays_within_window(stub_llm, monkeypatch):
+    monkeypatch.setattr(workflow, "workflow_registry", workflow.WorkflowRegistry(checkpointer=InMemorySaver()))
+    stub_llm.decision = "REVISE_PLAN"
+    histories = [
+        step["history"]
+        async for mode, step in workflow.run_discussion("긴 토론", 5, workflow_id="wf-history")
+        if mode == "updates" and "history" in step
+    ]
+
+    # 노드는 변경분(새 발언)만 내보낸다
+    assert all(len(turns) == 1 for turns in histories)
+    assert stub_llm.calls == 5 * 4
+
+    # 창보다 많은 발언이 오가도 최종 상태에는 최근 발언 창과 크기가 제한된 요약만 남는다
+    snapshot = await workflow.workflow_registry.get().aget_state({"configurable": {"thread_id": "wf-history"}})
+    history = snapshot.values["history"]
+    window = workflow.settings.HISTORY_WINDOW_TURNS
+    assert history["total_turns"] == len(histories) > window
+    assert len(history["turns"]) == window
+    assert all(len(content) <= workflow.settings.HISTORY_TURN_MAX_CHARS + 1 for _, content in history["turns"])
+    assert 0 < len(history["summary"]) <= workflow.settings.HISTORY_SUMMARY_MAX_CHARS
@@ -0,0 +1,143 @@
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from api.services import llm_cache, workflow
+from api.services.llm_cache import InMemoryResponseCache, SemanticResponseCache, make_cache_key, make_cache_partition
+
+
+class KeywordEmbeddings(Embeddings):
+    """키워드 포함 여부로 벡터를 만드는 테스트용 임베딩"""
+
+    keywords = ("회고", "여행", "예산")
+
+    def __init__(self):
+        self.calls = 0
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        self.calls += 1
+        return [float(keyword in text) for keyword in self.keywords]
+
+
+def test_cache_key_depends_on_model_temperature_and_prompt():
+    key = make_cache_key("gpt", 0.7, "프롬프트")
+
+    assert key == make_cache_key("gpt", 0.7, "프롬프트")
+    assert key != make_cache_key("gpt", 0.0, "프롬프트")
+    assert key != make_cache_key("other", 0.7, "프롬프트")
+    assert key != make_cache_key("gpt", 0.7, "프롬프트!")
+
+
+async def test_in_memory_cache_evicts_least_recently_used():
+    cache = InMemoryResponseCache(max_entries=2)
+    await cache.set("a", "A")
+    await cache.set("b", "B")
+    assert await cache.get("a") == "A"
+
+    await cache.set("c", "C")
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == "A"
+    assert cache.stats.hits == 2
+    assert cache.stats.misses == 1
+
+
+async def test_in_memory_cache_expires_entries(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(llm_cache.time, "monotonic", lambda: now)
+    cache = InMemoryResponseCache(ttl_seconds=10)
+    await cache.set("a", "A")
+
+    now += 11
+
+    assert await cache.get("a") is None
+
+
+async def test_semantic_cache_matches_similar_prompt():
+    cache = SemanticResponseCache(InMemoryResponseCache(), KeywordEmbeddings(), threshold=0.9)
+    await cache.set("k1", "회고 답변", prompt="주간 회고 준비하기")
+
+    assert await cache.get("k2", prompt="이번 주 회고 준비") == "회고 답변"
+    assert await cache.get("k3", prompt="여행 예산 짜기") is None
+    assert cache.stats.semantic_hits == 1
+
+
+async def test_semantic_cache_reuses_lookup_embedding_on_set():
+    embeddings = KeywordEmbeddings()
+    cache = SemanticResponseCache(InMemoryResponseCache(), embeddings, threshold=0.9)
+    await cache.set("k1", "회고 답변", prompt="주간 회고 준비하기")
+
+    assert await cache.get("k2", prompt="여행 예산 짜기") is None
+    await cache.set("k2", "여행 답변", prompt="여행 예산 짜기")
+
+    # 저장 1회 + 미스 조회 1회 (미스 후 저장은 조회에서 계산한 임베딩을 재사용)
+    assert embeddings.calls == 2
+
+
+async def test_semantic_cache_only_matches_within_partition():
+    cache = SemanticResponseCache(InMemoryResponseCache(), KeywordEmbeddings(), threshold=0.9)
+    judge = make_cache_partition("gpt", 0.7, "judge")
+    await cache.set("k1", "판사 답변", prompt="주간 회고 준비하기", partition=judge)
+
+    assert (
+        await cache.get("k2", prompt="주간 회고 준비하기", partition=make_cache_partition("gpt", 0.7, "critic")) is None
+    )
+    assert (
+        await cache.get("k3", prompt="주간 회고 준비하기", partition=make_cache_partition("other", 0.7, "judge"))
+        is None
+    )
+    structured = make_cache_partition("gpt", 0.7, "judge", {"max_tokens": 80})
+    assert await cache.get("k4", prompt="주간 회고 준비하기", partition=structured) is None
+    assert await cache.get("k5", prompt="주간 회고 준비하기", partition=judge) == "판사 답변"
+
+
+async def test_research_perspectives_do_not_share_semantic_hits(stub_llm, monkeypatch):
+    cache = SemanticResponseCache(InMemoryResponseCache(), KeywordEmbeddings(), threshold=0.9)
+    monkeypatch.setattr(workflow, "response_cache", cache)
+    config = {"configurable": {"task": "주간 회고 준비"}}
+    sections = {"plan": "회고 계획"}
+
+    async def research(perspective: str, title: str) -> str:
+        def render(sections: dict[str, str]) -> str:
+            return f"'{title}' 관점에서만 조사해주세요.\n계획안: {sections['plan']}"
+
+        content, _ = await workflow.assemble_and_generate(
+            f"research_{perspective}", render, sections, config, f"리서처({title})", "research"
+        )
+        return content
+
+    cost = await research("cost", "비용")
+    risk = await research("risk", "리스크")
+
+    # 과제와 계획안이 같아 임베딩은 같지만, 관점(노드)이 다르므로 서로의 응답을 재사용하지 않는다
+    assert stub_llm.calls == 2
+    assert cost != risk
+    assert cache.stats.semantic_hits == 0
+
+
+@pytest.fixture
+def counting_llm(stub_llm, monkeypatch):
+    monkeypatch.setattr(workflow, "response_cache", InMemoryResponseCache())
+    return stub_llm
+
+
+async def test_repeated_debate_replays_from_cache(counting_llm):
+    async def run(stream_tokens: bool) -> list[tuple[str, str]]:
+        events = []
+        async for mode, chunk in workflow.run_discussion("캐시 과제", 1, stream_tokens=stream_tokens):
+            # 토큰 사용 내역/노드 내부 메시지는 제외하고 델타와 노드 업데이트만 비교
+            if "event" in chunk:
+                continue
+            events.append((mode, chunk.get("type", chunk.get("node"))))
+        return events
+
+    first = await run(stream_tokens=True)
+    calls_after_first = counting_llm.calls
+    second = await run(stream_tokens=True)
+
+    assert counting_llm.calls == calls_after_first
+    assert [event for event in second if event[0] == "updates"] == [event for event in first if event[0] == "updates"]
+    assert {event[1] for event in second if event[0] == "custom"} == {"plan", "research", "critique", "decision"}
+    assert workflow.response_cache.stats.hits == 4
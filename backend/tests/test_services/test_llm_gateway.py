@@ -0,0 +1,148 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from api.services import workflow
+from api.services.llm_gateway import FairLimiter, LLMGateway, ModelLimits, TokenBucket
+
+
+class FakeProviderError(Exception):
+    """공급자 HTTP 오류 흉내 (status_code, Retry-After 헤더)"""
+
+    def __init__(self, status_code: int, retry_after: float | None = None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+        self.response = SimpleNamespace(headers=headers)
+
+
+class FakeProvider:
+    """처음 failures 번은 오류를 내고 이후 응답하는 로컬 공급자"""
+
+    def __init__(self, failures: list[Exception] | None = None):
+        self.failures = list(failures or [])
+        self.calls = 0
+
+    async def ainvoke(self, prompt: str) -> AIMessage:
+        self.calls += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        return AIMessage(content=f"응답: {prompt}")
+
+    async def astream(self, prompt: str):
+        self.calls += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        for token in ("첫", "번째", "응답"):
+            yield AIMessageChunk(content=token)
+
+
+def make_gateway(**kwargs) -> LLMGateway:
+    return LLMGateway("fake-model", retry_base_seconds=0.01, retry_max_seconds=0.05, **kwargs)
+
+
+async def test_gateway_retries_rate_limits_with_retry_after():
+    gateway = make_gateway()
+    provider = FakeProvider([FakeProviderError(429, retry_after=0.1), FakeProviderError(503)])
+
+    started = time.perf_counter()
+    response = await gateway.invoke("fake-model", "wf", 10, lambda: provider.ainvoke("안녕"))
+
+    assert response.content == "응답: 안녕"
+    assert provider.calls == 3
+    assert time.perf_counter() - started >= 0.1
+    assert gateway.stats.retries == 2
+    assert gateway.stats.rate_limited == 1
+
+
+async def test_gateway_does_not_retry_client_errors():
+    gateway = make_gateway()
+    provider = FakeProvider([FakeProviderError(400)])
+
+    with pytest.raises(FakeProviderError):
+        await gateway.invoke("fake-model", "wf", 10, lambda: provider.ainvoke("잘못된 요청"))
+    assert provider.calls == 1
+    assert gateway.stats.failures == 1
+
+
+async def test_gateway_retries_stream_only_before_first_chunk():
+    gateway = make_gateway()
+    provider = FakeProvider([FakeProviderError(429)])
+
+    chunks = [chunk.content async for chunk in gateway.stream("fake-model", "wf", 10, lambda: provider.astream(""))]
+
+    assert chunks == ["첫", "번째", "응답"]
+    assert provider.calls == 2
+
+
+async def test_fair_limiter_round_robins_between_workflows():
+    limiter = FairLimiter(1)
+    order = []
+    release = asyncio.Event()
+
+    async def hold():
+        async with limiter.slot("busy"):
+            await release.wait()
+
+    async def call(key: str, index: int):
+        async with limiter.slot(key):
+            order.append(f"{key}{index}")
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    waiters = [asyncio.create_task(call("busy", index)) for index in range(3)]
+    await asyncio.sleep(0)
+    waiters.append(asyncio.create_task(call("other", 0)))
+    await asyncio.sleep(0)
+
+    release.set()
+    await asyncio.gather(holder, *waiters)
+
+    # 먼저 몰린 워크플로우의 요청이 모두 끝날 때까지 기다리지 않는다
+    assert order == ["busy0", "other0", "busy1", "busy2"]
+    assert limiter.active == 0
+
+
+async def test_token_bucket_throttles_to_rate():
+    bucket = TokenBucket(rate_per_minute=6000, capacity=10)  # 초당 100
+
+    assert await bucket.acquire(10) == 0
+    started = time.perf_counter()
+    await bucket.acquire(5)
+    assert time.perf_counter() - started >= 0.04
+
+
+async def test_throttled_model_does_not_hold_global_slots():
+    # 분당 600 토큰 (한 번에 다 쓰면 다음 호출은 1분 가까이 기다린다)
+    gateway = make_gateway(global_concurrency=1, limits={"slow-model": ModelLimits(tokens_per_minute=600)})
+    provider = FakeProvider()
+    await gateway.invoke("slow-model", "wf-slow", 600, lambda: provider.ainvoke("느린 모델"))
+
+    throttled = asyncio.create_task(gateway.invoke("slow-model", "wf-slow", 600, lambda: provider.ainvoke("대기")))
+    await asyncio.sleep(0.01)
+    try:
+        response = await asyncio.wait_for(
+            gateway.invoke("fast-model", "wf-fast", 10, lambda: provider.ainvoke("빠른 모델")), timeout=1
+        )
+    finally:
+        throttled.cancel()
+
+    assert response.content == "응답: 빠른 모델"
+    assert gateway.limiter.active == 0
+
+
+async def test_nodes_are_routed_to_configured_models(stub_llm, monkeypatch):
+    judge_llm = FakeProvider()
+    gateway = LLMGateway(workflow.LLM_MODEL, routes={"judge": "judge-model"})
+    monkeypatch.setattr(workflow, "llm_gateway", gateway)
+    monkeypatch.setitem(workflow.llm_clients, "judge-model", judge_llm)
+
+    async for _ in workflow.run_discussion("모델 라우팅", 1):
+        pass
+
+    assert judge_llm.calls == 1
+    assert stub_llm.calls == 3
+    assert gateway.stats.requests == 4
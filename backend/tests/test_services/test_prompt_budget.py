@@ -0,0 +1,76 @@
+from api.services import workflow
+from api.services.prompt_budget import TRUNCATION_MARKER, PromptAssembler, Tokenizer
+
+tokenizer = Tokenizer(workflow.LLM_MODEL)
+
+
+def render(sections: dict[str, str]) -> str:
+    return f"지시문\n계획: {sections['plan']}\n비평: {sections['critique']}"
+
+
+async def test_assembler_keeps_sections_within_budget():
+    assembler = PromptAssembler(tokenizer, {"judge": 200}, min_section_tokens=16)
+    sections = {"plan": "계획 내용입니다. " * 200, "critique": "짧은 비평"}
+
+    prompt, accounting = await assembler.assemble("judge", render, sections)
+
+    assert accounting.prompt_tokens <= 200
+    assert accounting.prompt_tokens == tokenizer.count(prompt)
+    # 작은 구간은 그대로 두고 큰 구간만 압축한다
+    assert accounting.sections["critique"].method == "full"
+    assert accounting.sections["plan"].method == "truncate"
+    assert TRUNCATION_MARKER in prompt
+    assert accounting.saved_tokens > 0
+
+
+async def test_assembler_leaves_prompt_unchanged_under_budget():
+    assembler = PromptAssembler(tokenizer, {}, default_budget=1000)
+    sections = {"plan": "계획", "critique": "비평"}
+
+    prompt, accounting = await assembler.assemble("planning", render, sections)
+
+    assert prompt == render(sections)
+    assert {section.method for section in accounting.sections.values()} == {"full"}
+
+
+async def test_assembler_without_budget_only_counts_tokens():
+    assembler = PromptAssembler(tokenizer, {}, default_budget=0)
+    sections = {"plan": "계획 내용입니다. " * 500, "critique": "비평"}
+
+    prompt, accounting = await assembler.assemble("judge", render, sections)
+
+    assert prompt == render(sections)
+    assert accounting.budget == 0
+    assert accounting.saved_tokens == 0
+    assert accounting.prompt_tokens == tokenizer.count(prompt)
+
+
+async def test_assembler_caches_summaries():
+    calls = []
+
+    async def summarize(text: str, max_tokens: int) -> str:
+        calls.append(text)
+        return "요약된 계획"
+
+    assembler = PromptAssembler(tokenizer, {"judge": 150}, min_section_tokens=16)
+    sections = {"plan": "긴 계획. " * 300, "critique": "비평"}
+    for _ in range(3):
+        prompt, accounting = await assembler.assemble("judge", render, sections, summarize)
+
+    assert len(calls) == 1
+    assert "요약된 계획" in prompt
+    assert accounting.sections["plan"].method == "summary"
+
+
+async def test_nodes_emit_token_usage(stub_llm):
+    usages = [
+        chunk
+        async for mode, chunk in workflow.run_discussion("토큰 예산", 1)
+        if mode == "custom" and chunk.get("event") == "token_usage"
+    ]
+
+    assert [usage["node"] for usage in usages] == ["planning", "researcher", "critic", "judge"]
+    judge = usages[-1]
+    assert set(judge["sections"]) == {"plan", "research", "critique"}
+    assert judge["budget"] == workflow.prompt_assembler.budget_for("judge")
+    assert judge["total_tokens"] == judge["prompt_tokens"] + judge["completion_tokens"]
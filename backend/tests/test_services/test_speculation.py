@@ -0,0 +1,40 @@
+from api.services import workflow
+from api.services.speculation import predict_decision
+
+
+async def run(task: str, max_rounds: int = 2) -> tuple[list[str], workflow.RunUsage]:
+    usage = workflow.RunUsage()
+    nodes = [
+        step["node"]
+        async for mode, step in workflow.run_discussion(task, max_rounds, usage=usage, speculate=True)
+        if mode == "updates"
+    ]
+    return nodes, usage
+
+
+def test_predict_decision_prefers_previous_round_then_critique():
+    assert predict_decision("일정이 비현실적이니 수정이 필요합니다", "more_research") == "more_research"
+    assert predict_decision("근거 자료와 통계 데이터가 부족합니다", "") == "more_research"
+    assert predict_decision("목표를 더 구체적으로 수정해주세요", "") == "revise_plan"
+
+
+async def test_speculative_planning_is_committed_when_judge_revises(stub_llm):
+    stub_llm.decision = "REVISE_PLAN"
+
+    nodes, usage = await run("투기 실행 적중")
+
+    assert nodes.count("planning") == 2
+    # 2라운드 기획 응답은 판사와 동시에 받아 두었으므로 호출 수가 늘지 않는다
+    assert stub_llm.calls == 8
+    assert (usage.speculative_hits, usage.speculative_misses) == (1, 0)
+    assert usage.speculation_saved_seconds > 0
+
+
+async def test_speculative_planning_is_discarded_when_judge_asks_for_research(stub_llm):
+    stub_llm.decision = "MORE_RESEARCH"
+
+    nodes, usage = await run("투기 실행 폐기")
+
+    assert nodes.count("planning") == 1 and nodes.count("researcher") == 2
+    assert (usage.speculative_hits, usage.speculative_misses) == (0, 1)
+    assert usage.speculation_saved_seconds == 0
@@ -0,0 +1,62 @@
+import json
+import zlib
+from datetime import datetime
+
+import pytest
+
+from api.services.sse_encoder import ArtifactTracker, compress_events, encode_event, negotiate_encoding
+
+
+def test_encode_event_matches_json_payload():
+    data = {"agent": "기획자", "content": "계획", "timestamp": datetime(2025, 1, 2, 3, 4, 5, 6)}
+
+    event = encode_event("agent_message", data)
+
+    assert event.startswith("event: agent_message\ndata: ") and event.endswith("\n\n")
+    payload = json.loads(event.split("data: ", 1)[1])
+    assert payload == {**data, "timestamp": data["timestamp"].isoformat()}
+
+
+def test_artifact_tracker_emits_each_artifact_once():
+    tracker = ArtifactTracker()
+
+    assert tracker.changed("plan", "계획 1")
+    assert not tracker.changed("plan", "계획 1")
+    assert not tracker.changed("research", "")
+    assert tracker.changed("plan", "계획 2")
+
+
+def test_negotiate_encoding_prefers_brotli():
+    pytest.importorskip("brotli")
+    assert negotiate_encoding("gzip, deflate, br") == "br"
+    assert negotiate_encoding("gzip;q=0.5, br;q=0") == "gzip"
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding(None) is None
+
+
+async def compress(events: list[str], encoding: str) -> list[bytes]:
+    async def source():
+        for event in events:
+            yield event
+
+    return [chunk async for chunk in compress_events(source(), encoding)]
+
+
+EVENTS = [encode_event("agent_message", {"content": f"조사 내용 {index}" * 20}) for index in range(5)]
+
+
+async def test_gzip_events_are_decodable_as_they_arrive():
+    chunks = await compress(EVENTS, "gzip")
+
+    # 마지막(finish) 청크 전까지도 이벤트 단위로 바로 복원된다
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    assert [decompressor.decompress(chunk).decode() for chunk in chunks[:-1]] == EVENTS
+    assert sum(len(chunk) for chunk in chunks) < len("".join(EVENTS).encode())
+
+
+async def test_brotli_events_are_decodable_as_they_arrive():
+    brotli = pytest.importorskip("brotli")
+    chunks = await compress(EVENTS, "br")
+
+    decompressor = brotli.Decompressor()
+    assert [decompressor.process(chunk).decode() for chunk in chunks[:-1]] == EVENTS
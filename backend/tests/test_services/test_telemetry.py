@@ -0,0 +1,40 @@
+import pytest
+from prometheus_client import REGISTRY
+
+from api.services import workflow
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+async def test_nodes_and_llm_calls_are_measured(stub_llm):
+    judge_before = sample("workflow_node_duration_seconds_count", node="judge", status="ok")
+    tokens_before = sample("llm_tokens_total", model=workflow.LLM_MODEL, node="critic", direction="output")
+
+    async for _ in workflow.run_discussion("지표 측정", 1):
+        pass
+
+    assert sample("workflow_node_duration_seconds_count", node="judge", status="ok") == judge_before + 1
+    assert sample("llm_tokens_total", model=workflow.LLM_MODEL, node="critic", direction="output") > tokens_before
+
+
+async def test_debate_is_traced_as_single_trace(stub_llm):
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry import trace
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+
+    async for _ in workflow.run_discussion("트레이스", 1, workflow_id="trace-test"):
+        pass
+
+    spans = exporter.get_finished_spans()
+    names = {span.name for span in spans}
+    assert {"workflow.run", "node planning", "node judge", "llm.call"} <= names
+    assert len({span.context.trace_id for span in spans}) == 1
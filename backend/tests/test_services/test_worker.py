@@ -0,0 +1,110 @@
+import asyncio
+from datetime import datetime
+
+from api.repositories.workflow_run import InMemoryWorkflowRunRepository
+from api.services.event_log import InMemoryEventLog
+from api.services.job_queue import InMemoryJobQueue
+from api.services.worker import WorkflowWorker
+
+
+def make_run(task: str) -> dict:
+    now = datetime.now()
+    return {
+        "queued": True,
+        "task": task,
+        "max_rounds": 1,
+        "stream_tokens": False,
+        "topology": "linear",
+        "use_cache": False,
+        "status": "pending",
+        "current_round": 1,
+        "created_at": now,
+        "last_updated": now,
+    }
+
+
+async def test_worker_executes_queued_runs_with_bounded_concurrency(stub_llm):
+    queue = InMemoryJobQueue()
+    repository = InMemoryWorkflowRunRepository()
+    event_log = InMemoryEventLog()
+    worker = WorkflowWorker(queue, repository, event_log, concurrency=2)
+
+    for index in range(5):
+        await repository.create(f"run-{index}", make_run(f"과제 {index}"))
+        await queue.enqueue({"workflow_id": f"run-{index}"})
+
+    async def collect(workflow_id: str) -> list[str]:
+        return [event async for _, event in event_log.tail(workflow_id)]
+
+    subscriber = asyncio.create_task(collect("run-0"))
+    worker_task = asyncio.create_task(worker.run())
+
+    peak = 0
+    while not queue._queue.empty() or worker.in_flight:
+        peak = max(peak, worker.in_flight)
+        await asyncio.sleep(0.01)
+    worker.stop()
+    await worker_task
+
+    assert peak == 2
+    events = await subscriber
+    assert any("event: agent_message" in event for event in events)
+    runs, _ = await repository.list_runs()
+    assert {run["status"] for run in runs} == {"completed"}
+
+
+async def test_worker_skips_runs_stopped_before_execution(stub_llm):
+    queue = InMemoryJobQueue()
+    repository = InMemoryWorkflowRunRepository()
+    worker = WorkflowWorker(queue, repository, InMemoryEventLog(), concurrency=1)
+    await repository.create("stopped", {**make_run("중단된 과제"), "status": "stopped"})
+    await queue.enqueue({"workflow_id": "stopped"})
+
+    worker_task = asyncio.create_task(worker.run())
+    await queue._queue.join()
+    worker.stop()
+    await worker_task
+
+    assert stub_llm.calls == 0
+
+
+async def test_worker_skips_redelivered_run_leased_by_another_process(stub_llm):
+    queue = InMemoryJobQueue()
+    repository = InMemoryWorkflowRunRepository(lease_seconds=60)
+    event_log = InMemoryEventLog()
+    worker = WorkflowWorker(queue, repository, event_log, concurrency=1)
+    await repository.create("leased", {**make_run("실행 중인 과제"), "status": "running"})
+    await repository.claim("leased", "other-worker")
+    await queue.enqueue({"workflow_id": "leased"})
+
+    worker_task = asyncio.create_task(worker.run())
+    await queue._queue.join()
+    worker.stop()
+    await worker_task
+
+    # 실행 중인 프로세스의 기록과 이벤트 로그를 건드리지 않는다
+    assert stub_llm.calls == 0
+    assert (await repository.get("leased"))["owner"] == "other-worker"
+    assert not await event_log.exists("leased")
+
+
+async def test_run_renews_its_lease_while_a_node_runs(stub_llm):
+    stub_llm.latency = 0.3
+    queue = InMemoryJobQueue()
+    repository = InMemoryWorkflowRunRepository(lease_seconds=0.15)
+    worker = WorkflowWorker(queue, repository, InMemoryEventLog(), concurrency=1)
+    await repository.create("slow", make_run("느린 과제"))
+    await queue.enqueue({"workflow_id": "slow"})
+
+    worker_task = asyncio.create_task(worker.run())
+    while stub_llm.calls == 0:
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.2)
+
+    # 첫 노드가 임대 시간보다 오래 걸려도 임대가 갱신되어 다른 프로세스가 가져가지 못한다
+    assert await repository.claim("slow", "other") is None
+    stub_llm.latency = 0
+    await queue._queue.join()
+    worker.stop()
+    await worker_task
+    assert (await repository.get("slow"))["status"] == "completed"
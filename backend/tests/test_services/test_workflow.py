@@ -0,0 +1,147 @@
+import asyncio
+import time
+
+from langgraph.checkpoint.memory import InMemorySaver
+
+from api.services import workflow
+
+
+def merge_updates(updates: list[dict]) -> dict:
+    """노드별 변경분을 순서대로 합쳐 최종 상태 재구성"""
+    state = {"research_notes": {}}
+    for update in updates:
+        state.update({key: value for key, value in update.items() if key != "research_notes"})
+        state["research_notes"].update(update.get("research_notes", {}))
+    return state
+
+
+async def collect(task: str, max_rounds: int = 2, **kwargs) -> list[dict]:
+    return [step async for mode, step in workflow.run_discussion(task, max_rounds, **kwargs) if mode == "updates"]
+
+
+async def test_run_discussion_finalizes(stub_llm):
+    steps = await collect("주간 회고 준비")
+    final_state = merge_updates(steps)
+
+    assert steps[-1]["node"] == "judge"
+    assert final_state["decision"] == "finalize"
+    assert final_state["plan"]
+    assert stub_llm.calls == 4
+
+
+async def test_run_discussion_does_not_block_event_loop(stub_llm):
+    started = time.perf_counter()
+    await collect("단일 토론")
+    single = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await asyncio.gather(*(collect(f"동시 토론 {i}") for i in range(10)))
+    concurrent = time.perf_counter() - started
+
+    # 직렬 실행이라면 10배가 걸린다. 동시 실행은 단일 실행 수준에 머물러야 한다.
+    assert concurrent < single * 5
+
+
+async def test_run_discussion_streams_token_deltas(stub_llm):
+    chunks = [chunk async for chunk in workflow.run_discussion("토큰 스트리밍", 1, stream_tokens=True)]
+
+    deltas = [chunk for mode, chunk in chunks if mode == "custom" and "delta" in chunk]
+    final_state = merge_updates([chunk for mode, chunk in chunks if mode == "updates"])
+    plan_deltas = "".join(delta["delta"] for delta in deltas if delta["agent"] == "기획자")
+
+    assert {delta["type"] for delta in deltas} == {"plan", "research", "critique", "decision"}
+    assert plan_deltas == final_state["plan"]
+
+
+async def test_parallel_topology_merges_research_perspectives(stub_llm):
+    final_state = merge_updates(await collect("병렬 리서치", 1, topology="parallel"))
+
+    assert set(final_state["research_notes"]) == set(workflow.RESEARCH_PERSPECTIVES)
+    for title in workflow.RESEARCH_PERSPECTIVES.values():
+        assert f"[{title}]" in final_state["research"]
+    # 기획 1 + 리서치 관점 3 + 비평 1 + 판사 1
+    assert stub_llm.calls == 6
+
+
+async def test_registry_compiles_each_topology_once(stub_llm, monkeypatch):
+    compiled = []
+
+    def factory(topology, checkpointer=None):
+        compiled.append(topology)
+        return workflow.create_discussion_workflow(topology, checkpointer)
+
+    monkeypatch.setattr(workflow, "workflow_registry", workflow.WorkflowRegistry(factory))
+    await collect("첫 번째 토론", 1)
+    await collect("두 번째 토론", 1)
+    await collect("병렬 토론", 1, topology="parallel")
+
+    assert compiled == ["linear", "parallel"]
+
+
+async def interrupt_after(nodes: int, task: str, workflow_id: str, max_rounds: int = 1) -> None:
+    """노드 nodes 개가 끝난 뒤 실행을 끊는다 (워커 종료 흉내)"""
+    steps = workflow.run_discussion(task, max_rounds, workflow_id=workflow_id)
+    completed = 0
+    async for mode, _ in steps:
+        completed += mode == "updates"
+        if completed == nodes:
+            break
+    await steps.aclose()
+
+
+async def test_resume_continues_from_last_completed_node(stub_llm, monkeypatch):
+    monkeypatch.setattr(workflow, "workflow_registry", workflow.WorkflowRegistry(checkpointer=InMemorySaver()))
+    await interrupt_after(3, "재개 과제", "wf-resume")
+    assert stub_llm.calls == 2  # 기획 + 리서치
+
+    nodes = [
+        step["node"]
+        async for mode, step in workflow.run_discussion("재개 과제", 1, workflow_id="wf-resume", resume=True)
+        if mode == "updates"
+    ]
+
+    assert nodes == ["critic", "judge"]
+    assert stub_llm.calls == 4
+
+
+def test_parse_decision_reads_json_or_last_decision_line():
+    assert (
+        workflow.parse_decision('```json\n{"decision": "MORE_RESEARCH", "reason": "자료 부족"}\n```') == "more_research"
+    )
+    assert workflow.parse_decision("DECISION: FINALIZE 는 이릅니다.\nDECISION: [REVISE_PLAN]") == "revise_plan"
+    assert workflow.parse_decision("좋은 계획이네요!") is None
+
+
+async def test_structured_judge_routes_without_rationale(stub_llm, monkeypatch):
+    monkeypatch.setattr(workflow.settings, "JUDGE_DECISION_MODE", "structured")
+    stub_llm.decision = "REVISE_PLAN"
+
+    final_state = merge_updates(await collect("구조화된 판사", 2, judge_rationale="skip"))
+
+    assert final_state["decision"] == "finalize"
+    assert final_state["round_count"] == 2
+    # 라운드마다 기획/리서치/비평 + 1라운드 결정 호출 (최종 라운드는 결정 호출 없음)
+    assert stub_llm.calls == 7
+
+
+async def test_structured_judge_announces_decision_before_rationale(stub_llm, monkeypatch):
+    monkeypatch.setattr(workflow.settings, "JUDGE_DECISION_MODE", "structured")
+    stub_llm.decision = "MORE_RESEARCH"
+    chunks = [chunk async for mode, chunk in workflow.run_discussion("판사 설명", 2, stream_tokens=True)]
+
+    announced = next(index for index, chunk in enumerate(chunks) if chunk.get("type") == "continue")
+    rationale = [index for index, chunk in enumerate(chunks) if chunk.get("type") == "decision" and "delta" in chunk]
+    judge = next(chunk for chunk in chunks if chunk.get("node") == "judge" and "history" in chunk)
+
+    assert rationale and announced < rationale[0]
+    assert judge["decision"] == "more_research"
+    assert judge["history"][0][1].endswith("DECISION: MORE_RESEARCH")
+
+
+def test_expected_llm_calls_follow_judge_settings(monkeypatch):
+    assert workflow.expected_llm_calls("linear", 2) == 8
+
+    # structured 판사는 이유 호출이 더해지고, 최종 라운드에는 결정 호출을 하지 않는다
+    monkeypatch.setattr(workflow.settings, "JUDGE_DECISION_MODE", "structured")
+    assert workflow.expected_llm_calls("linear", 2, "stream") == 9
+    assert workflow.expected_llm_calls("linear", 2, "skip") == 7